@@ -1,7 +1,16 @@
 from __future__ import annotations
-from typing import Iterable, Any
+from typing import Iterable, Any, TYPE_CHECKING
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+from core import metrics
+from core.settings import settings
+from .robots import RobotsPolicy
+from .throttle import limiter, retry_after_s
+
+if TYPE_CHECKING:
+    import requests
+    from .http import AsyncHttpPool
 
 
 @dataclass
@@ -37,9 +46,135 @@ class ProgramRecord:
     dedupe_key_date: str | None = None
 
 
+@dataclass
+class FetchResult:
+    """Optional fetch_raw return value carrying HTTP validators.
+
+    Adapters that support conditional requests return this instead of the bare
+    payload; ``not_modified`` means the server answered 304 and ``raw`` is None.
+    """
+    raw: Any = None
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+    # High-water mark reached by an incremental (paged) fetch
+    cursor: str | None = None
+
+
+def conditional_headers(validators: dict | None) -> dict:
+    headers = {}
+    if validators and validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators and validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def with_query(url: str, params: dict) -> str:
+    """Append non-empty query parameters to ``url``."""
+    params = {k: v for k, v in params.items() if v is not None}
+    if not params:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+
+
+def advance_cursor(cursor: str | None, values: Iterable[Any]) -> str | None:
+    """Largest of the current cursor and the non-empty ``values``, compared as strings."""
+    seen = [str(v) for v in values if v not in (None, "")]
+    if cursor:
+        seen.append(cursor)
+    return max(seen, default=None)
+
+
+def fetch_result(resp, raw: Any) -> FetchResult:
+    """Build a FetchResult from a requests/httpx response."""
+    if resp.status_code == 304:
+        return FetchResult(not_modified=True)
+    return FetchResult(raw=raw, etag=resp.headers.get("ETag"), last_modified=resp.headers.get("Last-Modified"))
+
+
 class SourceAdapter:
     name: str = "base"
     base_url: str | None = None
+    # "api" or "html"; selects the ingest_<type> Celery queue
+    source_type: str = "api"
+    # Set by adapters that implement afetch_raw; see core.fetch.iter_fetch.
+    supports_async_fetch: bool = False
+    # Set by adapters whose fetch_raw/afetch_raw accept ``validators`` and
+    # return a FetchResult; see core.fetch.iter_fetch.
+    supports_conditional_fetch: bool = False
+    # Set by adapters that page through results and honour a ``cursor``
+    # validator (only new/changed items) when INCREMENTAL_SYNC is on.
+    supports_incremental: bool = False
+    # Scrapers set this; the ETL then loads robots state from the Source table
+    respects_robots: bool = False
+    # Injected by core.sources.load_robots; adapters fall back to fetching it
+    robots: RobotsPolicy | None = None
+    # Response cache lifetime for this source in seconds; None uses HTTP_CACHE_EXPIRE_S
+    cache_expire_after: int | None = None
+    _http: "requests.Session | None" = None
+
+    # Runtime resources rebuilt on demand; dropped when the adapter is pickled
+    # for a parse worker (core.parse_pool)
+    _transient: tuple[str, ...] = ("_http",)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for attr in self._transient:
+            state.pop(attr, None)
+        return state
+
+    @property
+    def http(self) -> "requests.Session":
+        """This adapter's pooled, cached, retrying session (built on first use)."""
+        if self._http is None:
+            from .session import build_session
+
+            self._http = build_session(self.name, self.cache_expire_after)
+        return self._http
+
+    def http_get(self, url: str, **kwargs) -> "requests.Response":
+        """GET through ``self.http`` under the per-host rate limiter.
+
+        429 responses slow the host down and are retried after Retry-After
+        (unless it exceeds HTTP_MAX_RETRY_AFTER_S); cache hits/misses are
+        counted on the active run. Adapters that respect robots.txt refuse
+        URLs their loaded policy disallows.
+        """
+        if self.respects_robots and self.robots is not None and not self.robots.can_fetch(url):
+            raise PermissionError(f"robots.txt disallows {url}")
+        for attempt in range(settings.http_retries + 1):
+            limiter.wait(url)
+            resp = self.http.get(url, **kwargs)
+            retry_after = resp.headers.get("Retry-After")
+            limiter.observe(url, resp.status_code, retry_after)
+            if resp.status_code != 429 or attempt == settings.http_retries:
+                break
+            pause = retry_after_s(retry_after)
+            if pause is not None and pause > settings.http_max_retry_after_s:
+                break
+        from_cache = getattr(resp, "from_cache", None)
+        if from_cache is not None:
+            metrics.add_cache_lookup(bool(from_cache))
+        return resp
+
+    def fetch_robots(self) -> RobotsPolicy:
+        """Download robots.txt for base_url; overridden by adapters with their own HTTP layer."""
+        from .robots import fetch_robots
+
+        return fetch_robots(self.base_url or "", self.http_get)
+
+    def robots_policy(self, ttl_s: int = 86400) -> RobotsPolicy:
+        """Current robots policy, fetched at most once per ttl_s when used standalone."""
+        if self.robots is None or self.robots.fetched_at is None or datetime.utcnow() - self.robots.fetched_at > timedelta(seconds=ttl_s):
+            self.robots = self.fetch_robots()
+        return self.robots
+
+    def close(self) -> None:
+        """Release long-lived resources (browsers, pools, HTTP sessions) at the end of a run."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
 
     def discover(self) -> Iterable[str]:
         raise NotImplementedError
@@ -47,6 +182,24 @@ class SourceAdapter:
     def fetch_raw(self, identifier: str) -> Any:
         raise NotImplementedError
 
+    async def afetch_raw(self, identifier: str, http: "AsyncHttpPool") -> Any:
+        raise NotImplementedError
+
+    def fetch(self, identifier: str, validators: dict | None = None) -> FetchResult:
+        """fetch_raw normalised to a FetchResult, sending validators when supported."""
+        if validators is not None and (self.supports_conditional_fetch or self.supports_incremental):
+            out = self.fetch_raw(identifier, validators=validators)  # type: ignore[call-arg]
+        else:
+            out = self.fetch_raw(identifier)
+        return out if isinstance(out, FetchResult) else FetchResult(raw=out)
+
+    async def afetch(self, identifier: str, http: "AsyncHttpPool", validators: dict | None = None) -> FetchResult:
+        if validators is not None and (self.supports_conditional_fetch or self.supports_incremental):
+            out = await self.afetch_raw(identifier, http, validators=validators)  # type: ignore[call-arg]
+        else:
+            out = await self.afetch_raw(identifier, http)
+        return out if isinstance(out, FetchResult) else FetchResult(raw=out)
+
     def parse(self, raw: Any) -> Iterable[ProgramRecord]:
         raise NotImplementedError
 
@@ -0,0 +1,146 @@
+"""Long-lived Playwright browser with a bounded, recycling page pool."""
+from __future__ import annotations
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+import asyncio
+import threading
+
+from .robots import USER_AGENT
+
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+class BrowserPool:
+    """One Chromium process and context serving up to ``max_pages`` concurrent pages.
+
+    The async Playwright API runs on a private event-loop thread, so ``fetch``
+    can be called from any number of threads: their navigations proceed
+    concurrently and a semaphore caps how many pages are open at once.
+    Pages are reused until they have served ``recycle_after`` navigations and
+    requests for blocked resource types are aborted at the context level.
+    ``close()`` may be called from any thread and resets the pool so the next
+    fetch starts afresh.
+    """
+
+    def __init__(self, max_pages: int = 2, recycle_after: int = 50, blocked_types: frozenset[str] = BLOCKED_RESOURCE_TYPES):
+        self.max_pages = max(1, max_pages)
+        self.recycle_after = max(1, recycle_after)
+        self.blocked_types = blocked_types
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        # Loop-side state, only touched from the pool's event-loop thread
+        self._slots: asyncio.Semaphore | None = None
+        self._starting: asyncio.Lock | None = None
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._context: Any = None
+        self._idle: list[Any] = []
+        self._uses: dict[int, int] = {}
+        self.pages_opened = 0
+
+    @property
+    def started(self) -> bool:
+        return self._context is not None
+
+    async def _start(self) -> None:
+        # Lazy import to keep dependency optional
+        from playwright.async_api import async_playwright  # type: ignore
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        self._context = await self._browser.new_context(user_agent=USER_AGENT)
+        await self._context.route("**/*", self._route)
+
+    async def _route(self, route: Any) -> None:
+        if route.request.resource_type in self.blocked_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _call(self, coro) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    async def _ensure_started(self) -> None:
+        if self._starting is None:
+            self._starting = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.max_pages)
+        async with self._starting:
+            if not self.started:
+                await self._start()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        await self._ensure_started()
+        async with self._slots:
+            page = self._idle.pop() if self._idle else None
+            if page is None:
+                page = await self._context.new_page()
+                self.pages_opened += 1
+            healthy = False
+            try:
+                yield page
+                healthy = True
+            finally:
+                uses = self._uses.pop(id(page), 0) + 1
+                if healthy and uses < self.recycle_after:
+                    self._uses[id(page)] = uses
+                    self._idle.append(page)
+                else:
+                    await _quietly(page.close)
+
+    async def _fetch(self, url: str, wait_until: str, timeout_ms: int) -> str:
+        async with self.page() as page:
+            await page.goto(url, wait_until=wait_until, timeout=timeout_ms)
+            return await page.content()
+
+    def fetch(self, url: str, wait_until: str = "networkidle", timeout_ms: int = 30000) -> str:
+        return self._call(self._fetch(url, wait_until, timeout_ms))
+
+    async def _close(self) -> None:
+        idle, self._idle = self._idle, []
+        self._uses.clear()
+        context, browser, playwright = self._context, self._browser, self._playwright
+        self._context = self._browser = self._playwright = None
+        self._starting = self._slots = None
+        for page in idle:
+            await _quietly(page.close)
+        for closer in (context, browser):
+            if closer is not None:
+                await _quietly(closer.close)
+        if playwright is not None:
+            await _quietly(playwright.stop)
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+async def _quietly(fn) -> None:
+    try:
+        await fn()
+    except Exception:
+        pass
@@ -1,45 +1,101 @@
 from __future__ import annotations
-from .base import SourceAdapter, ProgramRecord
+from .base import SourceAdapter, ProgramRecord, FetchResult, advance_cursor, conditional_headers, fetch_result, with_query
 from core.settings import settings
-from core.nlp import rule_based_tags, compute_dedupe_hash, normalize_text
-import requests
-import requests_cache
+from core.nlp import rule_based_tags_batch, compute_dedupe_hash, normalize_text
 from datetime import datetime
-from typing import Iterable, Any
+from typing import Iterable, Any, TYPE_CHECKING
 
-
-requests_cache.install_cache("eventbrite_cache", expire_after=3600)
+if TYPE_CHECKING:
+    from .http import AsyncHttpPool
 
 
 class EventbriteAdapter(SourceAdapter):
     name = "eventbrite"
     base_url = "https://www.eventbriteapi.com/v3"
+    source_type = "api"
+    supports_async_fetch = True
+    supports_conditional_fetch = True
+    supports_incremental = True
 
     def discover(self) -> Iterable[str]:
         # For demo: return a small set of event search queries or organization IDs
         return ["events/search?q=reading", "events/search?q=children"]
 
-    def fetch_raw(self, identifier: str) -> Any:
+    def _request(self, identifier: str, validators: dict | None = None) -> tuple[str, dict]:
         token = settings.eventbrite_token
         headers = {"Authorization": f"Bearer {token}"} if token else {}
-        url = f"{self.base_url}/{identifier}"
-        resp = requests.get(url, headers=headers, timeout=20)
+        headers.update(conditional_headers(validators))
+        return f"{self.base_url}/{identifier}", headers
+
+    def _page_request(self, identifier: str, cursor: str | None, continuation: str | None) -> tuple[str, dict]:
+        url, headers = self._request(identifier)
+        return with_query(url, {"date_modified.range_start": cursor, "continuation": continuation}), headers
+
+    @staticmethod
+    def _next_page(body: dict) -> str | None:
+        pagination = body.get("pagination") or {}
+        return pagination.get("continuation") if pagination.get("has_more_items") else None
+
+    @staticmethod
+    def _merge_pages(pages: list[dict], cursor: str | None, complete: bool) -> FetchResult:
+        events = [e for page in pages for e in page.get("events", [])]
+        # A truncated crawl keeps the old mark so unseen pages are retried next run
+        new_cursor = advance_cursor(cursor, (e.get("changed") for e in events)) if complete else cursor
+        return FetchResult(raw={"events": events}, cursor=new_cursor)
+
+    def _fetch_pages(self, identifier: str, cursor: str | None) -> FetchResult:
+        pages, continuation = [], None
+        for _ in range(settings.sync_max_pages):
+            url, headers = self._page_request(identifier, cursor, continuation)
+            resp = self.http_get(url, headers=headers, timeout=20)
+            resp.raise_for_status()
+            pages.append(resp.json())
+            continuation = self._next_page(pages[-1])
+            if not continuation:
+                break
+        return self._merge_pages(pages, cursor, continuation is None)
+
+    async def _afetch_pages(self, identifier: str, http: "AsyncHttpPool", cursor: str | None) -> FetchResult:
+        pages, continuation = [], None
+        for _ in range(settings.sync_max_pages):
+            url, headers = self._page_request(identifier, cursor, continuation)
+            resp = await http.get(url, headers=headers)
+            pages.append(resp.json())
+            continuation = self._next_page(pages[-1])
+            if not continuation:
+                break
+        return self._merge_pages(pages, cursor, continuation is None)
+
+    def fetch_raw(self, identifier: str, validators: dict | None = None) -> Any:
+        if validators is not None and settings.incremental_sync:
+            return self._fetch_pages(identifier, validators.get("cursor"))
+        url, headers = self._request(identifier, validators)
+        resp = self.http_get(url, headers=headers, timeout=20)
         resp.raise_for_status()
-        return resp.json()
+        if validators is None:
+            return resp.json()
+        return fetch_result(resp, None if resp.status_code == 304 else resp.json())
+
+    async def afetch_raw(self, identifier: str, http: "AsyncHttpPool", validators: dict | None = None) -> Any:
+        if validators is not None and settings.incremental_sync:
+            return await self._afetch_pages(identifier, http, validators.get("cursor"))
+        url, headers = self._request(identifier, validators)
+        resp = await http.get(url, headers=headers)
+        if validators is None:
+            return resp.json()
+        return fetch_result(resp, None if resp.status_code == 304 else resp.json())
 
     def parse(self, raw: Any) -> Iterable[ProgramRecord]:
         # Eventbrite search results format
         events = raw.get("events", []) if isinstance(raw, dict) else []
-        for e in events:
-            title = e.get("name", {}).get("text") or "Untitled"
-            description = (e.get("description", {}) or {}).get("text") or ""
+        texts = [(e.get("name", {}).get("text") or "Untitled", (e.get("description", {}) or {}).get("text") or "") for e in events]
+        for e, (title, description), tags in zip(events, texts, rule_based_tags_batch(texts)):
             url = e.get("url") or e.get("resource_uri") or ""
             start = e.get("start", {})
             end = e.get("end", {})
             start_dt = datetime.fromisoformat(start.get("utc").replace("Z", "+00:00")) if start.get("utc") else None
             end_dt = datetime.fromisoformat(end.get("utc").replace("Z", "+00:00")) if end.get("utc") else None
             tz = start.get("timezone")
-            tags = rule_based_tags(title, description)
             yield ProgramRecord(
                 title=normalize_text(title),
                 source=self.name,
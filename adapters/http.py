@@ -0,0 +1,57 @@
+from __future__ import annotations
+import asyncio
+from urllib.parse import urlsplit
+import httpx
+
+from .throttle import HostLimiter, limiter as default_limiter
+
+
+class AsyncHttpPool:
+    """Pooled keep-alive HTTP client shared by every async fetch of a stage.
+
+    Connections are reused across identifiers and each host gets its own
+    semaphore, so one source cannot monopolise the pool.
+    """
+
+    def __init__(self, max_connections: int = 20, per_host: int = 4, timeout: float = 20, transport: httpx.AsyncBaseTransport | None = None, limiter: HostLimiter | None = None):
+        self.max_connections = max_connections
+        self.limiter = limiter or default_limiter
+        self.per_host = per_host
+        self.timeout = timeout
+        self._transport = transport
+        self._host_sems: dict[str, asyncio.Semaphore] = {}
+        self._client: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> "AsyncHttpPool":
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            timeout=self.timeout,
+            follow_redirects=True,
+            transport=self._transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _host_sem(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = self._host_sems[host] = asyncio.Semaphore(self.per_host)
+        return sem
+
+    async def get(self, url: str, headers: dict | None = None) -> httpx.Response:
+        if self._client is None:
+            raise RuntimeError("AsyncHttpPool used outside 'async with'")
+        async with self._host_sem(url):
+            pause = self.limiter.reserve(url)
+            if pause > 0:
+                await asyncio.sleep(pause)
+            resp = await self._client.get(url, headers=headers)
+        self.limiter.observe(url, resp.status_code, resp.headers.get("Retry-After"))
+        if resp.status_code != 304:
+            resp.raise_for_status()
+        return resp
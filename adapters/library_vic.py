@@ -1,46 +1,104 @@
 from __future__ import annotations
-from .base import SourceAdapter, ProgramRecord
-from core.nlp import rule_based_tags, normalize_text
+from .base import SourceAdapter, ProgramRecord, FetchResult, conditional_headers, fetch_result
+from core.nlp import rule_based_tags_batch, normalize_text
 from core.settings import settings
-import requests
-import requests_cache
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer, Tag
 from typing import Iterable, Any
 from datetime import datetime
-import time
+from .browser import BrowserPool
+from .robots import USER_AGENT, pacer
 
 
-requests_cache.install_cache("library_cache", expire_after=3600)
+CARD_SELECTOR = "article, .event, .event-card"
+CARD_CLASSES = frozenset({"event", "event-card"})
+
+
+def _is_card(name: str, attrs: dict) -> bool:
+    if name == "article":
+        return True
+    classes = attrs.get("class") or ""
+    if isinstance(classes, str):
+        classes = classes.split()
+    return not CARD_CLASSES.isdisjoint(classes)
+
+
+# Only card elements (and their subtrees) are built; nested cards survive
+# because a kept element keeps its whole subtree.
+CARD_STRAINER = SoupStrainer(_is_card)
+
+
+def _card_soup(html: str, mode: str = "full") -> BeautifulSoup:
+    """Build the tree parse() selects cards from.
+
+    "full" parses the whole page with html.parser. "fast" builds only card
+    subtrees, using lxml when it is installed.
+    """
+    if mode != "fast":
+        return BeautifulSoup(html, "html.parser")
+    try:
+        return BeautifulSoup(html, "lxml", parse_only=CARD_STRAINER)
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser", parse_only=CARD_STRAINER)
+
+
+def _select_parts(item: Tag) -> tuple[Tag | None, Tag, Tag | None]:
+    """(link, description node, date node) via the original CSS passes."""
+    link = item.find("a")
+    desc = item.find(class_="summary") or item.find("p") or item
+    date = None
+    for cand in ["time", ".date", ".event-date"]:
+        date = item.select_one(cand)
+        if date:
+            break
+    return link, desc, date
+
+
+def _scan_parts(item: Tag) -> tuple[Tag | None, Tag, Tag | None]:
+    """Same result as _select_parts from a single walk over the card's descendants."""
+    first: dict[str, Tag] = {}
+    for node in item.descendants:
+        if not isinstance(node, Tag):
+            continue
+        classes = node.get("class") or ()
+        for key, hit in (
+            ("a", node.name == "a"),
+            ("p", node.name == "p"),
+            ("time", node.name == "time"),
+            ("summary", "summary" in classes),
+            ("date", "date" in classes),
+            ("event-date", "event-date" in classes),
+        ):
+            if hit and key not in first:
+                first[key] = node
+    desc = first.get("summary") or first.get("p") or item
+    date = first.get("time") or first.get("date") or first.get("event-date")
+    return first.get("a"), desc, date
 
 
 class VicLibraryAdapter(SourceAdapter):
     name = "vic_library"
     base_url = "https://www.slv.vic.gov.au"  # Example: State Library Victoria
-
-    def _robots_ok(self) -> tuple[bool, int | None]:
-        try:
-            robots = requests.get(f"{self.base_url}/robots.txt", timeout=10).text
-            delay = None
-            for line in robots.splitlines():
-                if line.lower().startswith("crawl-delay"):
-                    try:
-                        delay = int(line.split(":", 1)[1].strip())
-                    except Exception:
-                        pass
-            return True, (delay * 1000 if delay else None)
-        except Exception:
-            return True, None
+    source_type = "html"
+    supports_conditional_fetch = True
+    respects_robots = True
+    _browser_pool: BrowserPool | None = None
+    _transient = SourceAdapter._transient + ("_browser_pool",)
 
     def discover(self) -> Iterable[str]:
         # Example programs page (static HTML listing for demo)
         return [f"{self.base_url}/whats-on"]
 
-    def fetch_raw(self, url: str) -> Any:
-        ok, delay_ms = self._robots_ok()
-        if delay_ms:
-            time.sleep(delay_ms / 1000)
-        headers = {"User-Agent": "KidsSmartBot/1.0 (+https://example.org)"}
+    def fetch_raw(self, url: str, validators: dict | None = None) -> Any:
+        policy = self.robots_policy(settings.robots_ttl_s)
+        # Checked here as well as in http_get because Playwright bypasses it
+        if not policy.can_fetch(url):
+            raise PermissionError(f"robots.txt disallows {url}")
+        ok, delay_ms = True, policy.crawl_delay_ms
+        pacer.wait(url, delay_ms)
+        headers = {"User-Agent": USER_AGENT}
+        headers.update(conditional_headers(validators))
         html = None
+        resp = None
         used = "requests+bs4"
         if settings.enable_playwright:
             try:
@@ -49,39 +107,43 @@ class VicLibraryAdapter(SourceAdapter):
             except Exception:
                 html = None
         if html is None:
-            r = requests.get(url, headers=headers, timeout=20)
-            r.raise_for_status()
-            html = r.text
-        return {"url": url, "html": html, "robots_ok": ok, "delay_ms": delay_ms, "fetch_agent": used}
+            resp = self.http_get(url, headers=headers, timeout=20)
+            resp.raise_for_status()
+            html = resp.text
+        raw = {"url": url, "html": html, "robots_ok": ok, "delay_ms": delay_ms, "fetch_agent": used}
+        if validators is None:
+            return raw
+        if resp is None:
+            # Playwright gives no validators; the payload hash still applies
+            return FetchResult(raw=raw)
+        return fetch_result(resp, None if resp.status_code == 304 else raw)
 
     def _fetch_with_playwright(self, url: str) -> str:
-        # Lazy import to keep dependency optional
-        from playwright.sync_api import sync_playwright  # type: ignore
+        if self._browser_pool is None:
+            self._browser_pool = BrowserPool(settings.playwright_max_pages, settings.playwright_recycle_after)
+        return self._browser_pool.fetch(url)
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url, wait_until="networkidle")
-            content = page.content()
-            browser.close()
-        return content
+    def close(self) -> None:
+        if self._browser_pool is not None:
+            self._browser_pool.close()
+        super().close()
 
     def parse(self, raw: Any) -> Iterable[ProgramRecord]:
         html = raw.get("html", "")
-        soup = BeautifulSoup(html, "html.parser")
         # This parser is illustrative: find event cards by common patterns
-        for item in soup.select("article, .event, .event-card"):
+        fast = settings.library_html_parser == "fast"
+        soup = _card_soup(html, settings.library_html_parser)
+        cards = soup.find_all(lambda t: _is_card(t.name, t.attrs)) if fast else soup.select(CARD_SELECTOR)
+        rows = []
+        for item in cards:
             title = item.get_text(" ", strip=True)[:120] or "Library Program"
-            link = item.find("a")
+            link, desc_node, date_node = (_scan_parts if fast else _select_parts)(item)
             url = link["href"] if link and link.has_attr("href") else raw.get("url")
-            desc = (item.find(class_="summary") or item.find("p") or item).get_text(" ", strip=True)
+            desc = desc_node.get_text(" ", strip=True)
             # Attempt to parse a date
-            date_text = ""
-            for cand in ["time", ".date", ".event-date"]:
-                n = item.select_one(cand)
-                if n:
-                    date_text = n.get_text(" ", strip=True)
-                    break
+            date_text = date_node.get_text(" ", strip=True) if date_node else ""
+            rows.append((title, desc, url, date_text))
+        for (title, desc, url, date_text), tags in zip(rows, rule_based_tags_batch([(r[0], r[1]) for r in rows])):
             start_dt = None
             try:
                 # Very naive parse for demo
@@ -89,7 +151,6 @@ class VicLibraryAdapter(SourceAdapter):
                     start_dt = datetime.fromisoformat(date_text)
             except Exception:
                 pass
-            tags = rule_based_tags(title, desc)
             yield ProgramRecord(
                 title=normalize_text(title),
                 source=self.name,
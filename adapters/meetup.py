@@ -1,41 +1,94 @@
 from __future__ import annotations
-from .base import SourceAdapter, ProgramRecord
+from .base import SourceAdapter, ProgramRecord, FetchResult, advance_cursor, conditional_headers, fetch_result
 from core.settings import settings
-from core.nlp import rule_based_tags, normalize_text
-import requests
-import requests_cache
+from core.nlp import rule_based_tags_batch, normalize_text
 from datetime import datetime
-from typing import Iterable, Any
+from typing import Iterable, Any, TYPE_CHECKING
 
-
-requests_cache.install_cache("meetup_cache", expire_after=3600)
+if TYPE_CHECKING:
+    from .http import AsyncHttpPool
 
 
 class MeetupAdapter(SourceAdapter):
     name = "meetup"
     base_url = "https://api.meetup.com"
+    source_type = "api"
+    supports_async_fetch = True
+    supports_conditional_fetch = True
+    # Meetup has no server-side changed-since filter: incremental mode pages
+    # through the listing and keeps only events updated since the cursor.
+    supports_incremental = True
 
     def discover(self) -> Iterable[str]:
         # Demo: public events search endpoint would require OAuth; keep illustrative
         return ["find/upcoming_events?topic_category=education"]
 
-    def fetch_raw(self, identifier: str) -> Any:
+    def _request(self, identifier: str, validators: dict | None = None) -> tuple[str, dict]:
         token = settings.meetup_token
         headers = {"Authorization": f"Bearer {token}"} if token else {}
-        url = f"{self.base_url}/{identifier}"
-        r = requests.get(url, headers=headers, timeout=20)
+        headers.update(conditional_headers(validators))
+        return f"{self.base_url}/{identifier}", headers
+
+    @staticmethod
+    def _merge_pages(pages: list[dict], cursor: str | None, complete: bool) -> FetchResult:
+        since = int(cursor) if cursor else None
+        events = [
+            e for page in pages for e in page.get("events", [])
+            if since is None or (e.get("updated") or 0) >= since
+        ]
+        # Cursor is the epoch-ms "updated" mark, zero-padded so it compares as a string
+        new_cursor = advance_cursor(cursor, (f"{e['updated']:015d}" for e in events if e.get("updated"))) if complete else cursor
+        return FetchResult(raw={"events": events}, cursor=new_cursor)
+
+    def _fetch_pages(self, identifier: str, cursor: str | None) -> FetchResult:
+        url, headers = self._request(identifier)
+        pages = []
+        for _ in range(settings.sync_max_pages):
+            r = self.http_get(url, headers=headers, timeout=20)
+            r.raise_for_status()
+            pages.append(r.json())
+            url = r.links.get("next", {}).get("url")
+            if not url:
+                break
+        return self._merge_pages(pages, cursor, url is None)
+
+    async def _afetch_pages(self, identifier: str, http: "AsyncHttpPool", cursor: str | None) -> FetchResult:
+        url, headers = self._request(identifier)
+        pages = []
+        for _ in range(settings.sync_max_pages):
+            r = await http.get(url, headers=headers)
+            pages.append(r.json())
+            url = r.links.get("next", {}).get("url")
+            if not url:
+                break
+        return self._merge_pages(pages, cursor, url is None)
+
+    def fetch_raw(self, identifier: str, validators: dict | None = None) -> Any:
+        if validators is not None and settings.incremental_sync:
+            return self._fetch_pages(identifier, validators.get("cursor"))
+        url, headers = self._request(identifier, validators)
+        r = self.http_get(url, headers=headers, timeout=20)
         r.raise_for_status()
-        return r.json()
+        if validators is None:
+            return r.json()
+        return fetch_result(r, None if r.status_code == 304 else r.json())
+
+    async def afetch_raw(self, identifier: str, http: "AsyncHttpPool", validators: dict | None = None) -> Any:
+        if validators is not None and settings.incremental_sync:
+            return await self._afetch_pages(identifier, http, validators.get("cursor"))
+        url, headers = self._request(identifier, validators)
+        r = await http.get(url, headers=headers)
+        if validators is None:
+            return r.json()
+        return fetch_result(r, None if r.status_code == 304 else r.json())
 
     def parse(self, raw: Any) -> Iterable[ProgramRecord]:
         events = raw.get("events", []) if isinstance(raw, dict) else []
-        for e in events:
-            title = e.get("name") or "Untitled"
-            desc = e.get("description") or ""
+        texts = [(e.get("name") or "Untitled", e.get("description") or "") for e in events]
+        for e, (title, desc), tags in zip(events, texts, rule_based_tags_batch(texts)):
             url = e.get("link") or ""
             start_ms = e.get("time")
             start_dt = datetime.utcfromtimestamp(start_ms / 1000) if start_ms else None
-            tags = rule_based_tags(title, desc)
             venue = (e.get("venue") or {})
             yield ProgramRecord(
                 title=normalize_text(title),
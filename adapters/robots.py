@@ -0,0 +1,101 @@
+"""robots.txt policy and per-host crawl pacing shared by all adapters."""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+import threading
+import time
+
+
+USER_AGENT = "KidsSmartBot/1.0 (+https://example.org)"
+
+
+@dataclass
+class RobotsPolicy:
+    """robots.txt outcome for one source.
+
+    ``rules`` holds the robots.txt body when one was served. Without it the
+    policy is all-or-nothing, following RFC 9309: a 4xx (no robots.txt)
+    allows everything, and a 5xx or unreachable host disallows everything.
+    """
+
+    ok: bool = True
+    crawl_delay_ms: int | None = None
+    fetched_at: datetime | None = None
+    rules: str | None = None
+    unreachable: bool = False
+    _parser: RobotFileParser | None = field(default=None, repr=False, compare=False)
+
+    def can_fetch(self, url: str, user_agent: str = USER_AGENT) -> bool:
+        if urlsplit(url).path == "/robots.txt":
+            return True
+        if self.rules is None:
+            return self.ok
+        if self._parser is None:
+            self._parser = _parse(self.rules)
+        return self._parser.can_fetch(user_agent, url)
+
+
+def _parse(text: str) -> RobotFileParser:
+    rp = RobotFileParser()
+    rp.parse(text.splitlines())
+    return rp
+
+
+def fetch_robots(base_url: str, get: Callable, user_agent: str = USER_AGENT) -> RobotsPolicy:
+    """Download and evaluate robots.txt as RFC 9309 prescribes.
+
+    2xx: the body's rules apply. 4xx ("unavailable"): allow everything.
+    429, 5xx or a network error ("unreachable"): disallow everything until
+    the next successful fetch.
+    """
+    base = base_url.rstrip("/")
+    now = datetime.utcnow()
+    try:
+        resp = get(f"{base}/robots.txt", timeout=10)
+    except Exception:
+        return RobotsPolicy(ok=False, fetched_at=now, unreachable=True)
+    status = getattr(resp, "status_code", 200)
+    if status == 429 or status >= 500:
+        return RobotsPolicy(ok=False, fetched_at=now, unreachable=True)
+    if not 200 <= status < 300:
+        return RobotsPolicy(fetched_at=now)
+    rp = _parse(resp.text)
+    delay = rp.crawl_delay(user_agent)
+    return RobotsPolicy(
+        ok=rp.can_fetch(user_agent, f"{base}/"),
+        crawl_delay_ms=int(float(delay) * 1000) if delay else None,
+        fetched_at=now,
+        rules=resp.text,
+        _parser=rp,
+    )
+
+
+class HostPacer:
+    """Per-host schedule enforcing a minimum gap between requests.
+
+    The first request to a host goes out immediately; later ones wait only
+    for whatever remains of the crawl delay since the previous slot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next: dict[str, float] = {}
+
+    def wait(self, url: str, delay_ms: int | None) -> float:
+        if not delay_ms:
+            return 0.0
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + delay_ms / 1000
+        pause = slot - now
+        if pause > 0:
+            time.sleep(pause)
+        return pause
+
+
+pacer = HostPacer()
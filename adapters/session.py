@@ -0,0 +1,74 @@
+"""Per-adapter HTTP sessions: pooled keep-alive connections, a private
+response cache and retries with jittered backoff.
+
+Each adapter owns one ``CachedSession`` (see ``SourceAdapter.http``) instead of
+the process-wide ``requests_cache.install_cache`` patch, so sources no longer
+share (or overwrite) each other's cache and expiry.
+"""
+from __future__ import annotations
+from pathlib import Path
+import re
+
+import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.settings import settings
+
+# 429 is left to SourceAdapter.http_get so adapters.throttle sees every one
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class _Retry(Retry):
+    # 429 + Retry-After is handled (and rate-adapted) by SourceAdapter.http_get
+    RETRY_AFTER_STATUS_CODES = frozenset({413, 503})
+
+
+def retry_policy(total: int | None = None, backoff_s: float | None = None) -> Retry:
+    """Idempotent-only retries of connection errors and 5xx with exponential backoff plus jitter."""
+    total = settings.http_retries if total is None else total
+    backoff_s = settings.http_backoff_s if backoff_s is None else backoff_s
+    return _Retry(
+        total=total,
+        connect=total,
+        read=total,
+        status=total,
+        backoff_factor=backoff_s,
+        backoff_jitter=backoff_s,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        respect_retry_after_header=True,
+        # Hand the final 429/5xx back to the caller's raise_for_status()
+        raise_on_status=False,
+    )
+
+
+def cache_backend(name: str, kind: str | None = None):
+    kind = kind or settings.http_cache_backend
+    if kind == "sqlite":
+        path = Path(settings.http_cache_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        # WAL lets parallel workers read while one of them writes
+        return requests_cache.SQLiteCache(str(path / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}.sqlite"), wal=True)
+    if kind == "redis":
+        import redis
+
+        return requests_cache.RedisCache(namespace=f"http_cache:{name}", connection=redis.Redis.from_url(settings.redis_url))
+    if kind == "memory":
+        return requests_cache.BaseCache()
+    raise ValueError(f"Unknown HTTP_CACHE_BACKEND {kind!r}")
+
+
+def build_session(name: str, expire_after: int | None = None, backend: str | None = None) -> requests.Session:
+    """Session for one source; ``HTTP_CACHE_BACKEND=off`` gives a plain pooled session."""
+    kind = backend or settings.http_cache_backend
+    if kind == "off":
+        session = requests.Session()
+    else:
+        expire = settings.http_cache_expire_s if expire_after is None else expire_after
+        session = requests_cache.CachedSession(backend=cache_backend(name, kind), expire_after=expire)
+    adapter = HTTPAdapter(pool_connections=settings.http_pool_size, pool_maxsize=settings.http_pool_size, max_retries=retry_policy())
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,112 @@
+"""Adaptive per-host request rate limiting.
+
+Every host gets a token bucket refilled at ``FETCH_HOST_RATE`` requests/s.
+A 429 (or a 503 with ``Retry-After``) pauses the host for the advertised
+time and halves its rate; each later success adds back a twentieth of the
+configured rate (AIMD), so a throttling source is probed gently rather than
+hammered. Callers reserve a slot and sleep for the returned delay, which
+works the same from threads and from asyncio.
+"""
+from __future__ import annotations
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import threading
+import time
+
+from core.settings import settings
+
+MIN_RATE = 0.1
+DEFAULT_BACKOFF_S = 5.0
+
+
+def retry_after_s(value: str | None) -> float | None:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        start = max(now, self.blocked_until)
+        if self.rate <= 0:
+            return start - now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, start - now)
+
+    def throttled(self, now: float, pause_s: float) -> None:
+        self.blocked_until = max(self.blocked_until, now + pause_s)
+        if self.base_rate > 0:
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+
+    def succeeded(self) -> None:
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 20)
+
+
+class HostLimiter:
+    def __init__(self, rate: float | None = None, burst: float | None = None):
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._burst = burst
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = settings.fetch_host_rate if self._rate is None else self._rate
+            burst = settings.fetch_host_burst if self._burst is None else self._burst
+            bucket = self._buckets[host] = TokenBucket(rate, burst)
+        return bucket
+
+    def reserve(self, url: str) -> float:
+        with self._lock:
+            return self._bucket(url).reserve(time.monotonic())
+
+    def wait(self, url: str) -> float:
+        pause = self.reserve(url)
+        if pause > 0:
+            time.sleep(pause)
+        return pause
+
+    def observe(self, url: str, status: int, retry_after: str | None = None) -> None:
+        """Adapt the host's rate to a response status."""
+        pause = retry_after_s(retry_after)
+        with self._lock:
+            bucket = self._bucket(url)
+            if status == 429 or (status == 503 and pause is not None):
+                bucket.throttled(time.monotonic(), DEFAULT_BACKOFF_S if pause is None else pause)
+            elif status < 400:
+                bucket.succeeded()
+
+    def rate(self, url: str) -> float:
+        with self._lock:
+            return self._bucket(url).rate
+
+
+limiter = HostLimiter()
@@ -9,7 +9,7 @@ from core.settings import settings
 from core.db import get_db
 from db.models import Program, Run, Source
 from api.deps import get_current_user, require_admin
-from core.etl import ingest_all_sources
+from core.etl import ingest_all_sources, ADAPTERS
 from datetime import datetime
 from api.auth import router as auth_router, create_access_token
 from api.ratelimit import RateLimitMiddleware
@@ -104,13 +104,31 @@ def stats(db: Session = Depends(get_db)):
 
 
 @app.post("/ingest/run")
-def trigger_ingest(user=Depends(require_admin), db: Session = Depends(get_db)):
-    db.add(AuditLog(actor=user.get("username", "admin"), action="ingest_run", details={}))
+def trigger_ingest(full_resync: bool = False, resume: bool = False, user=Depends(require_admin), db: Session = Depends(get_db)):
+    db.add(AuditLog(actor=user.get("username", "admin"), action="ingest_run", details={"full_resync": full_resync, "resume": resume}))
     db.commit()
-    runs = ingest_all_sources(db)
+    runs = ingest_all_sources(db, full_resync=full_resync, resume=resume)
     return {"runs": [serialize_run(r) for r in runs]}
 
 
+@app.get("/runs")
+def list_runs(
+    source: str | None = None,
+    status: str | None = None,
+    page: int = 1,
+    size: int = 20,
+    db: Session = Depends(get_db),
+):
+    qry = db.query(Run)
+    if source:
+        qry = qry.filter(Run.source == source)
+    if status:
+        qry = qry.filter(Run.status == status)
+    total = qry.count()
+    items = qry.order_by(Run.started_at.desc(), Run.id.desc()).offset((page - 1) * size).limit(size).all()
+    return {"total": total, "page": page, "size": size, "items": [serialize_run(r) for r in items]}
+
+
 @app.get("/runs/{rid}")
 def get_run(rid: int, db: Session = Depends(get_db)):
     r = db.get(Run, rid)
@@ -141,14 +159,23 @@ def serialize_program(p: Program):
 
 
 def serialize_run(r: Run):
+    cp = r.checkpoint or {}
     return {
         "id": r.id,
         "source": r.source,
         "status": r.status,
+        "mode": r.mode,
         "inserted": r.inserted,
         "updated": r.updated,
+        "unchanged": r.unchanged,
+        "skipped_unchanged": r.skipped_unchanged,
         "errors": r.errors,
+        "dedupe_lookups_saved": r.dedupe_lookups_saved or 0,
         "error_samples": r.error_samples or [],
+        "stats": r.stats or {},
+        "breaker": r.breaker,
+        "checkpoint": {"done": len(cp.get("done", [])), "last": cp.get("last"), "resumed": cp.get("resumed", 0)},
+        "heartbeat_at": r.heartbeat_at.isoformat() if r.heartbeat_at else None,
         "started_at": r.started_at.isoformat() if r.started_at else None,
         "finished_at": r.finished_at.isoformat() if r.finished_at else None,
     }
@@ -156,12 +183,7 @@ def serialize_run(r: Run):
 
 @app.get("/sources")
 def list_sources():
-    # Static from adapters for now
-    return {"items": [
-        {"name": "eventbrite", "type": "api"},
-        {"name": "meetup", "type": "api"},
-        {"name": "vic_library", "type": "html"},
-    ]}
+    return {"items": [{"name": a.name, "type": a.source_type} for a in ADAPTERS]}
 
 
 @app.get("/programs/{pid}/snapshots")
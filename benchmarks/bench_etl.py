@@ -0,0 +1,194 @@
+"""Offline ETL throughput benchmark driven by synthetic adapters.
+
+Runs ``run_adapter`` / ``ingest_all_sources`` against a scratch SQLite file
+and, when ``BENCH_PG_URL`` is set (or ``--pg-url`` given), a local Postgres
+database. Every scenario reports records/s, per-stage latency from
+``Run.stats`` and DB statements per record, and is appended to
+``benchmarks/results/etl.jsonl`` together with the current git commit so
+later runs can be compared against earlier commits.
+
+The Postgres database must be a scratch database: all tables are dropped
+and recreated.
+
+Usage: python -m benchmarks.bench_etl [--records 2000] [--backends sqlite postgres] [--no-save]
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+RESULTS = Path(__file__).resolve().parent / "results" / "etl.jsonl"
+STAGES = ("fetch", "parse", "neardup_batch", "upsert", "neardup_db", "geocode", "commit")
+
+
+def git_commit() -> tuple[str | None, bool]:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip())
+        return sha, dirty
+    except Exception:
+        return None, False
+
+
+def make_sessionmaker(url: str):
+    from db.models import Base
+
+    engine = create_engine(url, future=True)
+    if not url.startswith("sqlite"):
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    return engine, sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+
+def summarize(runs, records: int, elapsed: float) -> dict:
+    from core.metrics import RunStats
+
+    stats = RunStats()
+    for r in runs:
+        stats.merge(r.stats or {})
+    totals = stats.to_dict()
+    return {
+        "records": records,
+        "seconds": round(elapsed, 4),
+        "records_per_s": round(records / elapsed, 1) if elapsed else None,
+        "inserted": sum(r.inserted for r in runs),
+        "updated": sum(r.updated for r in runs),
+        "unchanged": sum(r.unchanged for r in runs),
+        "skipped_unchanged": sum(r.skipped_unchanged for r in runs),
+        "errors": sum(r.errors for r in runs),
+        "dedupe_lookups_saved": sum(r.dedupe_lookups_saved or 0 for r in runs),
+        "db_statements_per_record": round(totals["db_statements"] / records, 2) if records else None,
+        "bytes_fetched": totals["bytes_fetched"],
+        "peak_rss_kb": totals["peak_rss_kb"],
+        "rss_growth_kb": totals["rss_growth_kb"],
+        "stages": {
+            name: {**s, "ms_per_call": round(1000 * s["seconds"] / s["calls"], 3) if s["calls"] else None}
+            for name, s in totals["stages"].items()
+        },
+    }
+
+
+def run_scenarios(backend: str, url: str, args) -> list[dict]:
+    import core.db
+    from core import etl
+    from core.settings import settings
+    from benchmarks.synthetic import SyntheticHtmlAdapter, SyntheticJsonAdapter
+
+    engine, Session = make_sessionmaker(url)
+    # ingest_all_sources(parallel=True) and helpers open sessions via core.db
+    core.db.SessionLocal = Session
+    settings.geocoding_enabled = False
+    settings.ingest_chunk_size = args.chunk_size
+    kw = dict(page_size=args.page_size, dup_rate=args.dup_rate, near_dup_rate=args.near_dup_rate)
+    json_adapter = SyntheticJsonAdapter(args.records, seed=1, **kw)
+    html_adapter = SyntheticHtmlAdapter(args.records, seed=2, **kw)
+
+    def timed(fn):
+        t0 = time.perf_counter()
+        out = fn()
+        return out, time.perf_counter() - t0
+
+    results = []
+
+    def single(name: str, adapter, conditional: bool = True):
+        settings.conditional_fetch = conditional
+        with Session() as db:
+            run, elapsed = timed(lambda: etl.run_adapter(db, adapter))
+            results.append({"scenario": name, **summarize([run], args.records, elapsed)})
+
+    single("cold_json", json_adapter)
+    single("cold_html", html_adapter)
+    single("warm_json", json_adapter)
+    single("warm_json_nocond", json_adapter, conditional=False)
+
+    settings.conditional_fetch = True
+    for parallel in (False, True):
+        adapters = [
+            SyntheticJsonAdapter(args.records, seed=10 + parallel, name=f"bench_json_all{int(parallel)}", **kw),
+            SyntheticHtmlAdapter(args.records, seed=20 + parallel, name=f"bench_html_all{int(parallel)}", **kw),
+        ]
+        etl.ADAPTERS[:], saved = adapters, list(etl.ADAPTERS)
+        try:
+            with Session() as db:
+                runs, elapsed = timed(lambda: etl.ingest_all_sources(db, parallel=parallel))
+                results.append({"scenario": f"ingest_all_{'parallel' if parallel else 'serial'}", **summarize(runs, 2 * args.records, elapsed)})
+        finally:
+            etl.ADAPTERS[:] = saved
+    engine.dispose()
+    for r in results:
+        r["backend"] = backend
+    return results
+
+
+def previous(rows: list[dict], row: dict) -> dict | None:
+    """Latest stored result for the same scenario/parameters from another commit."""
+    for old in reversed(rows):
+        if (old.get("backend"), old.get("scenario"), old.get("params")) == (row["backend"], row["scenario"], row["params"]) and old.get("commit") != row["commit"]:
+            return old
+    return None
+
+
+def report(rows: list[dict], history: list[dict]) -> None:
+    print(f"{'backend':<9}{'scenario':<24}{'rec/s':>9}{'stmts/rec':>10}  {'vs prev':>8}  stages (ms/call)")
+    for row in rows:
+        prev = previous(history, row)
+        delta = ""
+        if prev and prev.get("records_per_s") and row["records_per_s"]:
+            delta = f"{100 * (row['records_per_s'] / prev['records_per_s'] - 1):+.0f}%"
+        stages = " ".join(f"{k}={row['stages'][k]['ms_per_call']}" for k in STAGES if k in row["stages"])
+        print(f"{row['backend']:<9}{row['scenario']:<24}{row['records_per_s']:>9}{row['db_statements_per_record']:>10}  {delta:>8}  {stages}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=2000, help="events generated per synthetic adapter")
+    ap.add_argument("--page-size", type=int, default=100)
+    ap.add_argument("--dup-rate", type=float, default=0.1)
+    ap.add_argument("--near-dup-rate", type=float, default=0.05)
+    ap.add_argument("--chunk-size", type=int, default=0)
+    ap.add_argument("--backends", nargs="+", default=["sqlite", "postgres"])
+    ap.add_argument("--pg-url", default=os.getenv("BENCH_PG_URL"))
+    ap.add_argument("--results", type=Path, default=RESULTS)
+    ap.add_argument("--no-save", action="store_true")
+    args = ap.parse_args()
+    from loguru import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    commit, dirty = git_commit()
+    params = {k: getattr(args, k) for k in ("records", "page_size", "dup_rate", "near_dup_rate", "chunk_size")}
+    rows: list[dict] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends:
+            if backend == "sqlite":
+                url = f"sqlite:///{tmp}/bench.db"
+            elif args.pg_url:
+                url = args.pg_url
+            else:
+                print("postgres: skipped (set BENCH_PG_URL or --pg-url)")
+                continue
+            rows += run_scenarios(backend, url, args)
+    stamp = datetime.utcnow().isoformat(timespec="seconds")
+    rows = [{"commit": commit, "dirty": dirty, "timestamp": stamp, "params": params, **r} for r in rows]
+    history = [json.loads(line) for line in args.results.read_text().splitlines() if line.strip()] if args.results.exists() else []
+    report(rows, history)
+    if not args.no_save:
+        args.results.parent.mkdir(parents=True, exist_ok=True)
+        with args.results.open("a") as fh:
+            for row in rows:
+                fh.write(json.dumps(row) + "\n")
+        print(f"saved {len(rows)} results to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
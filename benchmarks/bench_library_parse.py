@@ -0,0 +1,47 @@
+"""Parse throughput of VicLibraryAdapter.parse with the full and fast HTML backends.
+
+Run with: python -m benchmarks.bench_library_parse
+"""
+from __future__ import annotations
+from pathlib import Path
+import re
+import time
+
+from adapters.library_vic import VicLibraryAdapter
+from core.settings import settings
+
+FIXTURE = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "library_listing.html"
+
+
+def make_page(copies: int) -> str:
+    """Repeat the fixture's listing section ``copies`` times inside one page."""
+    html = FIXTURE.read_text()
+    listing = re.search(r'<section class="listing">.*?</section>', html, re.S).group(0)
+    return html.replace(listing, listing * copies)
+
+
+def bench(mode: str, html: str, repeat: int = 3) -> tuple[float, int]:
+    settings.library_html_parser = mode
+    adapter = VicLibraryAdapter()
+    raw = {"url": "https://www.slv.vic.gov.au/whats-on", "html": html}
+    best, n = float("inf"), 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        n = sum(1 for _ in adapter.parse(raw))
+        best = min(best, time.perf_counter() - t0)
+    return best, n
+
+
+def main() -> None:
+    for copies in (1, 50, 500):
+        html = make_page(copies)
+        results = {mode: bench(mode, html) for mode in ("full", "fast")}
+        (full_s, n), (fast_s, _) = results["full"], results["fast"]
+        print(
+            f"{len(html) / 1024:8.0f} KiB  {n:5d} cards  full {full_s * 1000:8.1f} ms  "
+            f"fast {fast_s * 1000:8.1f} ms  ({n / fast_s:,.0f} cards/s, x{full_s / fast_s:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
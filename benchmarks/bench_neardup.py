@@ -0,0 +1,67 @@
+"""Compare dense and sparse within-batch near-duplicate suppression.
+
+Usage: python -m benchmarks.bench_neardup [--sizes 100 200 1000 10000] [--dense-max N]
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+import tracemalloc
+from core.dedupe import near_duplicate_indices
+
+WORDS = (
+    "story time reading writing phonics toddler preschool kindergarten library book club "
+    "science coding robotics art craft music dance drama chess maths nature garden lego "
+    "holiday workshop session program class group parents carers babies kids children "
+    "melbourne geelong ballarat bendigo sydney brisbane hobart perth adelaide darwin"
+).split()
+
+
+def make_texts(n: int, dup_rate: float = 0.2, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    texts: list[str] = []
+    for _ in range(n):
+        if texts and rng.random() < dup_rate:
+            base = rng.choice(texts).split()
+            # Near-duplicate: drop or swap one word
+            k = rng.randrange(len(base))
+            if rng.random() < 0.5:
+                base[k] = rng.choice(WORDS)
+            texts.append(" ".join(base))
+        else:
+            texts.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 16))))
+    return texts
+
+
+def measure(texts: list[str], method: str, threshold: float) -> tuple[float, float, int]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    sup = near_duplicate_indices(texts, threshold=threshold, method=method)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6, len(sup)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 1000, 10000])
+    ap.add_argument("--threshold", type=float, default=0.85)
+    ap.add_argument("--dense-max", type=int, default=10000, help="skip the dense method above this size")
+    args = ap.parse_args()
+    print(f"{'n':>7} {'method':>7} {'seconds':>9} {'peak MB':>9} {'suppressed':>11}")
+    for n in args.sizes:
+        texts = make_texts(n)
+        results = {}
+        for method in ("dense", "sparse"):
+            if method == "dense" and n > args.dense_max:
+                continue
+            elapsed, peak, n_sup = measure(texts, method, args.threshold)
+            results[method] = n_sup
+            print(f"{n:>7} {method:>7} {elapsed:>9.3f} {peak:>9.1f} {n_sup:>11}")
+        if len(results) == 2 and results["dense"] != results["sparse"]:
+            print(f"  warning: methods disagree at n={n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Per-record near-duplicate lookup cost against a populated programs table.
+
+Fills a scratch SQLite database with ``--rows`` programs of two kinds of
+text: varied word soup (``bench_neardup.make_texts``) and boilerplate-heavy
+listings (``benchmarks.synthetic``), where every row repeats the same
+paragraph. Then times ``lsh.candidate_ids`` and ``find_near_duplicate`` for
+probes that are one-word edits of stored rows and for unrelated probes.
+
+Usage: python -m benchmarks.bench_neardup_lookup [--rows 5000 20000] [--probes 200]
+"""
+from __future__ import annotations
+import argparse
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.bench_neardup import make_texts
+from benchmarks.synthetic import make_events
+from core import lsh
+from core.dedupe import find_near_duplicate
+from core.settings import settings
+from db.models import Base, Program
+
+
+def corpus(kind: str, n: int) -> list[tuple[str, str]]:
+    if kind == "varied":
+        texts = make_texts(n, dup_rate=0.0)
+        return [(t[:40], t) for t in texts]
+    return [(e["name"]["text"], e["description"]["text"]) for e in make_events(n, dup_rate=0.0, near_dup_rate=0.0)]
+
+
+def fill(db, docs: list[tuple[str, str]]) -> None:
+    now = datetime.utcnow()
+    rows = [
+        {"id": uuid.uuid4(), "title": title, "description_text": desc, "source": "bench", "source_url": "http://x",
+         "dedupe_hash": uuid.uuid4().hex, "first_seen_at": now, "last_seen_at": now, "created_at": now, "updated_at": now}
+        for title, desc in docs
+    ]
+    for i in range(0, len(rows), 1000):
+        db.execute(insert(Program), rows[i : i + 1000])
+        lsh.index_values(db, rows[i : i + 1000])
+    db.commit()
+
+
+def probes(docs: list[tuple[str, str]], n: int, seed: int = 3) -> list[tuple[str, str, bool]]:
+    rng = random.Random(seed)
+    vocab = [w for _, desc in docs[:200] for w in desc.split()]
+    out = []
+    # Near-duplicates swap one word for another word of the corpus, as synthetic.make_events does
+    for title, desc in rng.sample(docs, n // 2):
+        words = desc.split()
+        words[rng.randrange(len(words))] = rng.choice(vocab)
+        out.append((title, " ".join(words), True))
+    out += [(f"Unrelated probe {i}", f"Quarterly board meeting {i} on budget item z{i}q", False) for i in range(n - len(out))]
+    return out
+
+
+def per_lookup_ms(fn, items) -> float:
+    t0 = time.perf_counter()
+    for item in items:
+        fn(item)
+    return 1000 * (time.perf_counter() - t0) / len(items)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[5000, 20000])
+    ap.add_argument("--probes", type=int, default=200)
+    args = ap.parse_args()
+    print(f"{'text':>12} {'rows':>7} {'backend':>8} {'candidates ms':>14} {'lookup ms':>10} {'found':>6} {'false':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in ("varied", "boilerplate"):
+            for n in args.rows:
+                engine = create_engine(f"sqlite:///{Path(tmp) / f'{kind}_{n}.db'}", future=True)
+                Base.metadata.create_all(engine)
+                with sessionmaker(bind=engine, future=True)() as db:
+                    docs = corpus(kind, n)
+                    fill(db, docs)
+                    lsh.reset_document_frequencies()
+                    lsh.document_frequencies(db)
+                    ps = probes(docs, args.probes)
+                    cand_ms = per_lookup_ms(lambda p: lsh.candidate_ids(db, lsh.program_text(p[0], p[1]), None), ps)
+                    for backend in ("minhash", "tfidf"):
+                        settings.neardup_backend = backend
+                        hits = []
+                        ms = per_lookup_ms(lambda p: hits.append((find_near_duplicate(db, p[0], p[1], None, settings.neardup_threshold) is not None, p[2])), ps)
+                        found = sum(1 for got, want in hits if got and want)
+                        false = sum(1 for got, want in hits if got and not want)
+                        shown = f"{cand_ms:>14.3f}" if backend == "minhash" else f"{'-':>14}"
+                        print(f"{kind:>12} {n:>7} {backend:>8} {shown} {ms:>10.3f} {found:>6} {false:>6}")
+                engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Keyword tagging throughput: per-keyword substring scans vs the compiled matcher.
+
+Each table is timed with KeywordMatcher forced onto its direct ``in`` scan and
+onto the regex automaton; the last column is the path it picks by default.
+
+Run with: python -m benchmarks.bench_tagging
+"""
+from __future__ import annotations
+import random
+import time
+
+from core.nlp import _MATCHER, KeywordMatcher
+
+FILLER = "the kids will love this reading session with books and toddler games at the local library every saturday morning".split()
+
+
+def make_tables(categories: int, per_category: int = 8, seed: int = 0) -> dict[str, dict[str, int]]:
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    return {
+        f"cat{c}": {"".join(rng.choices(alphabet, k=rng.randint(4, 10))): rng.randint(1, 4) for _ in range(per_category)}
+        for c in range(categories)
+    }
+
+
+def make_texts(n: int, tables: dict[str, dict[str, int]], seed: int = 1) -> list[str]:
+    rng = random.Random(seed)
+    vocab = FILLER * 4 + [kw for t in tables.values() for kw in t]
+    return [" ".join(rng.choices(vocab, k=70)) for _ in range(n)]
+
+
+def naive_scores(tables: dict[str, dict[str, int]], text: str) -> dict[str, int]:
+    return {cat: s for cat, t in tables.items() if (s := sum(w for k, w in t.items() if k in text))}
+
+
+def _time(fn, texts):
+    t0 = time.perf_counter()
+    out = fn(texts)
+    return out, time.perf_counter() - t0
+
+
+def report(label: str, tables: dict[str, dict[str, int]], entries: list) -> None:
+    texts = make_texts(2000, tables)
+    expected, naive_s = _time(lambda ts: [naive_scores(tables, t) for t in ts], texts)
+    row = f"{label:>10} {len(entries):5d} keywords  naive {naive_s * 1000:8.1f} ms"
+    for name, direct_max in (("direct", len(entries)), ("automaton", 0)):
+        matcher = KeywordMatcher(entries, direct_max=direct_max)
+        got, scan_s = _time(lambda ts: [matcher.scores(matcher.scan(t)) for t in ts], texts)
+        assert got == expected
+        row += f"  {name} {scan_s * 1000:8.1f} ms (x{naive_s / scan_s:.1f})"
+    default = "direct" if KeywordMatcher(entries).direct else "automaton"
+    print(f"{row}  default: {default}")
+
+
+def main() -> None:
+    # The tag tables shipped in core.nlp (whole-word keywords treated as substrings here)
+    real = {g: {kw: _MATCHER.weights[(g, kw)] for kw in kws} for g, kws in _MATCHER.groups.items()}
+    report("core.nlp", real, [(g, kw, w, False) for g, t in real.items() for kw, w in t.items()])
+    for categories in (2, 10, 25, 40, 100, 300):
+        tables = make_tables(categories)
+        report("synthetic", tables, [(cat, kw, w, False) for cat, t in tables.items() for kw, w in t.items()])
+
+
+if __name__ == "__main__":
+    main()
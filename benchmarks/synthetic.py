@@ -0,0 +1,131 @@
+"""Synthetic source adapters for offline ETL benchmarks.
+
+Payloads mimic the real sources (Eventbrite JSON, State Library HTML cards)
+and are parsed by the real adapters' ``parse``. A controlled share of events
+are exact duplicates (same title, start and city) or near-duplicates (one
+word changed) of earlier ones.
+"""
+from __future__ import annotations
+from datetime import datetime, timedelta
+from html import escape
+from typing import Any, Iterable
+import random
+
+from adapters.eventbrite import EventbriteAdapter
+from adapters.library_vic import VicLibraryAdapter
+
+ACTIVITIES = (
+    "storytime", "phonics workshop", "coding club", "robotics lab", "lego build", "chess club",
+    "art studio", "watercolour class", "music and movement", "ukulele circle", "drama games",
+    "science show", "nature walk", "garden club", "maths puzzles", "book club", "writing workshop",
+    "puppet theatre", "dance party", "yoga for kids",
+)
+AUDIENCES = ("toddlers", "preschoolers", "kids 5-8", "tweens", "teens", "families", "parents and babies")
+VENUES = (
+    "Carlton Library", "Docklands Library", "Fitzroy Town Hall", "Brunswick Hub", "Footscray Community Arts",
+    "Geelong Library", "Ballarat Mechanics Institute", "Bendigo Library", "Werribee Park", "Box Hill Library",
+)
+CITIES = ("Melbourne", "Geelong", "Ballarat", "Bendigo", "Werribee", "Box Hill")
+QUALIFIERS = (
+    "hands-on", "free", "online", "weekly", "holiday", "after-school", "beginner", "advanced",
+    "bilingual", "sensory-friendly", "outdoor", "evening",
+)
+FILLER = (
+    "Bookings are essential and places are limited. Please arrive ten minutes early. "
+    "All materials are provided and carers must stay for the session. "
+    "The program runs in partnership with local schools and community groups."
+)
+
+
+def make_events(n: int, dup_rate: float = 0.1, near_dup_rate: float = 0.05, seed: int = 0) -> list[dict]:
+    """Generate ``n`` Eventbrite-shaped events with the given duplicate rates."""
+    rng = random.Random(seed)
+    base = datetime(2030, 1, 1, 9, 0)
+    events: list[dict] = []
+    originals: list[dict] = []
+    for i in range(n):
+        roll = rng.random()
+        if originals and roll < dup_rate:
+            events.append(dict(rng.choice(originals)))
+            continue
+        if originals and roll < dup_rate + near_dup_rate:
+            src = rng.choice(originals)
+            words = src["description"]["text"].split()
+            words[rng.randrange(len(words))] = rng.choice(QUALIFIERS)
+            events.append({**src, "description": {"text": " ".join(words)}, "url": f"{src['url']}?v={i}"})
+            continue
+        activity, audience, venue = rng.choice(ACTIVITIES), rng.choice(AUDIENCES), rng.choice(VENUES)
+        qualifier = rng.choice(QUALIFIERS)
+        start = base + timedelta(days=rng.randrange(365), hours=rng.randrange(9))
+        # The serial keeps titles distinct while staying realistic
+        title = f"{qualifier.capitalize()} {activity} for {audience} at {venue} #{i}"
+        desc = f"Join us for a {qualifier} {activity} session for {audience} at {venue}. {FILLER}"
+        ev = {
+            "name": {"text": title},
+            "description": {"text": desc},
+            "url": f"https://events.example/e/{seed}-{i}",
+            "start": {"utc": start.isoformat() + "Z", "local": start.isoformat(), "timezone": "Australia/Melbourne"},
+            "end": {"utc": (start + timedelta(hours=1)).isoformat() + "Z"},
+            "changed": (base + timedelta(seconds=i)).isoformat() + "Z",
+            "online_event": qualifier == "online",
+            "organizer": {"name": venue},
+            "city": rng.choice(CITIES),
+        }
+        originals.append(ev)
+        events.append(ev)
+    return events
+
+
+def paginate(items: list, page_size: int) -> list[list]:
+    return [items[i : i + page_size] for i in range(0, len(items), page_size)] or [[]]
+
+
+def events_to_html(events: list[dict]) -> str:
+    cards = "\n".join(
+        f"<article><h2><a href=\"{escape(e['url'])}\">{escape(e['name']['text'])}</a></h2>"
+        f"<time>{e['start']['local']}</time><div class=\"summary\">{escape(e['description']['text'])}</div></article>"
+        for e in events
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>What's on</title><script>var x = 1;</script></head><body>"
+        "<header><nav><a href=\"/\">Home</a></nav></header><main><section class=\"listing\">"
+        f"{cards}</section></main><footer><p>State Library Victoria</p></footer></body></html>"
+    )
+
+
+class SyntheticJsonAdapter(EventbriteAdapter):
+    """Eventbrite-shaped JSON pages served from memory."""
+
+    supports_async_fetch = False
+    supports_conditional_fetch = False
+    supports_incremental = False
+
+    def __init__(self, n: int, page_size: int = 100, dup_rate: float = 0.1, near_dup_rate: float = 0.05, seed: int = 0, name: str = "bench_json"):
+        self.name = name
+        self.events = make_events(n, dup_rate, near_dup_rate, seed)
+        self.pages = paginate(self.events, page_size)
+
+    def discover(self) -> Iterable[str]:
+        return [f"page-{i}" for i in range(len(self.pages))]
+
+    def fetch_raw(self, identifier: str) -> Any:
+        return {"events": self.pages[int(identifier.split("-")[1])]}
+
+
+class SyntheticHtmlAdapter(VicLibraryAdapter):
+    """Library listing pages rendered from synthetic events."""
+
+    respects_robots = False
+    supports_conditional_fetch = False
+
+    def __init__(self, n: int, page_size: int = 100, dup_rate: float = 0.1, near_dup_rate: float = 0.05, seed: int = 1, name: str = "bench_html"):
+        self.name = name
+        self.events = make_events(n, dup_rate, near_dup_rate, seed)
+        self.pages = [events_to_html(p) for p in paginate(self.events, page_size)]
+
+    def discover(self) -> Iterable[str]:
+        return [f"https://library.example/whats-on?page={i}" for i in range(len(self.pages))]
+
+    def fetch_raw(self, url: str) -> Any:
+        page = int(url.rsplit("=", 1)[1])
+        return {"url": url, "html": self.pages[page], "robots_ok": True, "delay_ms": None, "fetch_agent": "synthetic"}
@@ -0,0 +1,111 @@
+"""Compressed, content-addressed archive of fetched payloads.
+
+Layout under ``ARCHIVE_DIR``::
+
+    objects/ab/abcdef....gz     gzip of the canonical payload bytes, named by sha256
+    index/<source>.jsonl        one line per fetch: ts, identifier, sha256, kind, bytes
+
+Identical payloads are stored once; every fetch still gets an index line, so
+the index is the time series and the objects are deduplicated content.
+"""
+from __future__ import annotations
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+
+from core.settings import settings
+from core.sources import payload_bytes
+
+_index_lock = threading.Lock()
+
+
+def _root(root: str | Path | None) -> Path:
+    return Path(root or settings.archive_dir)
+
+
+def _safe(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+
+def _object_path(root: Path, digest: str) -> Path:
+    return root / "objects" / digest[:2] / f"{digest}.gz"
+
+
+def _kind(raw: Any) -> str:
+    return "bytes" if isinstance(raw, bytes) else "text" if isinstance(raw, str) else "json"
+
+
+def store(source: str, identifier: str, raw: Any, data: bytes | None = None, digest: str | None = None, root: str | Path | None = None, ts: datetime | None = None) -> str:
+    """Archive one payload and index the fetch; returns the content digest."""
+    base = _root(root)
+    data = payload_bytes(raw) if data is None else data
+    digest = digest or hashlib.sha256(data).hexdigest()
+    path = _object_path(base, digest)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent writers never expose a partial object
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(gzip.compress(data, compresslevel=6))
+        os.replace(tmp, path)
+    entry = {
+        "ts": (ts or datetime.utcnow()).isoformat(),
+        "identifier": identifier,
+        "sha256": digest,
+        "kind": _kind(raw),
+        "bytes": len(data),
+    }
+    index = base / "index" / f"{_safe(source)}.jsonl"
+    index.parent.mkdir(parents=True, exist_ok=True)
+    with _index_lock, index.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(entry) + "\n")
+    return digest
+
+
+def load(digest: str, kind: str = "json", root: str | Path | None = None) -> Any:
+    data = gzip.decompress(_object_path(_root(root), digest).read_bytes())
+    if kind == "bytes":
+        return data
+    if kind == "text":
+        return data.decode("utf-8")
+    return json.loads(data)
+
+
+def sources(root: str | Path | None = None) -> list[str]:
+    index = _root(root) / "index"
+    return sorted(p.stem for p in index.glob("*.jsonl")) if index.exists() else []
+
+
+def entries(source: str, since: datetime | None = None, until: datetime | None = None, latest_only: bool = False, root: str | Path | None = None) -> list[dict]:
+    """Index entries for ``source`` in fetch order, optionally only the newest per identifier."""
+    index = _root(root) / "index" / f"{_safe(source)}.jsonl"
+    if not index.exists():
+        return []
+    lo, hi = since.isoformat() if since else None, until.isoformat() if until else None
+    out = []
+    with index.open(encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            e = json.loads(line)
+            if (lo and e["ts"] < lo) or (hi and e["ts"] >= hi):
+                continue
+            out.append(e)
+    out.sort(key=lambda e: e["ts"])
+    if latest_only:
+        latest = {e["identifier"]: e for e in out}
+        out = sorted(latest.values(), key=lambda e: e["ts"])
+    return out
+
+
+def iter_payloads(source: str, since: datetime | None = None, until: datetime | None = None, latest_only: bool = False, root: str | Path | None = None) -> Iterator[tuple[str, Any]]:
+    """Yield ``(identifier, raw)`` for archived fetches, oldest first."""
+    for e in entries(source, since, until, latest_only, root):
+        yield e["identifier"], load(e["sha256"], e.get("kind", "json"), root)
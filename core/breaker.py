@@ -0,0 +1,57 @@
+"""Circuit breaker over one source's fetches within a run.
+
+``closed`` counts consecutive fetch failures and opens after
+``BREAKER_THRESHOLD`` of them; ``run_adapter`` then stops calling the source
+and skips the remaining identifiers. A run that starts within
+``BREAKER_COOLDOWN_S`` of a run that opened the breaker starts ``half_open``:
+the first fetch is a probe and a single failure re-opens it.
+"""
+from __future__ import annotations
+from datetime import datetime, timedelta
+from typing import Any
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int, half_open: bool = False):
+        self.threshold = threshold
+        self.state = "half_open" if half_open else "closed"
+        self.failures = 0
+        self.opened_at: datetime | None = None
+        self.last_error: str | None = None
+        self.skipped = 0
+
+    @classmethod
+    def after(cls, previous: dict | None, threshold: int, cooldown_s: int) -> "CircuitBreaker":
+        """Breaker for a new run given the previous run's ``to_dict()``."""
+        opened_at = (previous or {}).get("opened_at")
+        recent = (
+            (previous or {}).get("state") == "open"
+            and opened_at is not None
+            and datetime.utcnow() - datetime.fromisoformat(opened_at) < timedelta(seconds=cooldown_s)
+        )
+        return cls(threshold, half_open=recent)
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open"
+
+    def record(self, error: BaseException | None) -> None:
+        if error is None:
+            self.failures = 0
+            self.state = "closed"
+            return
+        self.failures += 1
+        self.last_error = str(error)[:200]
+        if self.threshold > 0 and (self.state == "half_open" or self.failures >= self.threshold):
+            self.state = "open"
+            self.opened_at = datetime.utcnow()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "threshold": self.threshold,
+            "opened_at": self.opened_at.isoformat() if self.opened_at else None,
+            "skipped_identifiers": self.skipped,
+            "last_error": self.last_error,
+        }
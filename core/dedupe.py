@@ -5,22 +5,40 @@ from db.models import Program
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from core import lsh
+from core.settings import settings
 
 
-def find_near_duplicate(db: Session, title: str, description: str | None, city: str | None, threshold: float) -> Optional[Program]:
-    text = (title or "") + "\n" + (description or "")
+def _candidates(db: Session, text: str, city: str | None) -> List[Program]:
+    if settings.neardup_backend == "minhash":
+        ids = lsh.candidate_ids(db, text, city)
+        if not ids:
+            return []
+        by_id = {p.id: p for p in db.query(Program).filter(Program.id.in_(ids))}
+        return [by_id[i] for i in ids if i in by_id]
     # Candidate set: recent 60 days or same city
     q = db.query(Program)
     if city:
         q = q.filter(Program.city == city)
-    candidates = q.order_by(Program.created_at.desc()).limit(200).all()
+    return q.order_by(Program.created_at.desc()).limit(200).all()
+
+
+def _similarities(db: Session, text: str, candidates: List[Program]) -> np.ndarray:
+    others = [lsh.program_text(c.title, c.description_text) for c in candidates]
+    if settings.neardup_backend == "minhash":
+        # Corpus-wide idf kept by the index: no vectorizer fit per record
+        return np.array(lsh.similarities(db, text, others))
+    mat = TfidfVectorizer(min_df=1, stop_words="english").fit_transform([text] + others)
+    return cosine_similarity(mat[0:1], mat[1:]).flatten()
+
+
+def find_near_duplicate(db: Session, title: str, description: str | None, city: str | None, threshold: float) -> Optional[Program]:
+    text = lsh.program_text(title, description)
+    candidates = _candidates(db, text, city)
     if not candidates:
         return None
-    docs = [text] + [((c.title or "") + "\n" + (c.description_text or "")) for c in candidates]
     try:
-        vec = TfidfVectorizer(min_df=1, stop_words="english")
-        mat = vec.fit_transform(docs)
-        sims = cosine_similarity(mat[0:1], mat[1:]).flatten()
+        sims = _similarities(db, text, candidates)
         idx = int(np.argmax(sims))
         if sims[idx] >= threshold:
             return candidates[idx]
@@ -29,19 +47,23 @@ def find_near_duplicate(db: Session, title: str, description: str | None, city:
     return None
 
 
-def near_duplicate_indices(texts: List[str], threshold: float = 0.82) -> Set[int]:
-    """Given a list of texts, return indices that are near-duplicates.
-    Strategy: keep first occurrence in each near-dup cluster; suppress later ones.
-    """
-    if not texts:
-        return set()
-    try:
-        vec = TfidfVectorizer(min_df=1, stop_words="english")
-        mat = vec.fit_transform(texts)
-        sims = cosine_similarity(mat)
-    except Exception:
-        return set()
-    n = len(texts)
+def _greedy_suppress(n: int, pairs) -> Set[int]:
+    """Keep the first of each near-dup cluster: walk i in order and, unless i is
+    already suppressed, suppress every later j paired with it."""
+    neighbours: dict[int, list[int]] = {}
+    for i, j in pairs:
+        neighbours.setdefault(i, []).append(j)
+    suppress: Set[int] = set()
+    for i in range(n):
+        if i in suppress:
+            continue
+        suppress.update(neighbours.get(i, ()))
+    return suppress
+
+
+def _suppress_dense(mat, threshold: float) -> Set[int]:
+    sims = cosine_similarity(mat)
+    n = sims.shape[0]
     suppress: Set[int] = set()
     for i in range(n):
         if i in suppress:
@@ -52,3 +74,72 @@ def near_duplicate_indices(texts: List[str], threshold: float = 0.82) -> Set[int
             if sims[i, j] >= threshold:
                 suppress.add(j)
     return suppress
+
+
+def _pairs_sparse(mat, threshold: float, chunk: int = 512):
+    # TF-IDF rows are L2-normalised, so a sparse dot product is the cosine.
+    # Working in row blocks keeps memory at O(chunk * n) instead of O(n^2).
+    n = mat.shape[0]
+    mat_t = mat.T.tocsc()
+    for start in range(0, n, chunk):
+        block = (mat[start:start + chunk] @ mat_t).tocoo()
+        rows = block.row + start
+        mask = (block.data >= threshold) & (block.col > rows)
+        order = np.lexsort((block.col[mask], rows[mask]))
+        yield from zip(rows[mask][order].tolist(), block.col[mask][order].tolist())
+
+
+def near_duplicate_indices(texts: List[str], threshold: float = 0.82, method: str = "auto") -> Set[int]:
+    """Given a list of texts, return indices that are near-duplicates.
+    Strategy: keep first occurrence in each near-dup cluster; suppress later ones.
+
+    ``method`` is "dense" (full n x n matrix), "sparse" (blocked sparse
+    neighbour search) or "auto", which switches to sparse above
+    ``settings.neardup_dense_max`` texts.
+    """
+    if not texts:
+        return set()
+    try:
+        vec = TfidfVectorizer(min_df=1, stop_words="english")
+        mat = vec.fit_transform(texts)
+    except Exception:
+        return set()
+    if method == "auto":
+        method = "dense" if len(texts) <= settings.neardup_dense_max else "sparse"
+    if method == "dense":
+        return _suppress_dense(mat, threshold)
+    return _greedy_suppress(len(texts), _pairs_sparse(mat, threshold))
+
+
+class RunRegistry:
+    """Records already written during the current run.
+
+    Keyed by ``dedupe_hash`` and by a cheap fingerprint of the near-duplicate
+    text, each mapped to the content fingerprint written for it, so a record
+    repeated across identifiers (overlapping searches, re-listed pages) is
+    recognised without a dedupe_hash query or a TF-IDF pass. A repeat whose
+    content fingerprint differs (price, URL, tags, times) is not a repeat: it
+    goes through the normal upsert and its changes are written. Entries only
+    become visible on ``commit()``, after the DB transaction that wrote them
+    committed.
+    """
+
+    def __init__(self):
+        self._hashes: dict[str, str] = {}
+        self._texts: dict[str, str] = {}
+        self._pending: list[tuple[str, str, str]] = []
+
+    def seen(self, dhash: str, text_fp: str, fingerprint: str) -> bool:
+        return fingerprint in (self._hashes.get(dhash), self._texts.get(text_fp))
+
+    def add(self, dhash: str, text_fp: str, fingerprint: str) -> None:
+        self._pending.append((dhash, text_fp, fingerprint))
+
+    def commit(self) -> None:
+        for dhash, text_fp, fingerprint in self._pending:
+            self._hashes[dhash] = fingerprint
+            self._texts[text_fp] = fingerprint
+        self._pending.clear()
+
+    def rollback(self) -> None:
+        self._pending.clear()
@@ -1,21 +1,37 @@
 from __future__ import annotations
 from typing import Iterable
 from loguru import logger
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
-from adapters.base import SourceAdapter, ProgramRecord
+from adapters.base import SourceAdapter, ProgramRecord, FetchResult
 from adapters.eventbrite import EventbriteAdapter
 from adapters.library_vic import VicLibraryAdapter
 from adapters.meetup import MeetupAdapter
-from core.nlp import compute_dedupe_hash
+from core.nlp import compute_dedupe_hash, normalize_text
 from db.models import Program, Snapshot, Run
-from datetime import datetime
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, asdict
+from itertools import islice
 import hashlib
-from core.dedupe import find_near_duplicate, near_duplicate_indices
+import json
+import time
+import uuid
+from core.dedupe import RunRegistry, find_near_duplicate, near_duplicate_indices
+from core import archive, lsh, metrics, parse_pool
+from core.breaker import CircuitBreaker
+from core.locks import SingleFlight
 from core.settings import settings
-from core.geo import geocode_address_cached
+from core.geo import geocode_address_cached, geocode_pending
+from core.gazetteer import geocode_local
+from core.fetch import FetchDeadline, iter_fetch
+from core.sources import get_source, load_robots, identifier_states, fetch_validators, payload_bytes, record_fetch
 
 
 ADAPTERS: list[SourceAdapter] = [EventbriteAdapter(), MeetupAdapter(), VicLibraryAdapter()]
+# Keeps IN (...) lists well under driver bind-parameter limits
+UPSERT_IN_CHUNK = 500
 
 try:
     from celery import Celery
@@ -31,59 +47,199 @@ try:
         "nightly-ingest": {
             "task": "core.etl.run_ingest_task",
             "schedule": crontab(hour=3, minute=0),  # 03:00 daily
-        }
+        },
+        "geocode-sweep": {
+            "task": "core.etl.geocode_pending_task",
+            "schedule": crontab(minute="*/30"),
+        },
+    }
+    # Run the "geocode" queue with a single-concurrency worker so the
+    # Nominatim 1 req/s limit holds across the whole deployment.
+    # Per-source and per-identifier ingest tasks are routed explicitly to
+    # "ingest_api" / "ingest_html" (see ingest_queue) so scraping and API
+    # sources scale on separate worker pools.
+    celery_app.conf.task_routes = {
+        "core.etl.geocode_pending_task": {"queue": "geocode"},
     }
 
     @celery_app.task
-    def run_ingest_task():
+    def run_ingest_task(full_resync: bool = False, resume: bool = False):
+        if settings.ingest_fanout:
+            from celery import group
+
+            group(ingest_source_task.s(a.name, full_resync, resume).set(queue=ingest_queue(a)) for a in ADAPTERS).apply_async()
+            return {"status": "dispatched"}
         from core.db import SessionLocal
 
         with SessionLocal() as db:
-            ingest_all_sources(db)
+            ingest_all_sources(db, full_resync=full_resync, resume=resume)
         return {"status": "ok"}
 
+    @celery_app.task
+    def ingest_source_task(adapter_name: str, full_resync: bool = False, resume: bool = False):
+        from celery import chord
+
+        from core.db import SessionLocal
+
+        adapter = get_adapter(adapter_name)
+        with SessionLocal() as db:
+            lock, attached = claim_source(db, adapter)
+            if attached is not None:
+                return {"run_id": attached.id, "attached": True}
+            interrupted = resumable_run(db, adapter.name) if resume else None
+            if interrupted is not None:
+                _reopen(db, interrupted)
+                run_id, done = interrupted.id, set((interrupted.checkpoint or {}).get("done", []))
+        token = lock.token if lock is not None else None
+        try:
+            if interrupted is None:
+                run_id, done = start_run(adapter), set()
+            if lock is not None:
+                lock.publish(run_id)
+            idents = [i for i in adapter.discover() if i not in done]
+        except Exception:
+            if lock is not None:
+                lock.release()
+            raise
+        if not idents:
+            finalize_run(run_id, [], token)
+            return {"run_id": run_id, "identifiers": 0}
+        # No heartbeat thread here: each identifier task refreshes the lock
+        # and the finalizer releases it.
+        queue = ingest_queue(adapter)
+        header = [ingest_identifier_task.s(run_id, adapter_name, ident, full_resync, token).set(queue=queue) for ident in idents]
+        chord(header)(finalize_run_task.s(run_id, token).set(queue=queue))
+        return {"run_id": run_id, "identifiers": len(idents)}
+
+    @celery_app.task
+    def ingest_identifier_task(run_id: int, adapter_name: str, ident: str, full_resync: bool = False, lock_token: str | None = None):
+        return ingest_identifier(get_adapter(adapter_name), ident, full_resync=full_resync, lock_token=lock_token, run_id=run_id)
+
+    @celery_app.task
+    def finalize_run_task(results: list[dict], run_id: int, lock_token: str | None = None):
+        finalize_run(run_id, results, lock_token)
+        return {"run_id": run_id}
+
+    from celery.signals import worker_process_shutdown
+
+    @worker_process_shutdown.connect
+    def _close_adapters(**_):
+        # Fanned-out identifier tasks keep adapter resources (e.g. the
+        # Playwright browser) alive for the life of the worker process.
+        for adapter in ADAPTERS:
+            adapter.close()
+        parse_pool.shutdown()
+
+    @celery_app.task
+    def geocode_pending_task():
+        from core.db import SessionLocal
+
+        with SessionLocal() as db:
+            n = geocode_pending(db)
+        return {"geocoded": n}
+
 except Exception:
     celery_app = None  # Optional in bare environments
 
 
-def upsert_program(db: Session, rec: ProgramRecord) -> tuple[str, Program]:
+def _dedupe_hash(rec: ProgramRecord) -> str:
     date_key = rec.dedupe_key_date or (rec.start_datetime.isoformat() if rec.start_datetime else "")
-    dhash = compute_dedupe_hash(rec.title, date_key, rec.city)
-    existing = db.query(Program).filter(Program.dedupe_hash == dhash).one_or_none()
-    if existing:
-        existing.last_seen_at = datetime.utcnow()
-        existing.updated_at = datetime.utcnow()
-        # If content changed, update description and snapshot
-        changed = False
-        if rec.description_text and rec.description_text != (existing.description_text or ""):
-            existing.description_text = rec.description_text
-            existing.status = "updated"
-            changed = True
-        if rec.category and rec.category != existing.category:
-            existing.category = rec.category
-            changed = True
-        if rec.tags:
-            existing.tags = list(sorted(set((existing.tags or []) + rec.tags)))
+    return compute_dedupe_hash(rec.title, date_key, rec.city)
+
+
+def _snapshot(program_id, excerpt: str) -> Snapshot:
+    return Snapshot(program_id=program_id, excerpt=excerpt, checksum=hashlib.sha256(excerpt.encode()).hexdigest())
+
+
+def _content_fingerprint(rec: ProgramRecord) -> str:
+    """Stable hash of the normalised record fields, used to detect no-op re-sightings."""
+    fields = [
+        normalize_text(rec.title),
+        rec.organizer,
+        rec.source_url,
+        rec.category,
+        rec.subcategory,
+        rec.start_datetime.isoformat() if rec.start_datetime else None,
+        rec.end_datetime.isoformat() if rec.end_datetime else None,
+        rec.timezone,
+        rec.venue_name,
+        rec.address,
+        rec.city,
+        rec.state,
+        rec.country,
+        rec.lat,
+        rec.lon,
+        rec.online_flag,
+        rec.free_flag,
+        rec.price_amount,
+        rec.price_currency,
+        rec.audience_age_min,
+        rec.audience_age_max,
+        normalize_text(rec.description_text or ""),
+        sorted(set(rec.tags or [])),
+        sorted(set(rec.languages or [])),
+        rec.snapshot_excerpt,
+    ]
+    return hashlib.sha256(json.dumps(fields, default=str).encode("utf-8")).hexdigest()
+
+
+def _apply_update(db: Session, existing: Program, rec: ProgramRecord, fingerprint: str) -> str:
+    """Apply rec to existing; returns "unchanged" without writing anything when
+    the stored fingerprint matches (the caller bumps last_seen_at in bulk)."""
+    if existing.content_fingerprint == fingerprint:
+        return "unchanged"
+    existing.last_seen_at = datetime.utcnow()
+    existing.updated_at = datetime.utcnow()
+    existing.content_fingerprint = fingerprint
+    # If content changed, update description and snapshot
+    changed = False
+    if rec.description_text and rec.description_text != (existing.description_text or ""):
+        existing.description_text = rec.description_text
+        existing.status = "updated"
+        changed = True
+    if rec.category and rec.category != existing.category:
+        existing.category = rec.category
+        changed = True
+    if rec.tags:
+        merged = list(sorted(set((existing.tags or []) + rec.tags)))
+        if merged != (existing.tags or []):
+            existing.tags = merged
             changed = True
-        if changed and rec.snapshot_excerpt:
-            snap = Snapshot(program_id=existing.id, excerpt=rec.snapshot_excerpt, checksum=hashlib.sha256(rec.snapshot_excerpt.encode()).hexdigest())
-            db.add(snap)
-        return "updated", existing
-    # Near-duplicate detection
-    near = find_near_duplicate(db, rec.title, rec.description_text, rec.city, settings.neardup_threshold)
-    if near is not None:
-        # Treat as update to near-duplicate
-        near.last_seen_at = datetime.utcnow()
-        near.updated_at = datetime.utcnow()
-        if rec.description_text and rec.description_text != (near.description_text or ""):
-            near.description_text = rec.description_text
-            near.status = "updated"
-            if rec.snapshot_excerpt:
-                snap = Snapshot(program_id=near.id, excerpt=rec.snapshot_excerpt, checksum=hashlib.sha256(rec.snapshot_excerpt.encode()).hexdigest())
-                db.add(snap)
-        return "updated", near
-
-    p = Program(
+    if changed and rec.snapshot_excerpt:
+        db.add(_snapshot(existing.id, rec.snapshot_excerpt))
+    return "updated"
+
+
+def _touch_last_seen(db: Session, ids: list) -> None:
+    """Bump last_seen_at for unchanged programs with one UPDATE per chunk."""
+    now = datetime.utcnow()
+    for i in range(0, len(ids), UPSERT_IN_CHUNK):
+        chunk = ids[i : i + UPSERT_IN_CHUNK]
+        db.execute(
+            update(Program).where(Program.id.in_(chunk)).values(last_seen_at=now).execution_options(synchronize_session=False)
+        )
+
+
+def _apply_near_update(db: Session, near: Program, rec: ProgramRecord, fingerprint: str) -> str:
+    """Fold rec into its near-duplicate; like _apply_update, returns "unchanged"
+    without writing anything when the content (or the only field a near-dup
+    may change, the description) already matches."""
+    if near.content_fingerprint == fingerprint:
+        return "unchanged"
+    if not rec.description_text or rec.description_text == (near.description_text or ""):
+        return "unchanged"
+    near.last_seen_at = near.updated_at = datetime.utcnow()
+    near.description_text = rec.description_text
+    near.status = "updated"
+    if rec.snapshot_excerpt:
+        db.add(_snapshot(near.id, rec.snapshot_excerpt))
+    return "updated"
+
+
+def _program_values(rec: ProgramRecord, dhash: str, fingerprint: str) -> dict:
+    now = datetime.utcnow()
+    values = dict(
+        id=uuid.uuid4(),
         title=rec.title,
         organizer=rec.organizer,
         source=rec.source,
@@ -112,78 +268,696 @@ def upsert_program(db: Session, rec: ProgramRecord) -> tuple[str, Program]:
         provenance=rec.provenance,
         reason_tags=rec.reason_tags,
         dedupe_hash=dhash,
+        content_fingerprint=fingerprint,
+        status="new",
+        first_seen_at=now,
+        last_seen_at=now,
+        created_at=now,
+        updated_at=now,
     )
-    db.add(p)
-    db.flush()
-    # Geocode if missing coords and have address-like info
-    if p.lat is None and p.lon is None and (p.address or p.city):
-        coords = geocode_address_cached(
-            ", ".join([x for x in [p.address, p.city, p.state, p.country] if x])
-        )
+    # Geocode if missing coords and have address-like info. In background mode
+    # only the in-process gazetteer runs here; geocode_pending_task resolves
+    # street addresses after the run.
+    if values["lat"] is None and values["lon"] is None and (rec.address or rec.city):
+        addr = ", ".join([x for x in [rec.address, rec.city, rec.state, rec.country] if x])
+        with metrics.stage("geocode"):
+            if not settings.geocode_in_background:
+                coords = geocode_address_cached(addr)
+            elif settings.geocoding_enabled and settings.geocoder != "nominatim":
+                coords = geocode_local(addr)
+            else:
+                coords = None
         if coords:
-            p.lat, p.lon = coords
-            db.add(p)
-    if rec.snapshot_excerpt:
-        snap = Snapshot(program_id=p.id, excerpt=rec.snapshot_excerpt, checksum=hashlib.sha256(rec.snapshot_excerpt.encode()).hexdigest())
-        db.add(snap)
-    return "inserted", p
+            values["lat"], values["lon"] = coords
+    return values
 
 
-def run_adapter(db: Session, adapter: SourceAdapter) -> Run:
-    run = Run(source=adapter.name, status="running", inserted=0, updated=0, errors=0, error_samples=[])
-    db.add(run)
-    db.flush()
+def _load_by_hash(db: Session, hashes: Iterable[str]) -> dict[str, Program]:
+    hashes = list(hashes)
+    found: dict[str, Program] = {}
+    for i in range(0, len(hashes), UPSERT_IN_CHUNK):
+        chunk = hashes[i : i + UPSERT_IN_CHUNK]
+        for p in db.query(Program).filter(Program.dedupe_hash.in_(chunk)):
+            found[p.dedupe_hash] = p
+    return found
+
+
+def _insert_new(db: Session, rows: list[dict]) -> set:
+    """Insert rows, skipping any dedupe_hash that already exists. Returns inserted ids."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        db.add_all([Program(**row) for row in rows])
+        db.flush()
+        return {row["id"] for row in rows}
+    stmt = dialect_insert(Program).on_conflict_do_nothing(index_elements=["dedupe_hash"]).returning(Program.id)
+    inserted = set(db.scalars(stmt, rows))
+    # Bulk inserts bypass the ORM after_insert hook that maintains the near-dup index
+    lsh.index_values(db, (row for row in rows if row["id"] in inserted))
+    return inserted
+
+
+def upsert_programs(db: Session, recs: list[ProgramRecord]) -> list[tuple[str, Program]]:
+    with metrics.stage("upsert"):
+        return _upsert_programs(db, recs)
+
+
+def _upsert_programs(db: Session, recs: list[ProgramRecord]) -> list[tuple[str, Program]]:
+    """Upsert a batch of records; results are returned in input order.
+
+    Existing programs are found with one ``IN`` query per chunk of hashes and
+    new rows go in as a single ``INSERT ... ON CONFLICT (dedupe_hash) DO
+    NOTHING``. A row that loses the conflict to a concurrent writer is
+    reported as an update of the winner. Re-seen records whose content
+    fingerprint is unchanged come back as "unchanged" and only get their
+    last_seen_at bumped.
+    """
+    if not recs:
+        return []
+    hashes = [_dedupe_hash(r) for r in recs]
+    fingerprints = [_content_fingerprint(r) for r in recs]
+    existing = _load_by_hash(db, set(hashes))
+    results: list[tuple[str, Program] | None] = [None] * len(recs)
+    new_rows: dict[str, tuple[int, dict]] = {}
+    repeats: list[int] = []
+    unchanged_ids = []
+
+    def apply(i: int, p: Program) -> None:
+        action = _apply_update(db, p, recs[i], fingerprints[i])
+        if action == "unchanged":
+            unchanged_ids.append(p.id)
+        results[i] = (action, p)
+
+    for i, (rec, dhash) in enumerate(zip(recs, hashes)):
+        p = existing.get(dhash)
+        if p is not None:
+            apply(i, p)
+            continue
+        if dhash in new_rows:
+            repeats.append(i)
+            continue
+        # Near-duplicate detection
+        with metrics.stage("neardup_db"):
+            near = find_near_duplicate(db, rec.title, rec.description_text, rec.city, settings.neardup_threshold)
+        if near is not None:
+            action = _apply_near_update(db, near, rec, fingerprints[i])
+            if action == "unchanged":
+                unchanged_ids.append(near.id)
+            results[i] = (action, near)
+            continue
+        new_rows[dhash] = (i, _program_values(rec, dhash, fingerprints[i]))
+
+    if new_rows:
+        inserted_ids = _insert_new(db, [row for _, row in new_rows.values()])
+        created = _load_by_hash(db, new_rows.keys())
+        for dhash, (i, row) in new_rows.items():
+            p = created[dhash]
+            if p.id in inserted_ids:
+                if recs[i].snapshot_excerpt:
+                    db.add(_snapshot(p.id, recs[i].snapshot_excerpt))
+                results[i] = ("inserted", p)
+            else:
+                apply(i, p)
+        for i in repeats:
+            apply(i, created[hashes[i]])
+    if unchanged_ids:
+        _touch_last_seen(db, list(dict.fromkeys(unchanged_ids)))
+    return results  # type: ignore[return-value]
+
+
+def upsert_program(db: Session, rec: ProgramRecord) -> tuple[str, Program]:
+    return upsert_programs(db, [rec])[0]
+
+
+@dataclass
+class BatchCounts:
+    """Counters for work done outside a persisted Run (per-identifier Celery tasks)."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped_unchanged: int = 0
+
+
+def _neardup_text(rec: ProgramRecord) -> str:
+    return "\n".join(filter(None, [rec.title, rec.city or "", rec.dedupe_key_date or "", (rec.description_text or "")[:512]]))
+
+
+def _registry_keys(rec: ProgramRecord, text: str) -> tuple[str, str, str]:
+    text_fp = hashlib.sha1(normalize_text(text).lower().encode("utf-8")).hexdigest()
+    return _dedupe_hash(rec), text_fp, _content_fingerprint(rec)
+
+
+def _process_chunk(db: Session, adapter: SourceAdapter, run: Run | BatchCounts, ident: str, batch: list[ProgramRecord], seen: RunRegistry | None = None) -> None:
+    texts = [_neardup_text(r) for r in batch]
+    keys: list[tuple[str, str, str]] = []
+    if seen is not None:
+        # Exact repeats of records this run already wrote never reach the DB
+        keys = [_registry_keys(r, t) for r, t in zip(batch, texts)]
+        fresh = [i for i, k in enumerate(keys) if not seen.seen(*k)]
+        if len(fresh) < len(batch):
+            run.dedupe_lookups_saved += len(batch) - len(fresh)
+            batch, texts, keys = [batch[i] for i in fresh], [texts[i] for i in fresh], [keys[i] for i in fresh]
+    # Within-batch near-duplicate suppression
+    with metrics.stage("neardup_batch"):
+        sup = near_duplicate_indices(texts, threshold=settings.neardup_threshold)
+    if sup:
+        logger.info(f"{adapter.name}:{ident} near-duplicate suppressed: {len(sup)}")
+    kept = [idx for idx in range(len(batch)) if idx not in sup]
+    for idx, (action, _) in zip(kept, upsert_programs(db, [batch[idx] for idx in kept])):
+        if action == "inserted":
+            run.inserted += 1
+        elif action == "unchanged":
+            run.unchanged += 1
+        else:
+            run.updated += 1
+        if seen is not None:
+            seen.add(*keys[idx])
+
+
+def _process_payload(db: Session, adapter: SourceAdapter, run: Run | BatchCounts, ident: str, raw=None, parsed: list[ProgramRecord] | None = None, seen: RunRegistry | None = None) -> None:
+    """Parse one payload (or take records already ``parsed`` by a worker) and upsert them.
+
+    With ``INGEST_CHUNK_SIZE`` > 0 the parse() generator is consumed in chunks
+    that are de-duplicated, upserted and flushed one at a time, so memory is
+    bounded by the chunk size rather than by the number of events in the payload.
+    Near-duplicates spanning two chunks are then caught by the DB-level check.
+    Nothing is committed here: the caller commits once the whole identifier
+    (and its fetch record) is written, so a failure part-way through leaves
+    no partially applied payload behind.
+    ``seen`` is the run's registry of records already written (see RunRegistry).
+    """
+    records = metrics.timed_iter(adapter.parse(raw), "parse") if parsed is None else iter(parsed)
+    chunk_size = settings.ingest_chunk_size
+    if chunk_size <= 0:
+        _process_chunk(db, adapter, run, ident, list(records), seen)
+        return
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        _process_chunk(db, adapter, run, ident, chunk, seen)
+        # The session's identity map is weak-referencing, so flushed (clean)
+        # programs from earlier chunks are released once the chunk goes.
+        with metrics.stage("flush"):
+            db.flush()
+
+
+def _needs_processing(db: Session, adapter: SourceAdapter, run: Run | BatchCounts, ident: str, result: FetchResult, source_id: int, states: dict, full_resync: bool = False) -> str | None:
+    """Archive the payload and record unchanged fetches.
+
+    Returns the payload hash when the payload must be parsed and upserted, or
+    None when the source reported it unchanged (already counted as skipped).
+    A full resync always reprocesses the payload, even when its hash matches.
+    """
+    if result.not_modified:
+        record_fetch(db, source_id, states, ident, result, None)
+        run.skipped_unchanged += 1
+        return None
+    data = payload_bytes(result.raw)
+    metrics.add_bytes(len(data))
+    content_hash = hashlib.sha256(data).hexdigest()
+    if settings.archive_payloads:
+        try:
+            archive.store(adapter.name, ident, result.raw, data, content_hash)
+        except Exception as e:
+            logger.warning(f"Could not archive {adapter.name}:{ident}: {e}")
+    state = states.get(ident)
+    if settings.conditional_fetch and not full_resync and state is not None and state.content_hash == content_hash:
+        record_fetch(db, source_id, states, ident, result, content_hash)
+        run.skipped_unchanged += 1
+        return None
+    return content_hash
+
+
+def _handle_fetched(db: Session, adapter: SourceAdapter, run: Run | BatchCounts, ident: str, result: FetchResult, source_id: int, states: dict, full_resync: bool = False, seen: RunRegistry | None = None) -> None:
+    """Parse/upsert one fetched identifier unless the source reports it unchanged."""
+    content_hash = _needs_processing(db, adapter, run, ident, result, source_id, states, full_resync)
+    if content_hash is None:
+        return
+    _process_payload(db, adapter, run, ident, result.raw, seen=seen)
+    record_fetch(db, source_id, states, ident, result, content_hash)
+
+
+def fail_stale_runs(db: Session, source: str | None = None, older_than_s: float | None = None) -> int:
+    """Mark "running" fetch runs whose worker died as failed; returns how many.
+
+    A run is stale when its last heartbeat (or start) is older than
+    ``older_than_s`` (default ``RUN_STALE_AFTER_S``). ``0`` means every running
+    run is an orphan, which holds once this caller owns the shared ingest lock.
+    Their checkpoints are kept, so ``resume`` can continue them.
+    """
+    older_than_s = settings.run_stale_after_s if older_than_s is None else older_than_s
+    qry = db.query(Run).filter(Run.status == "running", Run.mode == "fetch")
+    if source is not None:
+        qry = qry.filter(Run.source == source)
+    if older_than_s > 0:
+        cutoff = datetime.utcnow() - timedelta(seconds=older_than_s)
+        qry = qry.filter(func.coalesce(Run.heartbeat_at, Run.started_at) < cutoff)
+    reason = "abandoned: ingest lock expired (worker died?)" if older_than_s <= 0 else f"abandoned: no heartbeat for {older_than_s:g}s (worker died?)"
+    stale = qry.all()
+    for r in stale:
+        logger.warning(f"Run {r.id} for {r.source} is stale; marking failed")
+        r.status = "failed"
+        r.finished_at = datetime.utcnow()
+        r.error_samples = ((r.error_samples or []) + [reason])[-5:]
+    if stale:
+        db.commit()
+    return len(stale)
+
+
+# Run statuses that left identifiers unprocessed and can be resumed
+RESUMABLE_STATUSES = ("failed", "timeout", "circuit_open")
+
+
+def resumable_run(db: Session, source: str) -> Run | None:
+    """The source's latest fetch run, if it was interrupted and has a checkpoint."""
+    latest = (
+        db.query(Run)
+        .filter(Run.source == source, Run.mode == "fetch", Run.status != "skipped")
+        .order_by(Run.id.desc())
+        .first()
+    )
+    if latest is None or latest.status not in RESUMABLE_STATUSES or not latest.checkpoint:
+        return None
+    return latest
+
+
+def _reopen(db: Session, run: Run) -> None:
+    cp = dict(run.checkpoint or {})
+    cp["resumed"] = cp.get("resumed", 0) + 1
+    logger.info(f"Resuming run {run.id} for {run.source} after {len(cp.get('done', []))} completed identifiers")
+    run.checkpoint = cp
+    run.status = "running"
+    run.finished_at = None
+    run.heartbeat_at = datetime.utcnow()
+    db.commit()
+
+
+def _checkpoint(run: Run, ident: str) -> None:
+    """Record ``ident`` as completed; committed together with its upserts."""
+    cp = dict(run.checkpoint or {})
+    cp["done"] = list(cp.get("done", [])) + [ident]
+    cp["last"] = ident
+    run.checkpoint = cp
+    run.heartbeat_at = datetime.utcnow()
+
+
+def claim_source(db: Session, adapter: SourceAdapter) -> tuple[SingleFlight | None, Run | None]:
+    """Take the per-source single-flight lock.
+
+    Returns ``(lock, None)`` when this caller should run the ingest, or
+    ``(None, run)`` with the in-progress Run it should attach to. With
+    ``INGEST_LOCK_ENABLED=false`` it always returns ``(None, None)``.
+    """
+    if not settings.ingest_lock_enabled:
+        fail_stale_runs(db, adapter.name)
+        return None, None
+    lock = SingleFlight(adapter.name)
+    if lock.acquire():
+        # With a shared lock nobody else can be running this source
+        fail_stale_runs(db, adapter.name, 0 if lock.backend.shared else None)
+        return lock, None
+    run_id = lock.holder_run_id(wait_s=2.0)
+    run = db.get(Run, run_id) if run_id is not None else None
+    if run is None:
+        # Holder has not published its Run yet (or it was pruned): record the skip
+        run = Run(source=adapter.name, status="skipped", inserted=0, updated=0, unchanged=0, skipped_unchanged=0, errors=0,
+                  error_samples=["another ingest of this source is in progress"], finished_at=datetime.utcnow())
+        db.add(run)
+        db.commit()
+    logger.info(f"{adapter.name} ingest already in progress; attached to run {run.id}")
+    return None, run
+
+
+def run_adapter(db: Session, adapter: SourceAdapter, timeout: float | None = None, full_resync: bool = False, resume: bool = False) -> Run:
+    """Ingest every identifier of ``adapter`` into one Run.
+
+    With ``resume`` an interrupted run of the source (see ``resumable_run``)
+    is reopened and only identifiers missing from its checkpoint are fetched.
+    """
+    lock, attached = claim_source(db, adapter)
+    if attached is not None:
+        return attached
     try:
-        for ident in adapter.discover():
-            try:
-                raw = adapter.fetch_raw(ident)
-                batch: list[ProgramRecord] = list(adapter.parse(raw))
-                # Within-batch near-duplicate suppression
-                texts = [
-                    "\n".join(
-                        filter(
-                            None,
-                            [
-                                r.title,
-                                r.city or "",
-                                r.dedupe_key_date or "",
-                                (r.description_text or "")[:512],
-                            ],
-                        )
-                    )
-                    for r in batch
-                ]
-                sup = near_duplicate_indices(texts, threshold=settings.neardup_threshold)
-                if sup:
-                    logger.info(f"{adapter.name}:{ident} near-duplicate suppressed: {len(sup)}")
-                for idx, rec in enumerate(batch):
-                    if idx in sup:
-                        continue
-                    action, _ = upsert_program(db, rec)
-                    if action == "inserted":
-                        run.inserted += 1
-                    else:
-                        run.updated += 1
-                db.commit()
-            except Exception as e:
+        return _run_adapter(db, adapter, timeout, full_resync, lock, resume)
+    finally:
+        if lock is not None:
+            lock.release()
+
+
+def _run_adapter(db: Session, adapter: SourceAdapter, timeout: float | None, full_resync: bool, lock: SingleFlight | None, resume: bool = False) -> Run:
+    run = resumable_run(db, adapter.name) if resume else None
+    if run is not None:
+        _reopen(db, run)
+    else:
+        run = Run(source=adapter.name, status="running", inserted=0, updated=0, unchanged=0, skipped_unchanged=0, errors=0,
+                  dedupe_lookups_saved=0, error_samples=[], checkpoint={"done": []}, heartbeat_at=datetime.utcnow())
+        db.add(run)
+        # Committed straight away so overlapping callers can attach to it
+        db.commit()
+    done = set((run.checkpoint or {}).get("done", []))
+    previous_stats = run.stats
+    if lock is not None:
+        lock.publish(run.id)
+        lock.start_heartbeat()
+    # The deadline bounds the wait for each fetch (a hung fetch is abandoned,
+    # see iter_fetch) but never interrupts an upsert, so the session stays consistent.
+    deadline = time.monotonic() + timeout if timeout else None
+    timed_out = False
+    breaker = _breaker_for(db, run)
+    seen = RunRegistry()
+    stats = metrics.RunStats()
+    if previous_stats:
+        stats.merge(previous_stats)
+    with metrics.collecting(stats):
+        try:
+            source = get_source(db, adapter)
+            load_robots(db, adapter, source)
+            # A new Source row and fresh robots state must survive fail()'s rollback
+            db.commit()
+            source_id = source.id
+            states = identifier_states(db, source_id)
+            validators = fetch_validators(adapter, states, full_resync)
+            idents = [i for i in adapter.discover() if i not in done]
+            processed = 0
+            # PARSE_WORKERS > 0: payloads parse in worker processes while earlier ones are written
+            pipeline = parse_pool.pipeline_for(adapter)
+
+            def fail(ident: str, e: Exception) -> None:
+                nonlocal states
                 db.rollback()
-                logger.exception(f"Error processing {adapter.name}:{ident}")
+                seen.rollback()
+                logger.opt(exception=e).error(f"Error processing {adapter.name}:{ident}")
                 run.errors += 1
                 if len(run.error_samples or []) < 5:
                     run.error_samples = (run.error_samples or []) + [str(e)]
-        run.status = "finished"
+                run.heartbeat_at = datetime.utcnow()
+                # Persist the counters now, or the next rollback would discard them
+                db.commit()
+                # Rolled-back state rows may be stale; reload before the next identifier
+                states = identifier_states(db, source_id)
+
+            def write(key: tuple[str, FetchResult, str], records: list[ProgramRecord] | None, error: Exception | None) -> None:
+                ident, result, content_hash = key
+                try:
+                    if error is not None:
+                        raise error
+                    _process_payload(db, adapter, run, ident, parsed=records, seen=seen)
+                    record_fetch(db, source_id, states, ident, result, content_hash)
+                    _checkpoint(run, ident)
+                    with metrics.stage("commit"):
+                        db.commit()
+                    seen.commit()
+                except Exception as e:
+                    fail(ident, e)
+
+            with closing(iter_fetch(adapter, idents, validators, deadline)) as fetched:
+                for ident, result, fetch_error in metrics.timed_iter(fetched, "fetch"):
+                    if isinstance(fetch_error, FetchDeadline) or (deadline is not None and time.monotonic() >= deadline):
+                        timed_out = True
+                        logger.warning(f"{adapter.name} timed out after {timeout}s; skipping remaining identifiers")
+                        if len(run.error_samples or []) < 5:
+                            run.error_samples = (run.error_samples or []) + [f"timeout after {timeout}s"]
+                        break
+                    processed += 1
+                    breaker.record(fetch_error)
+                    try:
+                        if fetch_error is not None:
+                            raise fetch_error
+                        if pipeline is None:
+                            _handle_fetched(db, adapter, run, ident, result, source_id, states, full_resync, seen)
+                            _checkpoint(run, ident)
+                        else:
+                            content_hash = _needs_processing(db, adapter, run, ident, result, source_id, states, full_resync)
+                            if content_hash is None:
+                                _checkpoint(run, ident)
+                            else:
+                                pipeline.submit((ident, result, content_hash), result.raw)
+                        with metrics.stage("commit"):
+                            db.commit()
+                        seen.commit()
+                    except Exception as e:
+                        fail(ident, e)
+                    if pipeline is not None:
+                        for item in pipeline.ready():
+                            write(*item)
+                    if breaker.is_open:
+                        breaker.skipped = len(idents) - processed
+                        logger.warning(f"{adapter.name} circuit open after {breaker.failures} consecutive fetch failures; skipping {breaker.skipped} identifiers")
+                        if len(run.error_samples or []) < 5:
+                            run.error_samples = (run.error_samples or []) + [f"circuit open: skipped {breaker.skipped} identifiers"]
+                        break
+            if pipeline is not None:
+                # Payloads already fetched are still written after a timeout or open breaker
+                for item in pipeline.drain():
+                    write(*item)
+            run.status = "timeout" if timed_out else "circuit_open" if breaker.is_open else "finished"
+            run.finished_at = datetime.utcnow()
+            run.stats = stats.snapshot()
+            run.breaker = breaker.to_dict()
+            db.commit()
+            if run.inserted:
+                enqueue_geocoding()
+        except Exception:
+            db.rollback()
+            run.status = "failed"
+            run.finished_at = datetime.utcnow()
+            run.stats = stats.snapshot()
+            run.breaker = breaker.to_dict()
+            db.commit()
+        finally:
+            adapter.close()
+    return run
+
+
+def _breaker_for(db: Session, run: Run) -> CircuitBreaker:
+    """Fresh breaker for ``run``, half-open if the source's previous run tripped recently."""
+    previous = (
+        db.query(Run.breaker)
+        .filter(Run.source == run.source, Run.mode == "fetch", Run.id != run.id, Run.breaker.isnot(None))
+        .order_by(Run.id.desc())
+        .first()
+    )
+    return CircuitBreaker.after(previous[0] if previous else None, settings.breaker_threshold, settings.breaker_cooldown_s)
+
+
+def replay_adapter(db: Session, adapter: SourceAdapter, since: datetime | None = None, until: datetime | None = None, latest_only: bool = False) -> Run:
+    """Re-parse and upsert archived payloads for ``adapter`` without any network I/O.
+
+    Payloads are replayed oldest first, so the newest archived version of a
+    record wins. Fetch state (validators, cursors) is left untouched.
+    """
+    run = Run(source=adapter.name, mode="replay", status="running", inserted=0, updated=0, unchanged=0, skipped_unchanged=0, errors=0, dedupe_lookups_saved=0, error_samples=[])
+    db.add(run)
+    db.flush()
+    seen = RunRegistry()
+    stats = metrics.RunStats()
+    with metrics.collecting(stats):
+        try:
+            for ident, raw in archive.iter_payloads(adapter.name, since, until, latest_only):
+                try:
+                    _process_payload(db, adapter, run, ident, raw, seen=seen)
+                    with metrics.stage("commit"):
+                        db.commit()
+                    seen.commit()
+                except Exception as e:
+                    db.rollback()
+                    seen.rollback()
+                    logger.exception(f"Error replaying {adapter.name}:{ident}")
+                    run.errors += 1
+                    if len(run.error_samples or []) < 5:
+                        run.error_samples = (run.error_samples or []) + [str(e)]
+            run.status = "finished"
+        except Exception:
+            db.rollback()
+            run.status = "failed"
         run.finished_at = datetime.utcnow()
+        run.stats = stats.snapshot()
+        db.commit()
+    if run.inserted:
+        enqueue_geocoding()
+    return run
+
+
+def _replay_isolated(adapter: SourceAdapter, since: datetime | None, until: datetime | None, latest_only: bool) -> int:
+    from core.db import SessionLocal
+
+    with SessionLocal() as db:
+        return replay_adapter(db, adapter, since, until, latest_only).id
+
+
+def replay_archive(db: Session, sources: list[str] | None = None, since: datetime | None = None, until: datetime | None = None, latest_only: bool = False, parallel: bool = True) -> list[Run]:
+    """Replay archived payloads for every (or the named) adapter, sources in parallel."""
+    adapters = [a for a in ADAPTERS if sources is None or a.name in sources]
+    if not parallel:
+        return [replay_adapter(db, a, since, until, latest_only) for a in adapters]
+    run_ids = []
+    workers = max(1, min(settings.ingest_concurrency, len(adapters) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="replay") as pool:
+        futures = [(a, pool.submit(_replay_isolated, a, since, until, latest_only)) for a in adapters]
+        for a, fut in futures:
+            try:
+                run_ids.append(fut.result())
+            except Exception:
+                logger.exception(f"Replay worker for {a.name} crashed")
+    return [r for r in (db.get(Run, rid) for rid in run_ids) if r is not None]
+
+
+def get_adapter(name: str) -> SourceAdapter:
+    for adapter in ADAPTERS:
+        if adapter.name == name:
+            return adapter
+    raise ValueError(f"Unknown adapter: {name}")
+
+
+def ingest_queue(adapter: SourceAdapter) -> str:
+    return f"ingest_{adapter.source_type}"
+
+
+def start_run(adapter: SourceAdapter) -> int:
+    from core.db import SessionLocal
+
+    with SessionLocal() as db:
+        run = Run(source=adapter.name, status="running", inserted=0, updated=0, unchanged=0, skipped_unchanged=0, errors=0,
+                  error_samples=[], checkpoint={"done": []}, heartbeat_at=datetime.utcnow())
+        db.add(run)
         db.commit()
-    except Exception:
-        db.rollback()
-        run.status = "failed"
+        return run.id
+
+
+def ingest_identifier(adapter: SourceAdapter, ident: str, full_resync: bool = False, lock_token: str | None = None, run_id: int | None = None) -> dict:
+    """Fetch, parse and upsert one identifier in its own session.
+
+    Never raises: failures are reported in the returned counters so a chord
+    over many identifiers still reaches its finalizer. With ``run_id`` the
+    identifier is added to that Run's checkpoint in the same transaction.
+    """
+    from core.db import SessionLocal
+
+    if lock_token:
+        SingleFlight(adapter.name, token=lock_token).refresh()
+    counts = BatchCounts()
+    stats = metrics.RunStats()
+    with SessionLocal() as db, metrics.collecting(stats):
+        try:
+            source = get_source(db, adapter)
+            load_robots(db, adapter, source)
+            # Kept even if this identifier fails and rolls back
+            db.commit()
+            source_id = source.id
+            states = identifier_states(db, source_id, [ident])
+            validators = fetch_validators(adapter, states, full_resync)
+            if validators is not None:
+                validators = validators.get(ident, {})
+            _handle_fetched(db, adapter, counts, ident, adapter.fetch(ident, validators), source_id, states, full_resync)
+            if run_id is not None:
+                # Row lock: sibling identifier tasks append to the same checkpoint
+                run = db.query(Run).filter(Run.id == run_id).with_for_update().one_or_none()
+                if run is not None:
+                    _checkpoint(run, ident)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"Error processing {adapter.name}:{ident}")
+            return {**asdict(BatchCounts()), "errors": 1, "error_samples": [str(e)], "stats": stats.snapshot()}
+    return {**asdict(counts), "errors": 0, "error_samples": [], "stats": stats.snapshot()}
+
+
+def finalize_run(run_id: int, results: list[dict], lock_token: str | None = None) -> None:
+    """Fold per-identifier counters into the Run row, close it and release the source lock."""
+    from core.db import SessionLocal
+
+    with SessionLocal() as db:
+        run = db.get(Run, run_id)
+        if run is None:
+            return
+        samples = list(run.error_samples or [])
+        stats = metrics.RunStats()
+        # A resumed run keeps the stats of its earlier attempts
+        stats.merge(run.stats or {})
+        for r in results:
+            stats.merge(r.get("stats") or {})
+            run.inserted += r.get("inserted", 0)
+            run.updated += r.get("updated", 0)
+            run.unchanged += r.get("unchanged", 0)
+            run.skipped_unchanged += r.get("skipped_unchanged", 0)
+            run.errors += r.get("errors", 0)
+            samples.extend(r.get("error_samples", []))
+        run.error_samples = samples[:5]
+        run.stats = stats.to_dict()
+        run.status = "finished"
         run.finished_at = datetime.utcnow()
         db.commit()
+        inserted, source = run.inserted, run.source
+    if lock_token:
+        SingleFlight(source, token=lock_token).release()
+    if inserted:
+        enqueue_geocoding()
+
+
+def enqueue_geocoding() -> None:
+    """Hand newly inserted programs to the background geocoding queue."""
+    if not (settings.geocoding_enabled and settings.geocode_in_background) or celery_app is None:
+        return
+    try:
+        geocode_pending_task.apply_async(retry=False)
+    except Exception as e:
+        # The periodic geocode-sweep picks these up later
+        logger.warning(f"Could not enqueue geocoding: {e}")
+
+
+def _run_adapter_isolated(adapter: SourceAdapter, timeout: float | None, full_resync: bool = False, resume: bool = False) -> int:
+    from core.db import SessionLocal
+
+    with SessionLocal() as db:
+        run = run_adapter(db, adapter, timeout=timeout, full_resync=full_resync, resume=resume)
+        return run.id
+
+
+def _crashed_run(db: Session, adapter: SourceAdapter, e: Exception) -> Run:
+    """Failed Run recording an adapter whose ingest raised before producing one."""
+    now = datetime.utcnow()
+    run = Run(source=adapter.name, status="failed", started_at=now, finished_at=now, inserted=0, updated=0, unchanged=0,
+              skipped_unchanged=0, errors=1, dedupe_lookups_saved=0, error_samples=[f"ingest crashed: {e}"])
+    db.add(run)
+    db.commit()
     return run
 
 
-def ingest_all_sources(db: Session) -> list[Run]:
-    runs = []
-    for adapter in ADAPTERS:
-        runs.append(run_adapter(db, adapter))
-    return runs
+def ingest_all_sources(db: Session, parallel: bool | None = None, full_resync: bool = False, resume: bool = False) -> list[Run]:
+    """Run every adapter and return their Run rows in ADAPTERS order.
+
+    In parallel mode each adapter runs in its own worker thread with its own
+    session, so one slow source no longer holds up the others. The returned
+    runs are re-loaded into ``db`` so callers can serialize them as before.
+    An adapter whose ingest crashes is reported as a "failed" Run.
+    """
+    if parallel is None:
+        parallel = settings.ingest_parallel
+    timeout = settings.ingest_adapter_timeout_s or None
+    if not parallel:
+        runs = []
+        for adapter in ADAPTERS:
+            try:
+                runs.append(run_adapter(db, adapter, timeout=timeout, full_resync=full_resync, resume=resume))
+            except Exception as e:
+                logger.exception(f"Ingest of {adapter.name} crashed")
+                db.rollback()
+                runs.append(_crashed_run(db, adapter, e))
+        return runs
+
+    workers = max(1, min(settings.ingest_concurrency, len(ADAPTERS)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+        futures = [(adapter, pool.submit(_run_adapter_isolated, adapter, timeout, full_resync, resume)) for adapter in ADAPTERS]
+        runs = []
+        for adapter, fut in futures:
+            try:
+                runs.append(db.get(Run, fut.result()))
+            except Exception as e:
+                logger.exception(f"Parallel ingest worker for {adapter.name} crashed")
+                runs.append(_crashed_run(db, adapter, e))
+    return [r for r in runs if r is not None]
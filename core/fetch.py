@@ -0,0 +1,146 @@
+from __future__ import annotations
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Iterable, Iterator
+import asyncio
+import contextvars
+import queue
+import threading
+import time
+from adapters.base import SourceAdapter, FetchResult
+from adapters.http import AsyncHttpPool
+from core.settings import settings
+
+
+FetchItem = tuple[str, "FetchResult | None", "Exception | None"]
+_DONE = object()
+
+
+class FetchDeadline(TimeoutError):
+    """The run's time budget ran out while a fetch was still in flight."""
+
+
+def iter_fetch(adapter: SourceAdapter, identifiers: Iterable[str], validators: dict[str, dict] | None = None, deadline: float | None = None) -> Iterator[FetchItem]:
+    """Yield ``(identifier, FetchResult, error)`` for every identifier.
+
+    Adapters that implement ``afetch_raw`` are fetched concurrently when
+    ``ASYNC_FETCH_ENABLED`` is set; payloads are yielded as they complete, not
+    in discover() order. Everything else falls back to sequential fetch_raw.
+    ``validators`` maps identifiers to stored ETag/Last-Modified values; when
+    given, adapters that support it send conditional requests.
+
+    ``deadline`` (a ``time.monotonic()`` value) bounds the wait for the next
+    payload: when it passes with a fetch still in flight, a final item carrying
+    ``FetchDeadline`` is yielded and the hung fetch is abandoned.
+    """
+    if settings.async_fetch_enabled and adapter.supports_async_fetch:
+        return _iter_fetch_async(adapter, list(identifiers), validators, deadline)
+    return _iter_fetch_sync(adapter, identifiers, validators, deadline)
+
+
+def _validators(validators: dict[str, dict] | None, ident: str) -> dict | None:
+    return None if validators is None else validators.get(ident, {})
+
+
+def _remaining(deadline: float) -> float:
+    return max(0.0, deadline - time.monotonic())
+
+
+def _fetch_before(adapter: SourceAdapter, ident: str, validators: dict | None, deadline: float) -> FetchResult:
+    """``adapter.fetch`` on a daemon thread, waited on for at most the time left."""
+    fut: Future = Future()
+    ctx = contextvars.copy_context()  # keeps the run's metrics collector
+
+    def target() -> None:
+        try:
+            fut.set_result(ctx.run(adapter.fetch, ident, validators))
+        except BaseException as e:
+            fut.set_exception(e)
+
+    threading.Thread(target=target, name=f"fetch-{adapter.name}", daemon=True).start()
+    try:
+        return fut.result(timeout=_remaining(deadline))
+    except FutureTimeout:
+        if fut.done():
+            raise
+        raise FetchDeadline(f"fetch of {ident} still running at the deadline") from None
+
+
+def _iter_fetch_sync(adapter: SourceAdapter, identifiers: Iterable[str], validators: dict[str, dict] | None, deadline: float | None = None) -> Iterator[FetchItem]:
+    for ident in identifiers:
+        try:
+            if deadline is None:
+                result = adapter.fetch(ident, _validators(validators, ident))
+            else:
+                result = _fetch_before(adapter, ident, _validators(validators, ident), deadline)
+        except FetchDeadline as e:
+            yield ident, None, e
+            return
+        except Exception as e:
+            yield ident, None, e
+            continue
+        yield ident, result, None
+
+
+async def _produce(adapter: SourceAdapter, identifiers: list[str], validators: dict[str, dict] | None, out: queue.Queue, stop: threading.Event) -> None:
+    in_flight = asyncio.Semaphore(max(1, settings.fetch_concurrency))
+    async with AsyncHttpPool(max_connections=settings.fetch_concurrency, per_host=settings.fetch_per_host_limit) as http:
+
+        async def one(ident: str) -> None:
+            # The slot is held until the consumer accepts the payload, so at
+            # most fetch_concurrency payloads are in flight or buffered.
+            async with in_flight:
+                if stop.is_set():
+                    return
+                try:
+                    item = (ident, await adapter.afetch(ident, http, _validators(validators, ident)), None)
+                except Exception as e:
+                    item = (ident, None, e)
+                await asyncio.to_thread(out.put, item)
+
+        await asyncio.gather(*(one(i) for i in identifiers))
+
+
+def _run_producer(adapter: SourceAdapter, identifiers: list[str], validators: dict[str, dict] | None, out: queue.Queue, stop: threading.Event) -> None:
+    try:
+        asyncio.run(_produce(adapter, identifiers, validators, out, stop))
+    except Exception as e:
+        out.put(("", None, e))
+    finally:
+        out.put(_DONE)
+
+
+def _drain(out: queue.Queue, worker: threading.Thread) -> None:
+    while worker.is_alive():
+        try:
+            if out.get(timeout=0.1) is _DONE:
+                break
+        except queue.Empty:
+            pass
+    worker.join()
+
+
+def _iter_fetch_async(adapter: SourceAdapter, identifiers: list[str], validators: dict[str, dict] | None, deadline: float | None = None) -> Iterator[FetchItem]:
+    out: queue.Queue = queue.Queue(maxsize=max(1, settings.fetch_concurrency))
+    stop = threading.Event()
+    worker = threading.Thread(target=_run_producer, args=(adapter, identifiers, validators, out, stop), name=f"fetch-{adapter.name}", daemon=True)
+    worker.start()
+    expired = False
+    try:
+        while True:
+            try:
+                item = out.get(timeout=None if deadline is None else _remaining(deadline))
+            except queue.Empty:
+                expired = True
+                yield "", None, FetchDeadline("fetches still running at the deadline")
+                return
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        # Consumer stopped early (timeout/close): unblock the producer and wait
+        # for it, or past the deadline let a background thread do the waiting.
+        stop.set()
+        if expired:
+            threading.Thread(target=_drain, args=(out, worker), name=f"fetch-{adapter.name}-drain", daemon=True).start()
+        else:
+            _drain(out, worker)
@@ -0,0 +1,129 @@
+"""Offline suburb/postcode geocoder backed by a bundled centroid dataset.
+
+The CSV (name,state,postcode,lat,lon) is loaded once into parallel arrays with
+dict indexes on normalised name and postcode, so a city-level lookup is a
+couple of dict probes. Street addresses are left to the network geocoder.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Optional, Tuple
+import csv
+import re
+import numpy as np
+from core.settings import settings
+
+
+DEFAULT_PATH = Path(__file__).parent / "data" / "au_localities.csv"
+
+STATES = {
+    "vic": "VIC", "victoria": "VIC",
+    "nsw": "NSW", "new south wales": "NSW",
+    "qld": "QLD", "queensland": "QLD",
+    "wa": "WA", "western australia": "WA",
+    "sa": "SA", "south australia": "SA",
+    "tas": "TAS", "tasmania": "TAS",
+    "act": "ACT", "australian capital territory": "ACT",
+    "nt": "NT", "northern territory": "NT",
+}
+COUNTRIES = {"australia", "au", "aus"}
+_STREET_RE = re.compile(
+    r"^\s*(?:(?:unit|level|shop|suite)\s+\S+\s+|\d+[a-z]?(?:[/-]\d+[a-z]?)?\s)"
+    r"|\b(?:st|street|rd|road|ave|avenue|dr|drive|pde|parade|hwy|highway|ln|lane|ct|court|cres|crescent|pl|place|blvd|boulevard|tce|terrace|way)\b\.?\s*$",
+    re.IGNORECASE,
+)
+_POSTCODE_RE = re.compile(r"\b(\d{4})\b")
+
+
+def _is_street(part: str) -> bool:
+    # A postcode is not a street number ("Ballarat, 3350 VIC")
+    return bool(_STREET_RE.search(_POSTCODE_RE.sub(" ", part).strip()))
+
+
+def normalize_name(s: str) -> str:
+    s = re.sub(r"[^a-z0-9 ]+", " ", (s or "").lower())
+    return re.sub(r"\s+", " ", s).strip()
+
+
+class Gazetteer:
+    def __init__(self, path: Path | str = DEFAULT_PATH):
+        names: list[str] = []
+        states: list[str] = []
+        postcodes: list[str] = []
+        lats: list[float] = []
+        lons: list[float] = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                names.append(row["name"])
+                states.append(row["state"].upper())
+                postcodes.append(row["postcode"].zfill(4))
+                lats.append(float(row["lat"]))
+                lons.append(float(row["lon"]))
+        self.names = names
+        self.states = np.array(states)
+        self.lat = np.array(lats, dtype=np.float64)
+        self.lon = np.array(lons, dtype=np.float64)
+        self._by_name: dict[str, list[int]] = {}
+        self._by_postcode: dict[str, int] = {}
+        for i, (name, pc) in enumerate(zip(names, postcodes)):
+            self._by_name.setdefault(normalize_name(name), []).append(i)
+            self._by_postcode.setdefault(pc, i)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _coords(self, i: int) -> Tuple[float, float]:
+        return (float(self.lat[i]), float(self.lon[i]))
+
+    def lookup(self, addr: str) -> Optional[Tuple[float, float]]:
+        """Resolve a city/suburb-level address such as "Ballarat, VIC 3350".
+
+        Returns None for street addresses and unknown places.
+        """
+        parts = [p.strip() for p in (addr or "").split(",") if p.strip()]
+        # "Unit 3, 12 Smith St, Fitzroy VIC": any part before the trailing
+        # locality/state one may carry the street
+        if not parts or any(_is_street(p) for p in (parts[:-1] or parts)):
+            return None
+        state = None
+        postcode = None
+        localities: list[str] = []
+        for part in parts:
+            m = _POSTCODE_RE.search(part)
+            if m:
+                postcode = m.group(1)
+                part = _POSTCODE_RE.sub(" ", part)
+            words = normalize_name(part)
+            for full, code in STATES.items():
+                if words == full or words.endswith(" " + full):
+                    state = code
+                    words = words[: len(words) - len(full)].strip()
+                    break
+            if words and words not in COUNTRIES:
+                localities.append(words)
+        for name in localities:
+            idxs = self._by_name.get(name)
+            if not idxs:
+                continue
+            if state:
+                idxs = [i for i in idxs if self.states[i] == state] or idxs
+            return self._coords(idxs[0])
+        if postcode and postcode in self._by_postcode and not localities:
+            return self._coords(self._by_postcode[postcode])
+        return None
+
+
+_gazetteer: Gazetteer | None = None
+
+
+def get_gazetteer() -> Gazetteer:
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer(settings.gazetteer_path or DEFAULT_PATH)
+    return _gazetteer
+
+
+def geocode_local(addr: str) -> Optional[Tuple[float, float]]:
+    try:
+        return get_gazetteer().lookup(addr)
+    except OSError:
+        return None
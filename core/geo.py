@@ -1,20 +1,164 @@
 from __future__ import annotations
 from typing import Optional, Tuple
 from geopy.geocoders import Nominatim
-from functools import lru_cache
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from loguru import logger
+from ratelimit import limits, sleep_and_retry
+from sqlalchemy.orm import Session
+import re
+import threading
 from core.settings import settings
+from core.gazetteer import geocode_local
+from db.models import GeocodeCache, Program
+
+
+_geocoder = None
+
+# Per-process memo of *found* coordinates only: misses and errors must keep
+# going back to the shared table (negative TTL) or the network.
+_MEMO_SIZE = 1024
+_memo: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def normalize_address(addr: str) -> str:
+    return re.sub(r"\s+", " ", (addr or "").replace(" ,", ",")).strip().lower()
+
+
+def program_address(p: Program) -> str:
+    return ", ".join([x for x in [p.address, p.city, p.state, p.country] if x])
+
+
+def _get_geocoder():
+    global _geocoder
+    # isinstance check lets tests swap the Nominatim class at runtime
+    if not isinstance(_geocoder, Nominatim):
+        _geocoder = Nominatim(user_agent="kidssmart")
+    return _geocoder
+
+
+@sleep_and_retry
+@limits(calls=1, period=1)  # Nominatim usage policy: at most 1 request per second
+def _geocode_remote(addr: str) -> Optional[Tuple[float, float]]:
+    loc = _get_geocoder().geocode(addr, timeout=10)
+    if not loc:
+        return None
+    return (loc.latitude, loc.longitude)
+
+
+def _cache_get(key: str) -> tuple[bool, Optional[Tuple[float, float]]]:
+    from core.db import SessionLocal
+
+    with SessionLocal() as db:
+        row = db.get(GeocodeCache, key)
+        if row is None or (row.expires_at is not None and row.expires_at < datetime.utcnow()):
+            return False, None
+        return True, ((row.lat, row.lon) if row.found else None)
+
+
+def _cache_put(key: str, coords: Optional[Tuple[float, float]]) -> None:
+    from core.db import SessionLocal
+
+    now = datetime.utcnow()
+    expires = None if coords else now + timedelta(seconds=settings.geocode_negative_ttl_s)
+    with SessionLocal() as db:
+        db.merge(GeocodeCache(
+            key=key,
+            lat=coords[0] if coords else None,
+            lon=coords[1] if coords else None,
+            found=coords is not None,
+            created_at=now,
+            expires_at=expires,
+        ))
+        db.commit()
 
 
-@lru_cache(maxsize=1024)
 def geocode_address_cached(addr: str) -> Optional[Tuple[float, float]]:
+    """Geocode through a per-process LRU backed by the shared geocode_cache table.
+
+    In "hybrid" and "gazetteer" modes city/suburb-level addresses resolve from
+    the bundled gazetteer without touching the network or the cache table;
+    "gazetteer" mode never falls back to Nominatim.
+
+    Only found coordinates are kept in the process LRU. Misses (no match) are
+    cached in the table with GEOCODE_NEGATIVE_TTL_S; network errors are not
+    cached anywhere, so a transient outage is retried on the next call.
+    """
     if not settings.geocoding_enabled:
         return None
+    with _memo_lock:
+        if addr in _memo:
+            _memo.move_to_end(addr)
+            return _memo[addr]
+    coords = _geocode_uncached(addr)
+    if coords is not None:
+        with _memo_lock:
+            _memo[addr] = coords
+            if len(_memo) > _MEMO_SIZE:
+                _memo.popitem(last=False)
+    return coords
+
+
+def _clear_memo() -> None:
+    with _memo_lock:
+        _memo.clear()
+
+
+geocode_address_cached.cache_clear = _clear_memo  # type: ignore[attr-defined]
+
+
+def _geocode_uncached(addr: str) -> Optional[Tuple[float, float]]:
+    if settings.geocoder != "nominatim":
+        coords = geocode_local(addr)
+        if coords or settings.geocoder == "gazetteer":
+            return coords
+    key = normalize_address(addr)
+    if not key:
+        return None
+    try:
+        hit, coords = _cache_get(key)
+        if hit:
+            return coords
+    except Exception as e:
+        logger.warning(f"geocode cache read failed: {e}")
     try:
-        g = Nominatim(user_agent="kidssmart")
-        loc = g.geocode(addr, timeout=10)
-        if not loc:
-            return None
-        return (loc.latitude, loc.longitude)
+        coords = _geocode_remote(addr)
     except Exception:
         return None
+    try:
+        _cache_put(key, coords)
+    except Exception as e:
+        logger.warning(f"geocode cache write failed: {e}")
+    return coords
+
 
+def geocode_pending(db: Session, batch_size: int = 200) -> int:
+    """Fill lat/lon for programs that were upserted without coordinates.
+
+    This is the body of the background geocoding queue; remote lookups are
+    paced by the Nominatim rate limit above. Returns the number of programs updated.
+    """
+    if not settings.geocoding_enabled:
+        return 0
+    updated = 0
+    last_id = None
+    while True:
+        q = db.query(Program).filter(
+            Program.lat.is_(None),
+            Program.lon.is_(None),
+            (Program.address.isnot(None)) | (Program.city.isnot(None)),
+        )
+        if last_id is not None:
+            q = q.filter(Program.id > last_id)
+        batch = q.order_by(Program.id).limit(batch_size).all()
+        if not batch:
+            break
+        for p in batch:
+            coords = geocode_address_cached(program_address(p))
+            if coords:
+                p.lat, p.lon = coords
+                updated += 1
+        db.commit()
+        last_id = batch[-1].id
+    return updated
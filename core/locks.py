@@ -0,0 +1,229 @@
+"""Single-flight ingest locks, one per source.
+
+The lock lives in Redis (``SET NX PX`` plus token-checked refresh/release
+scripts) so beat, Celery workers and the API share it; when Redis is not
+reachable a per-process fallback keeps the same semantics within one
+process. Holders publish the id of the Run they are driving so overlapping
+callers can attach to it, and keep the lock alive with a heartbeat: if a
+worker dies the lock simply expires after ``INGEST_LOCK_TTL_S``.
+"""
+from __future__ import annotations
+from typing import Protocol
+import threading
+import time
+import uuid
+
+from loguru import logger
+
+from core.settings import settings
+
+_REFRESH = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+  redis.call('pexpire', KEYS[1], ARGV[2])
+  redis.call('pexpire', KEYS[2], ARGV[2])
+  return 1
+end
+return 0
+"""
+_RELEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+  redis.call('del', KEYS[1], KEYS[2])
+  return 1
+end
+return 0
+"""
+_PUBLISH = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+  redis.call('set', KEYS[2], ARGV[2], 'PX', ARGV[3])
+  return 1
+end
+return 0
+"""
+
+
+class LockBackend(Protocol):
+    # True when every process sees the same locks (needed to call runs orphaned)
+    shared: bool
+
+    def acquire(self, key: str, token: str, ttl_ms: int) -> bool: ...
+    def refresh(self, key: str, token: str, ttl_ms: int) -> bool: ...
+    def release(self, key: str, token: str) -> bool: ...
+    def publish(self, key: str, token: str, run_id: int, ttl_ms: int) -> bool: ...
+    def holder(self, key: str) -> tuple[str | None, int | None]: ...
+
+
+class RedisLockBackend:
+    shared = True
+
+    def __init__(self, client):
+        self.r = client
+        self._refresh = client.register_script(_REFRESH)
+        self._release = client.register_script(_RELEASE)
+        self._publish = client.register_script(_PUBLISH)
+
+    def acquire(self, key: str, token: str, ttl_ms: int) -> bool:
+        return bool(self.r.set(key, token, nx=True, px=ttl_ms))
+
+    def refresh(self, key: str, token: str, ttl_ms: int) -> bool:
+        return bool(self._refresh(keys=[key, f"{key}:run"], args=[token, ttl_ms]))
+
+    def release(self, key: str, token: str) -> bool:
+        return bool(self._release(keys=[key, f"{key}:run"], args=[token]))
+
+    def publish(self, key: str, token: str, run_id: int, ttl_ms: int) -> bool:
+        return bool(self._publish(keys=[key, f"{key}:run"], args=[token, run_id, ttl_ms]))
+
+    def holder(self, key: str) -> tuple[str | None, int | None]:
+        token, run_id = self.r.mget(key, f"{key}:run")
+        return token, int(run_id) if run_id else None
+
+
+class LocalLockBackend:
+    """In-process fallback: same contract, but only serialises one process."""
+
+    shared = False
+
+    def __init__(self):
+        self._mu = threading.Lock()
+        self._held: dict[str, list] = {}  # key -> [token, run_id, expires_at]
+
+    def _live(self, key: str) -> list | None:
+        entry = self._held.get(key)
+        if entry is not None and entry[2] <= time.monotonic():
+            del self._held[key]
+            return None
+        return entry
+
+    def acquire(self, key: str, token: str, ttl_ms: int) -> bool:
+        with self._mu:
+            if self._live(key) is not None:
+                return False
+            self._held[key] = [token, None, time.monotonic() + ttl_ms / 1000]
+            return True
+
+    def refresh(self, key: str, token: str, ttl_ms: int) -> bool:
+        with self._mu:
+            entry = self._live(key)
+            if entry is None or entry[0] != token:
+                return False
+            entry[2] = time.monotonic() + ttl_ms / 1000
+            return True
+
+    def release(self, key: str, token: str) -> bool:
+        with self._mu:
+            entry = self._live(key)
+            if entry is None or entry[0] != token:
+                return False
+            del self._held[key]
+            return True
+
+    def publish(self, key: str, token: str, run_id: int, ttl_ms: int) -> bool:
+        with self._mu:
+            entry = self._live(key)
+            if entry is None or entry[0] != token:
+                return False
+            entry[1] = run_id
+            return True
+
+    def holder(self, key: str) -> tuple[str | None, int | None]:
+        with self._mu:
+            entry = self._live(key)
+            return (entry[0], entry[1]) if entry else (None, None)
+
+
+_backend_lock = threading.Lock()
+_redis_backend: RedisLockBackend | None = None
+_local_backend = LocalLockBackend()
+_retry_redis_at = 0.0
+
+
+def get_backend() -> LockBackend:
+    """The Redis backend, or the in-process fallback while Redis is unreachable.
+
+    A successful connection is kept for the life of the process. The fallback
+    is not: Redis is tried again every INGEST_LOCK_REDIS_RETRY_S, so a worker
+    that started before Redis regains cross-process locking once it is up.
+    """
+    global _redis_backend, _retry_redis_at
+    with _backend_lock:
+        if _redis_backend is not None:
+            return _redis_backend
+        if time.monotonic() < _retry_redis_at:
+            return _local_backend
+        try:
+            import redis
+
+            client = redis.Redis.from_url(settings.redis_url, decode_responses=True, socket_connect_timeout=0.5, socket_timeout=2)
+            client.ping()
+        except Exception as e:
+            _retry_redis_at = time.monotonic() + settings.ingest_lock_redis_retry_s
+            logger.warning(f"Redis unavailable ({e}); ingest locks fall back to in-process locking for {settings.ingest_lock_redis_retry_s:g}s")
+            return _local_backend
+        _redis_backend = RedisLockBackend(client)
+        return _redis_backend
+
+
+class SingleFlight:
+    """Lock for one source's ingest, identified by a random (or given) token.
+
+    Backend errors fail open: an unreachable lock service must not stop
+    ingestion, it only loses the overlap protection.
+    """
+
+    def __init__(self, source: str, token: str | None = None, ttl_s: float | None = None, backend: LockBackend | None = None):
+        self.key = f"ingest-lock:{source}"
+        self.token = token or uuid.uuid4().hex
+        self.ttl_ms = int(1000 * (ttl_s or settings.ingest_lock_ttl_s))
+        self.backend = backend or get_backend()
+        self._stop: threading.Event | None = None
+        self._thread: threading.Thread | None = None
+
+    def _call(self, op: str, *args, default):
+        try:
+            return getattr(self.backend, op)(self.key, *args)
+        except Exception as e:
+            logger.warning(f"Ingest lock {op} failed for {self.key}: {e}")
+            return default
+
+    def acquire(self) -> bool:
+        return self._call("acquire", self.token, self.ttl_ms, default=True)
+
+    def refresh(self) -> bool:
+        return self._call("refresh", self.token, self.ttl_ms, default=True)
+
+    def release(self) -> bool:
+        self.stop_heartbeat()
+        return self._call("release", self.token, default=False)
+
+    def publish(self, run_id: int) -> bool:
+        return self._call("publish", self.token, run_id, self.ttl_ms, default=False)
+
+    def holder_run_id(self, wait_s: float = 0.0) -> int | None:
+        """Run id published by the current holder, polling up to ``wait_s`` for it to appear."""
+        deadline = time.monotonic() + wait_s
+        while True:
+            token, run_id = self._call("holder", default=(None, None))
+            if run_id is not None or token is None or time.monotonic() >= deadline:
+                return run_id
+            time.sleep(0.05)
+
+    def start_heartbeat(self) -> None:
+        """Refresh the lock every third of its TTL until release()."""
+        if self._thread is not None:
+            return
+        self._stop = threading.Event()
+        interval = self.ttl_ms / 3000
+
+        def beat(stop: threading.Event) -> None:
+            while not stop.wait(interval):
+                if not self.refresh():
+                    logger.warning(f"Lost ingest lock {self.key}; another worker may take over")
+                    return
+
+        self._thread = threading.Thread(target=beat, args=(self._stop,), name=f"lock-heartbeat-{self.key}", daemon=True)
+        self._thread.start()
+
+    def stop_heartbeat(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+        self._thread = self._stop = None
@@ -0,0 +1,226 @@
+"""MinHash signatures with LSH banding backing the persistent near-duplicate index.
+
+Each program is reduced to BANDS band keys stored in ``program_lsh_bands``.
+Two texts share at least one band with high probability once their token
+Jaccard similarity passes roughly ``(1 / BANDS) ** (1 / ROWS)`` (~0.7), about
+where a TF-IDF cosine of ``neardup_threshold`` lands for equal-length texts.
+Listings full of shared boilerplate still fall into a few large buckets, so a
+lookup only reads the newest BUCKET_LIMIT rows of each bucket: its cost is
+bounded by ``BANDS * BUCKET_LIMIT`` rows however big the table grows.
+
+Candidates are scored by TF-IDF cosine against corpus-wide document
+frequencies (``similarities``), so no vectorizer is fitted per lookup.
+"""
+from __future__ import annotations
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable
+from hashlib import blake2b
+import math
+import re
+import threading
+import time
+import uuid
+import numpy as np
+from sqlalchemy import bindparam, delete, event, func, insert, inspect, select, union_all
+from sqlalchemy.orm import Session
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from core.settings import settings
+from db.models import Program, ProgramLshBand
+
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+BUCKET_LIMIT = 100
+MAX_CANDIDATES = 10
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+# Same token rule as TfidfVectorizer's default token_pattern
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+# Document frequencies over all programs: built by one scan, then kept current
+# by the index hooks of this process and rebuilt every NEARDUP_IDF_REFRESH_S
+_df: dict[str, int] = {}
+_df_docs = 0
+_df_built_at: float | None = None
+_df_lock = threading.Lock()
+
+
+def program_text(title: str | None, description: str | None) -> str:
+    return (title or "") + "\n" + (description or "")
+
+
+def token_counts(text: str) -> Counter:
+    return Counter(t for t in _TOKEN_RE.findall(text.lower()) if t not in ENGLISH_STOP_WORDS)
+
+
+def tokens(text: str) -> set[str]:
+    return set(token_counts(text))
+
+
+def minhash(toks: Iterable[str]) -> np.ndarray | None:
+    x = np.fromiter(
+        (int.from_bytes(blake2b(t.encode("utf-8"), digest_size=4).digest(), "little") % _PRIME for t in toks),
+        dtype=np.uint64,
+    )
+    if x.size == 0:
+        return None
+    return ((np.outer(x, _A) + _B) % _PRIME).min(axis=0)
+
+
+def band_keys(text: str) -> list[str]:
+    sig = minhash(tokens(text))
+    if sig is None:
+        return []
+    return [
+        f"{b:02d}{blake2b(sig[b * ROWS:(b + 1) * ROWS].tobytes(), digest_size=8).hexdigest()}"
+        for b in range(BANDS)
+    ]
+
+
+def _band_rows(program_id: uuid.UUID, title: str | None, description: str | None, city: str | None) -> list[dict]:
+    return [
+        {"program_id": program_id, "band_key": k, "city": city}
+        for k in band_keys(program_text(title, description))
+    ]
+
+
+def index_values(db: Session, values: Iterable[dict]) -> None:
+    """Add band rows for programs bulk-inserted outside the ORM unit of work.
+
+    ``values`` are the column dicts that were inserted into ``programs``.
+    """
+    values = list(values)
+    rows = [r for v in values for r in _band_rows(v["id"], v.get("title"), v.get("description_text"), v.get("city"))]
+    if rows:
+        db.execute(insert(ProgramLshBand), rows)
+    _count_documents(program_text(v.get("title"), v.get("description_text")) for v in values)
+
+
+@lru_cache(maxsize=None)
+def _bucket_query(by_city: bool):
+    """Band hits per program over the newest BUCKET_LIMIT rows of each band bucket.
+
+    Band keys bind as ``k0``..``k{BANDS-1}``, plus ``limit`` and optionally ``city``.
+    """
+    buckets = []
+    for b in range(BANDS):
+        q = select(ProgramLshBand.program_id).where(ProgramLshBand.band_key == bindparam(f"k{b}"))
+        if by_city:
+            q = q.where(ProgramLshBand.city == bindparam("city"))
+        buckets.append(select(q.order_by(ProgramLshBand.id.desc()).limit(BUCKET_LIMIT).subquery()))
+    rows = union_all(*buckets).subquery()
+    hits = func.count().label("hits")
+    return select(rows.c.program_id, hits).group_by(rows.c.program_id).order_by(hits.desc()).limit(bindparam("limit"))
+
+
+def candidate_ids(db: Session, text: str, city: str | None, limit: int = MAX_CANDIDATES) -> list[uuid.UUID]:
+    """Programs sharing at least one band with ``text``, most shared bands first.
+
+    Only the newest BUCKET_LIMIT rows of each band bucket are read.
+    """
+    keys = band_keys(text)
+    if not keys:
+        return []
+    params = {f"k{b}": key for b, key in enumerate(keys)}
+    params["limit"] = limit
+    if city:
+        params["city"] = city
+    return [pid for pid, _ in db.execute(_bucket_query(bool(city)), params)]
+
+
+def _count_documents(texts: Iterable[str], sign: int = 1) -> None:
+    global _df_docs
+    with _df_lock:
+        if _df_built_at is None:
+            return
+        for text in texts:
+            for t in tokens(text):
+                _df[t] = _df.get(t, 0) + sign
+            _df_docs += sign
+
+
+def document_frequencies(db: Session) -> tuple[dict[str, int], int]:
+    """Corpus document frequency per token and the number of programs counted."""
+    global _df, _df_docs, _df_built_at
+    with _df_lock:
+        if _df_built_at is not None and time.monotonic() - _df_built_at < settings.neardup_idf_refresh_s:
+            return _df, _df_docs
+        df: Counter = Counter()
+        n = 0
+        cols = (Program.title, Program.description_text)
+        for title, desc in db.execute(select(*cols).execution_options(yield_per=1000)):
+            df.update(tokens(program_text(title, desc)))
+            n += 1
+        _df, _df_docs, _df_built_at = dict(df), n, time.monotonic()
+        return _df, _df_docs
+
+
+def reset_document_frequencies() -> None:
+    global _df_built_at
+    with _df_lock:
+        _df_built_at = None
+
+
+def similarities(db: Session, text: str, others: list[str]) -> list[float]:
+    """TF-IDF cosine between ``text`` and each of ``others``.
+
+    Same weighting as ``TfidfVectorizer`` (raw counts, smoothed idf, l2 norm),
+    but the idf comes from the whole table instead of a fit on these texts.
+    """
+    df, n = document_frequencies(db)
+
+    def vector(t: str) -> dict[str, float]:
+        w = {tok: c * (math.log((1 + n) / (1 + df.get(tok, 0))) + 1) for tok, c in token_counts(t).items()}
+        norm = math.sqrt(sum(x * x for x in w.values())) or 1.0
+        return {tok: x / norm for tok, x in w.items()}
+
+    q = vector(text)
+    return [sum(x * q[tok] for tok, x in vector(o).items() if tok in q) for o in others]
+
+
+def rebuild_index(db: Session, batch_size: int = 1000) -> int:
+    """Recompute the whole index from ``programs``; used to backfill existing rows."""
+    db.execute(delete(ProgramLshBand))
+    n = 0
+    rows: list[dict] = []
+    cols = (Program.id, Program.title, Program.description_text, Program.city)
+    for pid, title, desc, city in db.execute(select(*cols).execution_options(yield_per=batch_size)):
+        rows.extend(_band_rows(pid, title, desc, city))
+        n += 1
+        if len(rows) >= batch_size * BANDS:
+            db.execute(insert(ProgramLshBand), rows)
+            rows = []
+    if rows:
+        db.execute(insert(ProgramLshBand), rows)
+    reset_document_frequencies()
+    return n
+
+
+@event.listens_for(Program, "after_insert")
+def _index_on_insert(mapper, connection, target: Program) -> None:
+    rows = _band_rows(target.id, target.title, target.description_text, target.city)
+    if rows:
+        connection.execute(insert(ProgramLshBand), rows)
+    _count_documents([program_text(target.title, target.description_text)])
+
+
+@event.listens_for(Program, "after_update")
+def _reindex_on_update(mapper, connection, target: Program) -> None:
+    state = inspect(target)
+    if not any(state.attrs[a].history.has_changes() for a in ("title", "description_text", "city")):
+        return
+    connection.execute(delete(ProgramLshBand).where(ProgramLshBand.program_id == target.id))
+    rows = _band_rows(target.id, target.title, target.description_text, target.city)
+    if rows:
+        connection.execute(insert(ProgramLshBand), rows)
+    title, desc = (state.attrs[a].history for a in ("title", "description_text"))
+    if title.has_changes() or desc.has_changes():
+        old_title = title.deleted[0] if title.deleted else target.title
+        old_desc = desc.deleted[0] if desc.deleted else target.description_text
+        _count_documents([program_text(old_title, old_desc)], -1)
+        _count_documents([program_text(target.title, target.description_text)])
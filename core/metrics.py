@@ -0,0 +1,179 @@
+"""Per-run ETL instrumentation: stage timings, bytes, DB statements, HTTP cache
+hits/misses and the run's peak and growth of resident memory.
+
+Collection is scoped with a context variable, so code on the ingest path can
+call ``stage()`` / ``add_bytes()`` unconditionally and it is a no-op outside a
+run. Stages nest: "upsert" includes the "neardup_db" and "geocode" time spent
+inside it.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterable, Iterator, TypeVar
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+T = TypeVar("T")
+
+# How often the sampler thread reads RSS while a run is being collected
+RSS_SAMPLE_S = 0.25
+_PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+
+
+def current_rss_kb() -> int | None:
+    """Resident set size right now: /proc on Linux, else psutil when installed.
+
+    Unlike ``ru_maxrss`` (the high-water mark of the whole process), this can
+    go down, so samples taken during a run give that run's own peak even in
+    a long-lived worker that served a bigger run earlier.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_KB
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil  # type: ignore
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss // 1024
+
+
+class RunStats:
+    def __init__(self):
+        self.stages: dict[str, dict[str, float]] = {}
+        self.bytes_fetched = 0
+        self.db_statements = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Highest RSS sampled while collecting, and how far it rose above the start
+        self.rss_start_kb: int | None = None
+        self.peak_rss_kb: int | None = None
+        self.rss_growth_kb: int | None = None
+
+    def sample_rss(self) -> None:
+        rss = current_rss_kb()
+        if rss is None:
+            return
+        if self.rss_start_kb is None:
+            self.rss_start_kb = rss
+        self.peak_rss_kb = max(self.peak_rss_kb or 0, rss)
+        if self.rss_start_kb is not None:
+            self.rss_growth_kb = max(self.rss_growth_kb or 0, rss - self.rss_start_kb)
+
+    def record(self, name: str, seconds: float, calls: int = 1) -> None:
+        s = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0})
+        s["calls"] += calls
+        s["seconds"] += seconds
+
+    def merge(self, other: dict[str, Any]) -> None:
+        """Fold a ``to_dict()`` snapshot (e.g. from a Celery subtask) into this one."""
+        for name, s in (other.get("stages") or {}).items():
+            self.record(name, s.get("seconds", 0.0), s.get("calls", 0))
+        self.bytes_fetched += other.get("bytes_fetched") or 0
+        self.db_statements += other.get("db_statements") or 0
+        self.cache_hits += other.get("cache_hits") or 0
+        self.cache_misses += other.get("cache_misses") or 0
+        for key in ("peak_rss_kb", "rss_growth_kb"):
+            value = other.get(key)
+            if value is not None:
+                setattr(self, key, max(getattr(self, key) or 0, value))
+
+    def snapshot(self) -> dict[str, Any]:
+        """Take a last RSS sample and return ``to_dict()``."""
+        self.sample_rss()
+        return self.to_dict()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stages": {k: {"calls": int(v["calls"]), "seconds": round(v["seconds"], 6)} for k, v in self.stages.items()},
+            "bytes_fetched": self.bytes_fetched,
+            "db_statements": self.db_statements,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "peak_rss_kb": self.peak_rss_kb,
+            "rss_growth_kb": self.rss_growth_kb,
+        }
+
+
+_current: ContextVar[RunStats | None] = ContextVar("run_stats", default=None)
+
+
+def current() -> RunStats | None:
+    return _current.get()
+
+
+@contextmanager
+def collecting(stats: RunStats) -> Iterator[RunStats]:
+    """Make ``stats`` the active collector for the enclosed code.
+
+    A daemon thread samples RSS every RSS_SAMPLE_S meanwhile, so the run's
+    peak is caught even when it happens between stages.
+    """
+    token = _current.set(stats)
+    stats.sample_rss()
+    done = threading.Event()
+
+    def sample() -> None:
+        while not done.wait(RSS_SAMPLE_S):
+            stats.sample_rss()
+
+    sampler = threading.Thread(target=sample, name="rss-sampler", daemon=True)
+    sampler.start()
+    try:
+        yield stats
+    finally:
+        done.set()
+        sampler.join()
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.record(name, time.perf_counter() - t0)
+
+
+def timed_iter(items: Iterable[T], name: str) -> Iterator[T]:
+    """Yield from ``items``, charging the time spent producing each one to ``name``."""
+    it = iter(items)
+    while True:
+        with stage(name):
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+        yield item
+
+
+def add_bytes(n: int) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.bytes_fetched += n
+
+
+def add_cache_lookup(hit: bool) -> None:
+    stats = _current.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.db_statements += 1
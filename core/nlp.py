@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Tuple
 import re
 import hashlib
 
@@ -43,31 +43,138 @@ class TagResult:
     reasons: List[str]
 
 
-def rule_based_tags(title: str, description: str) -> TagResult:
-    text = f"{title} {description}".lower()
-    score_lang = sum(w for k, w in LANG_LIT_KEYWORDS.items() if k in text)
-    score_early = sum(w for k, w in EARLY_CHILD_KEYWORDS.items() if k in text)
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation factored along a character trie, so the engine
+    dispatches on each character once instead of retrying every keyword."""
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        alts = [re.escape(ch) + build(sub) for ch, sub in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        # Greedy optional: the longest keyword at a position is tried first
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """All keyword tables compiled into one trie-shaped regex automaton.
+
+    Keywords are matched as substrings (``whole_word`` ones need word
+    boundaries), overlapping matches included. The pattern is a zero-width
+    lookahead, so ``findall`` reports the longest keyword starting at every
+    position without leaving C; shorter keywords that are prefixes of it come
+    from a precomputed table. The cost of a pass grows with the text, not
+    with the number of keywords.
+
+    Tables of at most ``direct_max`` keywords are scanned with one ``in``
+    check per keyword instead: CPython's substring search beats any regex
+    pass at that size (``python -m benchmarks.bench_tagging``).
+    """
+
+    DIRECT_MAX = 200
+
+    def __init__(self, entries: Iterable[Tuple[str, str, int, bool]], direct_max: int | None = None):
+        # entries: (group, keyword, weight, whole_word)
+        self.groups: Dict[str, List[str]] = {}
+        self.weights: Dict[Tuple[str, str], int] = {}
+        self.whole_word: Dict[str, bool] = {}
+        for group, kw, weight, whole in entries:
+            self.groups.setdefault(group, []).append(kw)
+            self.weights[(group, kw)] = weight
+            self.whole_word[kw] = whole
+        self.group_of: Dict[str, List[str]] = {}
+        for group, kws in self.groups.items():
+            for kw in kws:
+                self.group_of.setdefault(kw, []).append(group)
+        kws = sorted(self.whole_word, key=len, reverse=True)
+        self.keywords = kws
+        self.direct = len(kws) <= (self.DIRECT_MAX if direct_max is None else direct_max)
+        self.bounded = {kw: re.compile(rf"\b{re.escape(kw)}\b") for kw in kws if self.whole_word[kw]}
+        self.prefixes = {kw: [p for p in kws if kw.startswith(p)] for kw in kws}
+        self.pattern = re.compile(f"(?=({_trie_pattern(kws)}))")
+
+    def _whole(self, text: str, kw: str) -> bool:
+        bounded = self.bounded.get(kw)
+        return bounded is None or bounded.search(text) is not None
+
+    def scan(self, text: str) -> set:
+        """Keywords found in an already lower-cased text."""
+        if self.direct:
+            return {kw for kw in self.keywords if kw in text and self._whole(text, kw)}
+        found: set = set()
+        for longest in set(self.pattern.findall(text)):
+            for kw in self.prefixes[longest]:
+                if kw not in found and self._whole(text, kw):
+                    found.add(kw)
+        return found
+
+    def scores(self, found: set) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for kw in found:
+            for group in self.group_of[kw]:
+                out[group] = out.get(group, 0) + self.weights.get((group, kw), 0)
+        return out
+
+
+# Category tables in priority order; on equal scores the later table wins
+CATEGORY_KEYWORDS: List[Tuple[str, Dict[str, int]]] = [
+    ("Language & Literature", LANG_LIT_KEYWORDS),
+    ("Early Childhood Education", EARLY_CHILD_KEYWORDS),
+]
+FREE_KEYWORDS = ["free"]
+ONLINE_KEYWORDS = ["online", "virtual", "webinar", "zoom"]
+
+
+def _build_matcher() -> KeywordMatcher:
+    entries = [(cat, kw, w, False) for cat, table in CATEGORY_KEYWORDS for kw, w in table.items()]
+    entries += [("free", kw, 1, True) for kw in FREE_KEYWORDS]
+    entries += [("online", kw, 1, False) for kw in ONLINE_KEYWORDS]
+    return KeywordMatcher(entries)
+
+
+_MATCHER = _build_matcher()
+
+
+def _tag_result(found: set) -> TagResult:
+    scores = _MATCHER.scores(found)
     category = None
+    best = 0
+    for name, _ in CATEGORY_KEYWORDS:
+        score = scores.get(name, 0)
+        if score > 0 and score >= best:
+            category, best = name, score
     reasons: List[str] = []
     tags: List[str] = []
-    if score_lang > score_early and score_lang > 0:
-        category = "Language & Literature"
-        reasons += [f"keyword:{k}" for k in LANG_LIT_KEYWORDS if k in text]
-    elif score_early > 0:
-        category = "Early Childhood Education"
-        reasons += [f"keyword:{k}" for k in EARLY_CHILD_KEYWORDS if k in text]
-
-    if re.search(r"\bfree\b", text):
+    if category is not None:
+        reasons += [f"keyword:{k}" for k in _MATCHER.groups[category] if k in found]
+
+    if scores.get("free"):
         tags.append("free")
         free_flag = True
         reasons.append("keyword:free")
     else:
         free_flag = None
 
-    online_flag = True if re.search(r"online|virtual|webinar|zoom", text) else None
+    online_flag = True if scores.get("online") else None
     if online_flag:
         tags.append("online")
         reasons.append("keyword:online")
 
     return TagResult(category=category, tags=tags, free_flag=free_flag, online_flag=online_flag, reasons=list(dict.fromkeys(reasons)))
 
+
+def rule_based_tags(title: str, description: str) -> TagResult:
+    return rule_based_tags_batch([(title, description)])[0]
+
+
+def rule_based_tags_batch(items: Iterable[Tuple[str, str]]) -> List[TagResult]:
+    """Tag a whole parsed batch of (title, description) pairs with one scan."""
+    return [_tag_result(_MATCHER.scan(f"{title} {description}".lower())) for title, description in items]
@@ -0,0 +1,139 @@
+"""Optional process pool for the CPU-bound parse stage.
+
+With ``PARSE_WORKERS`` > 0, ``run_adapter`` hands raw payloads to a shared
+``ProcessPoolExecutor``: the adapter is pickled (its ``__getstate__`` drops
+sessions, browsers and other runtime resources), ``parse()`` and tagging run
+in a worker, and only the resulting ``ProgramRecord`` lists come back to the
+DB writer, in submission order. Adapters that cannot be pickled, or processes
+that cannot start children (daemonic Celery prefork workers), fall back to
+parsing inline.
+"""
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Iterator
+import atexit
+import pickle
+import threading
+import time
+
+from loguru import logger
+
+from adapters.base import ProgramRecord, SourceAdapter
+from core import metrics
+from core.settings import settings
+
+_lock = threading.Lock()
+_pool: ProcessPoolExecutor | None = None
+_unavailable = False
+
+
+def _parse(adapter: SourceAdapter, raw: Any) -> tuple[list[ProgramRecord], float]:
+    t0 = time.perf_counter()
+    records = list(adapter.parse(raw))
+    return records, time.perf_counter() - t0
+
+
+def get_pool() -> ProcessPoolExecutor | None:
+    global _pool, _unavailable
+    with _lock:
+        if _pool is None and not _unavailable and settings.parse_workers > 0:
+            try:
+                _pool = ProcessPoolExecutor(max_workers=settings.parse_workers)
+                # Start the workers now so "no children allowed" surfaces here
+                _pool.submit(int).result()
+            except Exception as e:
+                logger.warning(f"Parse pool unavailable, parsing inline: {e}")
+                _pool, _unavailable = None, True
+        return _pool
+
+
+def shutdown() -> None:
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown)
+
+
+def _discard(pool: ProcessPoolExecutor) -> None:
+    """Forget a broken pool so the next run starts a fresh one."""
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def picklable(adapter: SourceAdapter) -> bool:
+    try:
+        pickle.dumps(adapter)
+        return True
+    except Exception as e:
+        logger.warning(f"{adapter.name} cannot be sent to parse workers ({e}); parsing inline")
+        return False
+
+
+class ParsePipeline:
+    """Keeps up to ``depth`` payloads parsing while the caller writes earlier ones."""
+
+    def __init__(self, adapter: SourceAdapter, pool: ProcessPoolExecutor, depth: int):
+        self.adapter = adapter
+        self.pool = pool
+        self.depth = max(1, depth)
+        self.pending: deque[tuple[Any, Any, Future | None]] = deque()
+
+    def submit(self, key: Any, raw: Any) -> None:
+        try:
+            fut: Future | None = self.pool.submit(_parse, self.adapter, raw)
+        except (BrokenProcessPool, RuntimeError):
+            fut = None
+        self.pending.append((key, raw, fut))
+
+    def _inline(self, key: Any, raw: Any) -> tuple[Any, list[ProgramRecord] | None, Exception | None]:
+        try:
+            with metrics.stage("parse"):
+                return key, list(self.adapter.parse(raw)), None
+        except Exception as e:
+            return key, None, e
+
+    def _next(self) -> tuple[Any, list[ProgramRecord] | None, Exception | None]:
+        key, raw, fut = self.pending.popleft()
+        if fut is None:
+            return self._inline(key, raw)
+        try:
+            with metrics.stage("parse_wait"):
+                records, seconds = fut.result()
+        except BrokenProcessPool:
+            logger.warning(f"Parse pool broke while parsing {self.adapter.name}; parsing inline")
+            _discard(self.pool)
+            return self._inline(key, raw)
+        except Exception as e:
+            return key, None, e
+        stats = metrics.current()
+        if stats is not None:
+            stats.record("parse", seconds)
+        return key, records, None
+
+    def ready(self) -> Iterator[tuple[Any, list[ProgramRecord] | None, Exception | None]]:
+        """Yield ``(key, records, error)`` oldest-first while the pipeline is full."""
+        while len(self.pending) >= self.depth:
+            yield self._next()
+
+    def drain(self) -> Iterator[tuple[Any, list[ProgramRecord] | None, Exception | None]]:
+        while self.pending:
+            yield self._next()
+
+
+def pipeline_for(adapter: SourceAdapter) -> ParsePipeline | None:
+    """A pipeline for ``adapter``, or None when parsing should stay inline."""
+    if settings.parse_workers <= 0 or not picklable(adapter):
+        return None
+    pool = get_pool()
+    if pool is None:
+        return None
+    return ParsePipeline(adapter, pool, 2 * settings.parse_workers)
@@ -23,6 +23,11 @@ class Settings(BaseSettings):
     maps_token: str | None = None
 
     enable_playwright: bool = False
+    # Pages kept open in the shared Playwright browser and navigations before a page is recycled
+    playwright_max_pages: int = int(os.getenv("PLAYWRIGHT_MAX_PAGES", 2))
+    playwright_recycle_after: int = int(os.getenv("PLAYWRIGHT_RECYCLE_AFTER", 50))
+    # "full" (html.parser over the whole page) or "fast" (lxml, card subtrees only)
+    library_html_parser: str = os.getenv("LIBRARY_HTML_PARSER", "full")
     enable_embeddings: bool = False
 
     allowed_origins: Union[List[str], str] = ["http://localhost:3000", "http://localhost:8501"]
@@ -32,7 +37,65 @@ class Settings(BaseSettings):
     admin_username: str = os.getenv("ADMIN_USERNAME", "admin")
     admin_password: str = os.getenv("ADMIN_PASSWORD", "change-me")
     neardup_threshold: float = float(os.getenv("NEARDUP_THRESHOLD", 0.85))
+    # "minhash" (persistent LSH index over all programs) or "tfidf" (scan the 200 newest)
+    neardup_backend: str = os.getenv("NEARDUP_BACKEND", "minhash")
+    # How long the minhash backend's corpus document frequencies are reused before a rescan
+    neardup_idf_refresh_s: int = int(os.getenv("NEARDUP_IDF_REFRESH_S", 3600))
+    # Batches larger than this use blocked sparse neighbour search instead of a dense matrix
+    neardup_dense_max: int = int(os.getenv("NEARDUP_DENSE_MAX", 200))
     geocoding_enabled: bool = os.getenv("GEOCODING_ENABLED", "false").lower() == "true"
+    # Geocode after upsert via the Celery "geocode" queue instead of inline
+    geocode_in_background: bool = os.getenv("GEOCODE_IN_BACKGROUND", "true").lower() == "true"
+    # "hybrid" (gazetteer for city-level, Nominatim for streets), "gazetteer" (offline only) or "nominatim"
+    geocoder: str = os.getenv("GEOCODER", "hybrid")
+    gazetteer_path: str | None = os.getenv("GAZETTEER_PATH") or None
+    geocode_negative_ttl_s: int = int(os.getenv("GEOCODE_NEGATIVE_TTL_S", 7 * 24 * 3600))
+
+    ingest_parallel: bool = os.getenv("INGEST_PARALLEL", "false").lower() == "true"
+    ingest_concurrency: int = int(os.getenv("INGEST_CONCURRENCY", 3))
+    ingest_adapter_timeout_s: float = float(os.getenv("INGEST_ADAPTER_TIMEOUT_S", 0))
+    # Nightly task fans out per-source/per-identifier Celery tasks instead of one serial run
+    ingest_fanout: bool = os.getenv("INGEST_FANOUT", "false").lower() == "true"
+    # Parse/upsert/commit each payload in chunks of this many records (0 = whole payload)
+    ingest_chunk_size: int = int(os.getenv("INGEST_CHUNK_SIZE", 0))
+    # Worker processes for the parse stage (0 = parse inline in the ingest thread)
+    parse_workers: int = int(os.getenv("PARSE_WORKERS", 0))
+    # One ingest per source at a time (Redis lock, in-process fallback); overlapping callers attach to its Run
+    ingest_lock_enabled: bool = os.getenv("INGEST_LOCK_ENABLED", "true").lower() == "true"
+    ingest_lock_ttl_s: float = float(os.getenv("INGEST_LOCK_TTL_S", 600))
+    # While Redis is unreachable, how long to use the in-process lock before trying Redis again
+    ingest_lock_redis_retry_s: float = float(os.getenv("INGEST_LOCK_REDIS_RETRY_S", 30))
+    # A running Run with no heartbeat for this long is marked failed (and becomes resumable)
+    run_stale_after_s: float = float(os.getenv("RUN_STALE_AFTER_S", 1800))
+    # Send ETag/Last-Modified validators and skip identifiers whose payload is unchanged
+    conditional_fetch: bool = os.getenv("CONDITIONAL_FETCH", "true").lower() == "true"
+    # Page API sources from a stored per-identifier high-water mark (only new/changed events)
+    incremental_sync: bool = os.getenv("INCREMENTAL_SYNC", "false").lower() == "true"
+    sync_max_pages: int = int(os.getenv("SYNC_MAX_PAGES", 50))
+    # Keep every fetched payload in a gzip content-addressed store for offline replay
+    archive_payloads: bool = os.getenv("ARCHIVE_PAYLOADS", "false").lower() == "true"
+    archive_dir: str = os.getenv("ARCHIVE_DIR", "./data/archive")
+    # Per-adapter HTTP session: response cache backend (sqlite|redis|memory|off), lifetime, retries, pool size
+    http_cache_backend: str = os.getenv("HTTP_CACHE_BACKEND", "sqlite")
+    http_cache_dir: str = os.getenv("HTTP_CACHE_DIR", "./data/http_cache")
+    http_cache_expire_s: int = int(os.getenv("HTTP_CACHE_EXPIRE_S", 3600))
+    http_retries: int = int(os.getenv("HTTP_RETRIES", 3))
+    http_backoff_s: float = float(os.getenv("HTTP_BACKOFF_S", 0.5))
+    http_pool_size: int = int(os.getenv("HTTP_POOL_SIZE", 10))
+    # Per-host token bucket (requests/s, 0 = unlimited); halves on 429 and recovers on success
+    fetch_host_rate: float = float(os.getenv("FETCH_HOST_RATE", 5))
+    fetch_host_burst: float = float(os.getenv("FETCH_HOST_BURST", 5))
+    # A 429 whose Retry-After exceeds this is not retried in-run
+    http_max_retry_after_s: float = float(os.getenv("HTTP_MAX_RETRY_AFTER_S", 60))
+    # Consecutive fetch failures that open a source's circuit breaker (0 disables it)
+    breaker_threshold: int = int(os.getenv("BREAKER_THRESHOLD", 5))
+    # After a run opens the breaker, the next run within this window starts half-open
+    breaker_cooldown_s: int = int(os.getenv("BREAKER_COOLDOWN_S", 900))
+    # robots.txt is re-fetched at most this often and cached on the Source row
+    robots_ttl_s: int = int(os.getenv("ROBOTS_TTL_S", 24 * 3600))
+    async_fetch_enabled: bool = os.getenv("ASYNC_FETCH_ENABLED", "false").lower() == "true"
+    fetch_concurrency: int = int(os.getenv("FETCH_CONCURRENCY", 8))
+    fetch_per_host_limit: int = int(os.getenv("FETCH_PER_HOST_LIMIT", 4))
 
     @property
     def sqlalchemy_url(self) -> str:
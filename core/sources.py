@@ -0,0 +1,103 @@
+"""Per-source crawl state persisted alongside the Source table."""
+from __future__ import annotations
+from typing import Any, Iterable
+from datetime import datetime, timedelta
+import hashlib
+import json
+from sqlalchemy.orm import Session
+from adapters.base import SourceAdapter, FetchResult
+from adapters.robots import RobotsPolicy
+from core.settings import settings
+from db.models import Source, SourceIdentifier
+
+
+def get_source(db: Session, adapter: SourceAdapter) -> Source:
+    src = db.query(Source).filter(Source.name == adapter.name).one_or_none()
+    if src is None:
+        src = Source(name=adapter.name, base_url=adapter.base_url)
+        db.add(src)
+        db.flush()
+    return src
+
+
+def load_robots(db: Session, adapter: SourceAdapter, source: Source | None = None) -> RobotsPolicy | None:
+    """Attach the cached robots policy to ``adapter``, re-fetching once the TTL lapses."""
+    if not adapter.respects_robots:
+        return None
+    src = source or get_source(db, adapter)
+    now = datetime.utcnow()
+    if src.last_robots_fetch is None or now - src.last_robots_fetch > timedelta(seconds=settings.robots_ttl_s):
+        policy = adapter.fetch_robots()
+        # RFC 9309 lets an unreachable robots.txt fall back to the last copy served
+        if not (policy.unreachable and src.robots_txt is not None):
+            src.robots_ok = policy.ok
+            src.crawl_delay_ms = policy.crawl_delay_ms
+            src.robots_txt = policy.rules
+        src.last_robots_fetch = policy.fetched_at or now
+    adapter.robots = RobotsPolicy(ok=bool(src.robots_ok), crawl_delay_ms=src.crawl_delay_ms, fetched_at=src.last_robots_fetch, rules=src.robots_txt)
+    return adapter.robots
+
+
+def identifier_states(db: Session, source_id: int, identifiers: Iterable[str] | None = None) -> dict[str, SourceIdentifier]:
+    q = db.query(SourceIdentifier).filter(SourceIdentifier.source_id == source_id)
+    if identifiers is not None:
+        q = q.filter(SourceIdentifier.identifier.in_(list(identifiers)))
+    return {s.identifier: s for s in q}
+
+
+def validators_for(state: SourceIdentifier | None, conditional: bool = True, incremental: bool = False) -> dict:
+    if state is None:
+        return {}
+    pairs = []
+    if conditional:
+        pairs += [("etag", state.etag), ("last_modified", state.last_modified)]
+    if incremental:
+        pairs.append(("cursor", state.sync_cursor))
+    return {k: v for k, v in pairs if v}
+
+
+def fetch_validators(adapter: SourceAdapter, states: dict[str, SourceIdentifier], full_resync: bool = False) -> dict[str, dict] | None:
+    """Per-identifier validators for iter_fetch, or None for plain fetches.
+
+    A full resync sends empty validators: no conditional headers and no
+    cursor, so incremental adapters page through everything and the stored
+    marks are rebuilt from the complete result.
+    """
+    incremental = settings.incremental_sync and adapter.supports_incremental
+    if not (settings.conditional_fetch or incremental):
+        return None
+    if full_resync:
+        return {}
+    return {i: validators_for(st, settings.conditional_fetch, incremental) for i, st in states.items()}
+
+
+def payload_bytes(raw: Any) -> bytes:
+    """Canonical byte form of a fetched payload (also what ``payload_hash`` hashes)."""
+    if isinstance(raw, (bytes, str)):
+        return raw.encode("utf-8") if isinstance(raw, str) else raw
+    return json.dumps(raw, sort_keys=True, default=str).encode("utf-8")
+
+
+def payload_hash(raw: Any) -> str:
+    return hashlib.sha256(payload_bytes(raw)).hexdigest()
+
+
+def record_fetch(db: Session, source_id: int, states: dict[str, SourceIdentifier], ident: str, result: FetchResult, content_hash: str | None) -> SourceIdentifier:
+    now = datetime.utcnow()
+    state = states.get(ident)
+    if state is None:
+        state = SourceIdentifier(source_id=source_id, identifier=ident)
+        db.add(state)
+        states[ident] = state
+    state.last_fetched_at = now
+    if result.etag:
+        state.etag = result.etag
+    if result.last_modified:
+        state.last_modified = result.last_modified
+    if result.cursor:
+        state.sync_cursor = result.cursor
+        state.last_synced_at = now
+    if content_hash and content_hash != state.content_hash:
+        state.content_hash = content_hash
+        state.last_changed_at = now
+    return state
@@ -0,0 +1,37 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002_unique_dedupe_hash'
+down_revision = '0001_initial'
+branch_labels = None
+depends_on = None
+
+
+def _merge_duplicate_hashes() -> None:
+    """Keep the earliest program per dedupe_hash and repoint its duplicates' snapshots to it."""
+    bind = op.get_bind()
+    programs = sa.table('programs', sa.column('id'), sa.column('dedupe_hash'), sa.column('created_at'))
+    snapshots = sa.table('snapshots', sa.column('program_id'))
+    dup_hashes = bind.execute(
+        sa.select(programs.c.dedupe_hash).group_by(programs.c.dedupe_hash).having(sa.func.count() > 1)
+    ).scalars().all()
+    for h in dup_hashes:
+        ids = bind.execute(
+            sa.select(programs.c.id).where(programs.c.dedupe_hash == h).order_by(programs.c.created_at, programs.c.id)
+        ).scalars().all()
+        keep, drop = ids[0], ids[1:]
+        bind.execute(snapshots.update().where(snapshots.c.program_id.in_(drop)).values(program_id=keep))
+        bind.execute(programs.delete().where(programs.c.id.in_(drop)))
+
+
+def upgrade() -> None:
+    # Bulk upsert relies on INSERT ... ON CONFLICT (dedupe_hash)
+    _merge_duplicate_hashes()
+    op.drop_index('ix_programs_dedupe_hash', table_name='programs')
+    op.create_index('ix_programs_dedupe_hash', 'programs', ['dedupe_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_programs_dedupe_hash', table_name='programs')
+    op.create_index('ix_programs_dedupe_hash', 'programs', ['dedupe_hash'])
@@ -0,0 +1,27 @@
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0003_program_lsh_bands'
+down_revision = '0002_unique_dedupe_hash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Backfill for existing programs: python scripts/rebuild_neardup_index.py
+    op.create_table('program_lsh_bands',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('program_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('programs.id'), nullable=False),
+        sa.Column('band_key', sa.String(length=18), nullable=False),
+        sa.Column('city', sa.String(length=128), nullable=True)
+    )
+    op.create_index('ix_program_lsh_bands_program_id', 'program_lsh_bands', ['program_id'])
+    op.create_index('ix_program_lsh_bands_band_key', 'program_lsh_bands', ['band_key'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_program_lsh_bands_band_key', table_name='program_lsh_bands')
+    op.drop_index('ix_program_lsh_bands_program_id', table_name='program_lsh_bands')
+    op.drop_table('program_lsh_bands')
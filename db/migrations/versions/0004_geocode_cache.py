@@ -0,0 +1,23 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004_geocode_cache'
+down_revision = '0003_program_lsh_bands'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('geocode_cache',
+        sa.Column('key', sa.String(length=512), primary_key=True),
+        sa.Column('lat', sa.Float(), nullable=True),
+        sa.Column('lon', sa.Float(), nullable=True),
+        sa.Column('found', sa.Boolean(), nullable=False, server_default=sa.text('true')),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('geocode_cache')
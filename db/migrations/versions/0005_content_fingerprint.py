@@ -0,0 +1,18 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005_content_fingerprint'
+down_revision = '0004_geocode_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('programs', sa.Column('content_fingerprint', sa.String(length=64), nullable=True))
+    op.add_column('runs', sa.Column('unchanged', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('runs', 'unchanged')
+    op.drop_column('programs', 'content_fingerprint')
@@ -0,0 +1,30 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006_source_identifiers'
+down_revision = '0005_content_fingerprint'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('source_identifiers',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('source_id', sa.Integer(), sa.ForeignKey('sources.id'), nullable=False),
+        sa.Column('identifier', sa.String(length=1024), nullable=False),
+        sa.Column('etag', sa.String(length=255), nullable=True),
+        sa.Column('last_modified', sa.String(length=64), nullable=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.Column('last_fetched_at', sa.DateTime(), nullable=True),
+        sa.Column('last_changed_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('source_id', 'identifier', name='uq_source_identifiers_source_identifier')
+    )
+    op.create_index('ix_source_identifiers_source_id', 'source_identifiers', ['source_id'])
+    op.add_column('runs', sa.Column('skipped_unchanged', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('runs', 'skipped_unchanged')
+    op.drop_index('ix_source_identifiers_source_id', table_name='source_identifiers')
+    op.drop_table('source_identifiers')
@@ -0,0 +1,18 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007_sync_cursors'
+down_revision = '0006_source_identifiers'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('source_identifiers', sa.Column('sync_cursor', sa.String(length=255), nullable=True))
+    op.add_column('source_identifiers', sa.Column('last_synced_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('source_identifiers', 'last_synced_at')
+    op.drop_column('source_identifiers', 'sync_cursor')
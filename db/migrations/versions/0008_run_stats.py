@@ -0,0 +1,18 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008_run_stats'
+down_revision = '0007_sync_cursors'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('runs', sa.Column('stats', sa.JSON(), nullable=True))
+    op.create_index('ix_runs_source_started_at', 'runs', ['source', 'started_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_runs_source_started_at', table_name='runs')
+    op.drop_column('runs', 'stats')
@@ -0,0 +1,16 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009_run_mode'
+down_revision = '0008_run_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('runs', sa.Column('mode', sa.String(length=16), nullable=False, server_default='fetch'))
+
+
+def downgrade() -> None:
+    op.drop_column('runs', 'mode')
@@ -0,0 +1,16 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010_run_breaker'
+down_revision = '0009_run_mode'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('runs', sa.Column('breaker', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('runs', 'breaker')
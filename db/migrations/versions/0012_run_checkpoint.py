@@ -0,0 +1,18 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0012_run_checkpoint'
+down_revision = '0011_run_dedupe_saved'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('runs', sa.Column('checkpoint', sa.JSON(), nullable=True))
+    op.add_column('runs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('runs', 'heartbeat_at')
+    op.drop_column('runs', 'checkpoint')
@@ -0,0 +1,16 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0013_source_robots_txt'
+down_revision = '0012_run_checkpoint'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('sources', sa.Column('robots_txt', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sources', 'robots_txt')
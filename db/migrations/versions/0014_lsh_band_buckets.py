@@ -0,0 +1,21 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0014_lsh_band_buckets'
+down_revision = '0013_source_robots_txt'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Band keys now use 8 rows per band; rebuild with python scripts/rebuild_neardup_index.py
+    op.execute(sa.text('DELETE FROM program_lsh_bands'))
+    op.drop_index('ix_program_lsh_bands_band_key', table_name='program_lsh_bands')
+    op.create_index('ix_program_lsh_bands_band_key_id', 'program_lsh_bands', ['band_key', 'id'])
+
+
+def downgrade() -> None:
+    op.execute(sa.text('DELETE FROM program_lsh_bands'))
+    op.drop_index('ix_program_lsh_bands_band_key_id', table_name='program_lsh_bands')
+    op.create_index('ix_program_lsh_bands_band_key', 'program_lsh_bands', ['band_key'])
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from sqlalchemy.orm import declarative_base, relationship, Mapped, mapped_column
-from sqlalchemy import String, Text, Integer, DateTime, Boolean, ForeignKey, JSON, Index
+from sqlalchemy import String, Text, Integer, DateTime, Boolean, ForeignKey, JSON, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime
@@ -47,6 +47,38 @@ class Source(Base):
     robots_ok: Mapped[bool] = mapped_column(Boolean, default=True)
     crawl_delay_ms: Mapped[int | None]
     last_robots_fetch: Mapped[datetime | None]
+    # Last robots.txt body served with a 2xx; per-URL rules are evaluated from it
+    robots_txt: Mapped[str | None] = mapped_column(Text)
+
+
+class SourceIdentifier(Base):
+    """HTTP validators and payload hash for one discover() identifier of a source."""
+    __tablename__ = "source_identifiers"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    source_id: Mapped[int] = mapped_column(Integer, ForeignKey("sources.id"), index=True)
+    identifier: Mapped[str] = mapped_column(String(1024))
+    etag: Mapped[str | None] = mapped_column(String(255))
+    last_modified: Mapped[str | None] = mapped_column(String(64))
+    content_hash: Mapped[str | None] = mapped_column(String(64))
+    last_fetched_at: Mapped[datetime | None]
+    last_changed_at: Mapped[datetime | None]
+    # Incremental sync high-water mark (e.g. last "changed" timestamp seen)
+    sync_cursor: Mapped[str | None] = mapped_column(String(255))
+    last_synced_at: Mapped[datetime | None]
+
+    __table_args__ = (
+        UniqueConstraint("source_id", "identifier", name="uq_source_identifiers_source_identifier"),
+    )
+
+
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+    key: Mapped[str] = mapped_column(String(512), primary_key=True)
+    lat: Mapped[float | None]
+    lon: Mapped[float | None]
+    found: Mapped[bool] = mapped_column(Boolean, default=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime)
 
 
 class Program(Base):
@@ -85,7 +117,8 @@ class Program(Base):
     provenance: Mapped[dict | None] = mapped_column(JSON)
     quality_score: Mapped[int | None]
     reason_tags: Mapped[list[str] | None] = mapped_column(JSON)
-    dedupe_hash: Mapped[str] = mapped_column(String(64), index=True)
+    dedupe_hash: Mapped[str] = mapped_column(String(64), index=True, unique=True)
+    content_fingerprint: Mapped[str | None] = mapped_column(String(64))
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
@@ -94,6 +127,17 @@ class Program(Base):
     )
 
 
+class ProgramLshBand(Base):
+    __tablename__ = "program_lsh_bands"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    program_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("programs.id"), index=True)
+    band_key: Mapped[str] = mapped_column(String(18))
+    city: Mapped[str | None] = mapped_column(String(128))
+
+    # Lookups read the newest rows of each band bucket
+    __table_args__ = (Index("ix_program_lsh_bands_band_key_id", "band_key", "id"),)
+
+
 class Snapshot(Base):
     __tablename__ = "snapshots"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -110,10 +154,26 @@ class Run(Base):
     finished_at: Mapped[datetime | None]
     source: Mapped[str | None] = mapped_column(String(64))
     status: Mapped[str] = mapped_column(String(32), default="running")
+    # "fetch" for live ingests, "replay" for runs fed from the payload archive
+    mode: Mapped[str] = mapped_column(String(16), default="fetch")
     inserted: Mapped[int] = mapped_column(Integer, default=0)
     updated: Mapped[int] = mapped_column(Integer, default=0)
+    unchanged: Mapped[int] = mapped_column(Integer, default=0)
+    skipped_unchanged: Mapped[int] = mapped_column(Integer, default=0)
     errors: Mapped[int] = mapped_column(Integer, default=0)
+    # Records recognised as repeats within the run and never looked up in the DB
+    dedupe_lookups_saved: Mapped[int] = mapped_column(Integer, default=0)
     error_samples: Mapped[list[str] | None] = mapped_column(JSON)
+    # Per-stage timings, bytes fetched, DB statement count and peak RSS (core.metrics)
+    stats: Mapped[dict | None] = mapped_column(JSON)
+    # Fetch circuit-breaker state at the end of the run (core.breaker)
+    breaker: Mapped[dict | None] = mapped_column(JSON)
+    # Completed identifiers ({"done": [...], "last": ...}) for resuming an interrupted run
+    checkpoint: Mapped[dict | None] = mapped_column(JSON)
+    # Bumped with every identifier; running runs without a recent one are stale
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    __table_args__ = (Index("ix_runs_source_started_at", "source", "started_at"),)
 
 
 class AuditLog(Base):
@@ -1,12 +1,17 @@
+import argparse
+
 from core.db import SessionLocal
 from core.etl import ingest_all_sources
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Run every source adapter once.")
+    parser.add_argument("--full-resync", action="store_true", help="ignore stored cursors/validators and re-pull everything")
+    parser.add_argument("--resume", action="store_true", help="continue interrupted runs from their last checkpoint")
+    args = parser.parse_args()
     with SessionLocal() as db:
-        ingest_all_sources(db)
+        ingest_all_sources(db, full_resync=args.full_resync, resume=args.resume)
 
 
 if __name__ == "__main__":
     main()
-
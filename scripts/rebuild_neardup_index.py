@@ -0,0 +1,13 @@
+from core.db import SessionLocal
+from core.lsh import rebuild_index
+
+
+def main():
+    with SessionLocal() as db:
+        n = rebuild_index(db)
+        db.commit()
+    print(f"Indexed {n} programs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import argparse
+from datetime import datetime
+
+from core.db import SessionLocal
+from core.etl import replay_archive
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-parse archived payloads (ARCHIVE_DIR) without fetching.")
+    parser.add_argument("--source", action="append", help="adapter name; repeat for several (default: all)")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="only payloads fetched at/after this UTC time")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="only payloads fetched before this UTC time")
+    parser.add_argument("--latest-only", action="store_true", help="replay just the newest payload per identifier")
+    parser.add_argument("--serial", action="store_true", help="replay sources one after another")
+    args = parser.parse_args()
+    with SessionLocal() as db:
+        runs = replay_archive(db, args.source, args.since, args.until, args.latest_only, parallel=not args.serial)
+        for r in runs:
+            print(f"{r.source}: {r.status} inserted={r.inserted} updated={r.updated} unchanged={r.unchanged} errors={r.errors}")
+
+
+if __name__ == "__main__":
+    main()
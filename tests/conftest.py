@@ -0,0 +1,37 @@
+import uuid
+
+from adapters.base import SourceAdapter, ProgramRecord
+
+# Far enough apart that near-duplicate detection never merges two of them
+TOPICS = ["Lego robotics lab", "Watercolour studio", "Junior chess club", "Bush kinder walk", "Ukulele circle", "Puppet theatre"]
+
+
+class TopicAdapter(SourceAdapter):
+    """Fake source serving one program per ``page-N`` identifier, on TOPICS[N].
+
+    Names default to ``<prefix>_<random>`` and titles carry a random tag, so
+    reruns against the shared dev database never match earlier programs.
+    """
+
+    prefix = "fake"
+
+    def __init__(self, name: str | None = None, n: int = len(TOPICS)):
+        self.name = name or f"{self.prefix}_{uuid.uuid4().hex[:8]}"
+        self.n = n
+        self.tag = uuid.uuid4().hex[:8]
+
+    def discover(self):
+        return [f"page-{i}" for i in range(self.n)]
+
+    def fetch_raw(self, identifier):
+        # The tag keeps payload hashes apart between adapters reusing a name
+        return {"ident": identifier, "tag": self.tag}
+
+    def topic(self, raw) -> str:
+        return TOPICS[int(raw["ident"].split("-")[1])]
+
+    def title(self, topic: str) -> str:
+        return f"{topic} {self.name} {self.tag}"
+
+    def parse(self, raw):
+        yield ProgramRecord(title=self.title(self.topic(raw)), source=self.name, source_url=f"http://x/{self.tag}/{raw['ident']}")
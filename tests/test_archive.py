@@ -0,0 +1,51 @@
+import uuid
+
+from adapters.base import SourceAdapter, ProgramRecord
+from core import archive
+from core.db import SessionLocal
+from core.etl import run_adapter, replay_adapter
+from core.settings import settings
+
+
+class ArchivedAdapter(SourceAdapter):
+    def __init__(self):
+        self.name = f"arch_{uuid.uuid4().hex[:8]}"
+        self.category = "Old"
+        self.offline = False
+
+    def discover(self):
+        return ["p1", "p2"]
+
+    def fetch_raw(self, identifier):
+        if self.offline:
+            raise RuntimeError("network used during replay")
+        return {"ident": identifier, "name": self.name}
+
+    def parse(self, raw):
+        topic = {"p1": "Marimba ensemble", "p2": "Origami folding"}[raw["ident"]]
+        yield ProgramRecord(title=f"{topic} {raw['name']}", source=raw["name"], source_url="http://x", category=self.category)
+
+
+def test_store_is_content_addressed(tmp_path):
+    a = archive.store("src", "x", {"k": 1}, root=tmp_path)
+    b = archive.store("src", "y", {"k": 1}, root=tmp_path)
+    assert a == b and len(list((tmp_path / "objects").rglob("*.gz"))) == 1
+    assert [e["identifier"] for e in archive.entries("src", root=tmp_path)] == ["x", "y"]
+    assert archive.load(a, root=tmp_path) == {"k": 1}
+
+
+def test_replay_reparses_archived_payloads_offline(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "archive_payloads", True)
+    monkeypatch.setattr(settings, "archive_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "geocoding_enabled", False)
+    adapter = ArchivedAdapter()
+    with SessionLocal() as db:
+        first = run_adapter(db, adapter)
+        assert first.inserted == 2
+        assert len(archive.entries(adapter.name)) == 2
+
+        adapter.offline = True
+        adapter.category = "New"
+        replay = replay_adapter(db, adapter)
+        assert (replay.mode, replay.status, replay.errors) == ("replay", "finished", 0)
+        assert replay.updated == 2
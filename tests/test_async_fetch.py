@@ -0,0 +1,74 @@
+import asyncio
+import time
+import httpx
+from adapters.base import SourceAdapter
+from adapters.eventbrite import EventbriteAdapter
+from adapters.http import AsyncHttpPool
+from core.fetch import FetchDeadline, iter_fetch
+from core.settings import settings
+
+
+class SlowAsyncAdapter(SourceAdapter):
+    name = "slow_async"
+    supports_async_fetch = True
+
+    def discover(self):
+        return [f"id-{i}" for i in range(8)]
+
+    async def afetch_raw(self, identifier, http):
+        await asyncio.sleep(0.1)
+        if identifier == "id-3":
+            raise ValueError("boom")
+        return {"id": identifier}
+
+
+def test_async_fetch_keeps_requests_in_flight(monkeypatch):
+    monkeypatch.setattr(settings, "async_fetch_enabled", True)
+    monkeypatch.setattr(settings, "fetch_concurrency", 8)
+    adapter = SlowAsyncAdapter()
+    t0 = time.monotonic()
+    items = list(iter_fetch(adapter, adapter.discover()))
+    elapsed = time.monotonic() - t0
+    assert sorted(i for i, _, _ in items) == adapter.discover()
+    errors = {i: e for i, _, e in items if e is not None}
+    assert list(errors) == ["id-3"]
+    # Eight 100ms fetches in parallel, not 800ms back to back
+    assert elapsed < 0.6
+
+
+def test_async_fetch_consumer_can_stop_early(monkeypatch):
+    monkeypatch.setattr(settings, "async_fetch_enabled", True)
+    monkeypatch.setattr(settings, "fetch_concurrency", 2)
+    adapter = SlowAsyncAdapter()
+    fetched = iter_fetch(adapter, adapter.discover())
+    next(fetched)
+    fetched.close()
+
+
+def test_async_fetch_stops_waiting_at_the_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "async_fetch_enabled", True)
+    monkeypatch.setattr(settings, "fetch_concurrency", 1)
+
+    class HungAsyncAdapter(SlowAsyncAdapter):
+        async def afetch_raw(self, identifier, http):
+            await asyncio.sleep(0 if identifier == "id-0" else 5)
+            return {"id": identifier}
+
+    adapter = HungAsyncAdapter()
+    t0 = time.monotonic()
+    items = list(iter_fetch(adapter, adapter.discover(), deadline=time.monotonic() + 0.3))
+    assert time.monotonic() - t0 < 1
+    assert items[0][0] == "id-0" and isinstance(items[-1][2], FetchDeadline)
+
+
+def test_eventbrite_afetch_raw_uses_pool():
+    def handler(request: httpx.Request):
+        assert request.url.path.endswith("/events/search")
+        return httpx.Response(200, json={"events": [{"name": {"text": "Storytime"}}]})
+
+    async def go():
+        async with AsyncHttpPool(transport=httpx.MockTransport(handler)) as http:
+            return await EventbriteAdapter().afetch_raw("events/search?q=reading", http)
+
+    raw = asyncio.run(go())
+    assert raw["events"][0]["name"]["text"] == "Storytime"
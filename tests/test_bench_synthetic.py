@@ -0,0 +1,24 @@
+import uuid
+
+from benchmarks.synthetic import SyntheticHtmlAdapter, SyntheticJsonAdapter, make_events
+from core.db import SessionLocal
+from core.etl import run_adapter
+
+
+def test_make_events_controls_duplicates():
+    events = make_events(400, dup_rate=0.2, near_dup_rate=0.1, seed=3)
+    titles = [e["name"]["text"] for e in events]
+    exact = len(titles) - len({(e["name"]["text"], e["description"]["text"]) for e in events})
+    assert len(events) == 400
+    assert 40 <= exact <= 120
+    assert make_events(50, seed=3) == make_events(50, seed=3)
+
+
+def test_synthetic_adapters_run_end_to_end():
+    tag = uuid.uuid4().hex[:6]
+    for adapter in (SyntheticJsonAdapter(30, page_size=10, seed=5, name=f"bj_{tag}"), SyntheticHtmlAdapter(30, page_size=10, seed=6, name=f"bh_{tag}")):
+        with SessionLocal() as db:
+            run = run_adapter(db, adapter)
+        assert run.status == "finished" and run.errors == 0
+        assert run.inserted + run.updated + run.unchanged > 0
+        assert run.stats["stages"]["parse"]["calls"] >= 30
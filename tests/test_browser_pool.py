@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from adapters.browser import BrowserPool
+
+
+class FakePage:
+    active = 0
+    peak = 0
+
+    def __init__(self):
+        self.closed = False
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        FakePage.active += 1
+        FakePage.peak = max(FakePage.peak, FakePage.active)
+        await asyncio.sleep(0.05)
+        FakePage.active -= 1
+        self.url = url
+
+    async def content(self):
+        return f"<html>{self.url}</html>"
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+async def _noop():
+    pass
+
+
+class FakePool(BrowserPool):
+    starts = 0
+
+    async def _start(self):
+        FakePool.starts += 1
+        self._context = FakeContext()
+        self._browser = SimpleNamespace(close=_noop)
+        self._playwright = SimpleNamespace(stop=_noop)
+
+
+def test_pages_are_reused_then_recycled():
+    FakePool.starts = 0
+    pool = FakePool(max_pages=1, recycle_after=2)
+    assert pool.fetch("a") == "<html>a</html>"
+    pool.fetch("b")
+    pool.fetch("c")
+    ctx = pool._context
+    assert FakePool.starts == 1
+    assert pool.pages_opened == 2 and ctx.pages[0].closed and not ctx.pages[1].closed
+    pool.close()
+    assert ctx.closed and ctx.pages[1].closed and not pool.started
+
+
+def test_threads_share_a_bounded_set_of_concurrent_pages():
+    FakePool.starts, FakePage.active, FakePage.peak = 0, 0, 0
+    pool = FakePool(max_pages=2)
+    out = []
+    threads = [threading.Thread(target=lambda i=i: out.append(pool.fetch(f"u{i}"))) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(out) == sorted(f"<html>u{i}</html>" for i in range(6))
+    assert FakePage.peak == 2 and pool.pages_opened == 2 and FakePool.starts == 1
+    pool.close()
+    # Usable again after close, from yet another thread
+    t = threading.Thread(target=lambda: out.append(pool.fetch("again")))
+    t.start()
+    t.join()
+    assert out[-1] == "<html>again</html>" and FakePool.starts == 2
+    pool.close()
+
+
+def test_blocks_heavy_resources():
+    pool = FakePool()
+    calls = []
+
+    async def record(kind):
+        calls.append(kind)
+
+    for kind in ("image", "font", "media", "document"):
+        route = SimpleNamespace(request=SimpleNamespace(resource_type=kind), abort=lambda: record("abort"), continue_=lambda: record("continue"))
+        asyncio.run(pool._route(route))
+    assert calls == ["abort", "abort", "abort", "continue"]
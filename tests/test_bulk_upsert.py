@@ -0,0 +1,74 @@
+import uuid
+from core.db import SessionLocal
+from core.etl import upsert_programs
+from adapters.base import ProgramRecord
+from db.models import Program, Snapshot
+
+
+def _rec(title: str, **kw) -> ProgramRecord:
+    return ProgramRecord(title=title, source="test", source_url="http://example.com", dedupe_key_date="2025-02-01", **kw)
+
+
+def test_upsert_programs_batch_counts():
+    tag = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        first = upsert_programs(db, [_rec(f"Robotics club {tag}")])
+        db.commit()
+        assert [a for a, _ in first] == ["inserted"]
+
+        batch = [
+            _rec(f"Robotics club {tag}", description_text="now with a description"),
+            _rec(f"Pottery session {tag}"),
+            _rec(f"Pottery session {tag}", tags=["free"]),
+            _rec(f"Chess night {tag}", snapshot_excerpt="excerpt"),
+        ]
+        results = upsert_programs(db, batch)
+        db.commit()
+        assert [a for a, _ in results] == ["updated", "inserted", "updated", "inserted"]
+        assert results[0][1].id == first[0][1].id
+        assert results[1][1].id == results[2][1].id
+        assert results[2][1].tags == ["free"]
+        n = db.query(Program).filter(Program.title.like(f"% {tag}")).count()
+        assert n == 3
+
+
+def test_unchanged_records_skip_writes_and_snapshots():
+    tag = uuid.uuid4().hex[:8]
+    rec = _rec(f"Lego league {tag}", tags=["free"], description_text="Build and code", snapshot_excerpt="Build and code")
+    with SessionLocal() as db:
+        [(action, p)] = upsert_programs(db, [rec])
+        db.commit()
+        assert action == "inserted"
+        updated_at, last_seen = p.updated_at, p.last_seen_at
+
+        [(action, p2)] = upsert_programs(db, [rec])
+        db.commit()
+        assert action == "unchanged"
+        db.refresh(p2)
+        assert p2.updated_at == updated_at
+        assert p2.last_seen_at > last_seen
+        assert db.query(Snapshot).filter(Snapshot.program_id == p.id).count() == 1
+
+
+def test_near_duplicate_resighting_is_unchanged():
+    tag = uuid.uuid4().hex[:8]
+    desc = f"Build and code Lego robots with friends {tag} every week at the library"
+    with SessionLocal() as db:
+        [(action, p)] = upsert_programs(db, [_rec(f"Junior Lego robotics league {tag}", description_text=desc)])
+        db.commit()
+        assert action == "inserted"
+        updated_at, last_seen = p.updated_at, p.last_seen_at
+
+        variant = _rec(f"Junior Lego robotics league {tag}!", description_text=desc)
+        [(action, near)] = upsert_programs(db, [variant])
+        db.commit()
+        assert action == "unchanged" and near.id == p.id
+        db.refresh(near)
+        assert near.updated_at == updated_at and near.last_seen_at > last_seen
+
+        changed = _rec(f"Junior Lego robotics league {tag}!", description_text=desc + " and snacks")
+        [(action, near)] = upsert_programs(db, [changed])
+        db.commit()
+        assert action == "updated" and near.id == p.id and near.updated_at > updated_at
+        [(action, _)] = upsert_programs(db, [changed])
+        assert action == "unchanged"
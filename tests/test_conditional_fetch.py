@@ -0,0 +1,68 @@
+import uuid
+from adapters.base import SourceAdapter, ProgramRecord, FetchResult
+from core.db import SessionLocal
+from core.etl import run_adapter
+from db.models import Source, SourceIdentifier
+
+
+class ConditionalAdapter(SourceAdapter):
+    supports_conditional_fetch = True
+
+    def __init__(self):
+        self.name = f"cond_{uuid.uuid4().hex[:8]}"
+        self.payloads = {"a": {"v": 1}, "b": {"v": 1}}
+        self.seen_validators = {}
+
+    def discover(self):
+        return ["a", "b"]
+
+    def fetch_raw(self, identifier, validators=None):
+        self.seen_validators[identifier] = validators
+        if identifier == "a" and validators and validators.get("etag") == '"a1"':
+            return FetchResult(not_modified=True)
+        etag = '"a1"' if identifier == "a" else None
+        return FetchResult(raw={"id": identifier, **self.payloads[identifier]}, etag=etag)
+
+    def parse(self, raw):
+        topic = {"a": "Puppet theatre", "b": "Junior coding club"}[raw["id"]]
+        yield ProgramRecord(title=f"{topic} {self.name} edition {raw['v']}", source=self.name, source_url="http://x", description_text=f"{topic}, edition {raw['v']}")
+
+
+def test_unchanged_identifiers_are_skipped():
+    adapter = ConditionalAdapter()
+    with SessionLocal() as db:
+        first = run_adapter(db, adapter)
+        assert (first.inserted, first.skipped_unchanged) == (2, 0)
+
+        # "a" answers 304 to its stored ETag, "b" returns an identical payload
+        second = run_adapter(db, adapter)
+        assert adapter.seen_validators["a"] == {"etag": '"a1"'}
+        assert (second.inserted, second.updated, second.skipped_unchanged) == (0, 0, 2)
+
+        adapter.payloads["b"] = {"v": 2}
+        third = run_adapter(db, adapter)
+        assert (third.inserted + third.updated, third.skipped_unchanged) == (1, 1)
+
+
+class FirstFailsAdapter(ConditionalAdapter):
+    def discover(self):
+        return ["boom", "a", "b"]
+
+    def fetch_raw(self, identifier, validators=None):
+        if identifier == "boom":
+            raise ConnectionError("connection reset")
+        return super().fetch_raw(identifier, validators)
+
+    def parse(self, raw):
+        topic = {"a": "Pottery wheel workshop", "b": "Rock climbing for beginners"}[raw["id"]]
+        yield ProgramRecord(title=f"{topic} {self.name}", source=self.name, source_url="http://x", description_text=f"{topic} at {self.name}")
+
+
+def test_new_source_survives_a_failing_first_identifier():
+    adapter = FirstFailsAdapter()
+    with SessionLocal() as db:
+        run = run_adapter(db, adapter)
+        assert (run.inserted, run.errors) == (2, 1)
+        source = db.query(Source).filter(Source.name == adapter.name).one()
+        states = db.query(SourceIdentifier).filter(SourceIdentifier.identifier.in_(["a", "b"]), SourceIdentifier.source_id == source.id).all()
+        assert len(states) == 2
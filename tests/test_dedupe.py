@@ -1,14 +1,70 @@
+import uuid
+from benchmarks.synthetic import make_events
 from core.dedupe import find_near_duplicate
+from core import dedupe, lsh
 from core.db import SessionLocal
 from db.models import Program
-from datetime import datetime
+from core.settings import settings
+from datetime import datetime, timedelta
 
 
 def test_find_near_duplicate():
     with SessionLocal() as db:
-        p = Program(title="Creative Writing for Kids", source="test", source_url="http://x", description_text="Writing workshop for children.", city="Melbourne", dedupe_hash="h", first_seen_at=datetime.utcnow(), last_seen_at=datetime.utcnow(), created_at=datetime.utcnow(), updated_at=datetime.utcnow())
+        p = Program(title="Creative Writing for Kids", source="test", source_url="http://x", description_text="Writing workshop for children.", city="Melbourne", dedupe_hash=uuid.uuid4().hex, first_seen_at=datetime.utcnow(), last_seen_at=datetime.utcnow(), created_at=datetime.utcnow(), updated_at=datetime.utcnow())
         db.add(p)
         db.commit()
         near = find_near_duplicate(db, "Kids Creative Writing", "A workshop for kids to write.", "Melbourne", 0.3)
         assert near is not None
 
+
+
+def _program(title, description, city, created_at):
+    return Program(title=title, source="test", source_url="http://x", description_text=description, city=city, dedupe_hash=uuid.uuid4().hex, first_seen_at=created_at, last_seen_at=created_at, created_at=created_at, updated_at=created_at)
+
+
+def test_minhash_index_finds_duplicate_beyond_recent_window(monkeypatch):
+    tag = uuid.uuid4().hex[:8]
+    city = f"Ballarat {tag}"
+    with SessionLocal() as db:
+        now = datetime.utcnow()
+        old = _program(f"Junior Astronomy Night {tag}", "Stargazing with telescopes for young astronomers.", city, now - timedelta(days=30))
+        db.add(old)
+        # More than the 200 programs the recency window looks at, all newer and unrelated
+        db.add_all(_program(f"Community meetup {i} {tag}", f"Gathering {i} about topic t{i}x{tag}.", city, now - timedelta(minutes=i)) for i in range(250))
+        db.commit()
+        probe = (f"Junior Astronomy Night {tag}", "Stargazing with telescopes for young astronomers!", city, 0.85)
+
+        monkeypatch.setattr(settings, "neardup_backend", "tfidf")
+        assert find_near_duplicate(db, *probe) is None
+
+        monkeypatch.setattr(settings, "neardup_backend", "minhash")
+        assert lsh.candidate_ids(db, lsh.program_text(old.title, old.description_text), city)[0] == old.id
+        near = find_near_duplicate(db, *probe)
+        assert near is not None and near.id == old.id
+        assert find_near_duplicate(db, f"Junior Astronomy Night {tag}", "Stargazing with telescopes for young astronomers.", "Geelong", 0.85) is None
+        assert find_near_duplicate(db, "Toddler swimming lessons", "Water confidence for under fives.", city, 0.85) is None
+
+
+def test_minhash_lookup_on_boilerplate_listings_needs_no_refit(monkeypatch):
+    tag = uuid.uuid4().hex[:8]
+    city = f"Bendigo {tag}"
+    events = make_events(301, dup_rate=0.0, near_dup_rate=0.0, seed=11)
+    with SessionLocal() as db:
+        now = datetime.utcnow()
+        stored = [_program(e["name"]["text"], e["description"]["text"], city, now) for e in events[:300]]
+        db.add_all(stored)
+        db.commit()
+
+        def no_refit(*args, **kwargs):
+            raise AssertionError("vectorizer fitted per record")
+
+        monkeypatch.setattr(settings, "neardup_backend", "minhash")
+        monkeypatch.setattr(dedupe, "TfidfVectorizer", no_refit)
+        target = stored[42]
+        words = target.description_text.split()
+        words[words.index("session")] = "workshop"
+        near = find_near_duplicate(db, target.title, " ".join(words), city, 0.85)
+        assert near is not None and near.id == target.id
+        # Every listing repeats the same paragraph; sharing it is not enough
+        fresh = events[300]
+        assert find_near_duplicate(db, fresh["name"]["text"], fresh["description"]["text"], city, 0.85) is None
@@ -8,5 +8,5 @@ def test_upsert_program_smoke():
         rec = ProgramRecord(title="Test Program", source="test", source_url="http://example.com")
         action, p = upsert_program(db, rec)
         db.commit()
-        assert action in ("inserted", "updated")
+        assert action in ("inserted", "updated", "unchanged")
 
@@ -0,0 +1,92 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import uuid
+
+import adapters.base as base_mod
+from adapters.base import SourceAdapter, ProgramRecord
+from adapters.throttle import HostLimiter, retry_after_s
+from core.db import SessionLocal
+from core.etl import run_adapter
+from core.settings import settings
+
+
+def test_limiter_spaces_requests_and_backs_off_on_429():
+    limiter = HostLimiter(rate=10, burst=1)
+    assert limiter.reserve("http://a.test/x") == 0
+    assert 0.05 < limiter.reserve("http://a.test/y") <= 0.1
+    assert limiter.reserve("http://b.test/x") == 0
+    limiter.observe("http://a.test/x", 429, "2")
+    assert limiter.rate("http://a.test/") == 5
+    assert limiter.reserve("http://a.test/z") >= 1.9
+    for _ in range(20):
+        limiter.observe("http://a.test/x", 200)
+    assert limiter.rate("http://a.test/") == 10
+
+
+def test_retry_after_accepts_http_dates():
+    assert retry_after_s("3") == 3
+    assert retry_after_s("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert retry_after_s("soon") is None
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    calls = 0
+
+    def do_GET(self):
+        ThrottlingHandler.calls += 1
+        status = 429 if ThrottlingHandler.calls == 1 else 200
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_http_get_waits_out_429(monkeypatch):
+    monkeypatch.setattr(settings, "http_cache_backend", "off")
+    limiter = HostLimiter(rate=100, burst=5)
+    monkeypatch.setattr(base_mod, "limiter", limiter)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/events"
+    adapter = SourceAdapter()
+    try:
+        resp = adapter.http_get(url)
+    finally:
+        adapter.close()
+        server.shutdown()
+    assert resp.status_code == 200 and ThrottlingHandler.calls == 2
+    assert limiter.rate(url) < 100
+
+
+class DeadAdapter(SourceAdapter):
+    def __init__(self):
+        self.name = f"dead_{uuid.uuid4().hex[:8]}"
+        self.calls = 0
+
+    def discover(self):
+        return [f"page-{i}" for i in range(10)]
+
+    def fetch_raw(self, identifier):
+        self.calls += 1
+        raise ConnectionError("connect timeout")
+
+    def parse(self, raw):
+        yield ProgramRecord(title="never", source=self.name, source_url="http://x")
+
+
+def test_breaker_opens_and_next_run_starts_half_open(monkeypatch):
+    monkeypatch.setattr(settings, "breaker_threshold", 3)
+    adapter = DeadAdapter()
+    with SessionLocal() as db:
+        run = run_adapter(db, adapter)
+        assert adapter.calls == 3 and run.errors == 3
+        assert run.status == "circuit_open"
+        assert run.breaker["state"] == "open" and run.breaker["skipped_identifiers"] == 7
+        adapter.calls = 0
+        again = run_adapter(db, adapter)
+        assert adapter.calls == 1 and again.breaker["skipped_identifiers"] == 9
@@ -0,0 +1,35 @@
+from core import geo as geo_module
+from core.gazetteer import get_gazetteer
+from core.geo import geocode_address_cached
+from core.settings import settings
+
+
+def test_gazetteer_resolves_city_level_addresses():
+    g = get_gazetteer()
+    assert g.lookup("Ballarat") == (-37.5622, 143.8503)
+    assert g.lookup("Ballarat, VIC 3350, Australia") == (-37.5622, 143.8503)
+    assert g.lookup("3220") == (-38.1499, 144.3617)
+    assert g.lookup("Ballarat, 3350 VIC") == (-37.5622, 143.8503)
+    assert g.lookup("State Library Victoria, Melbourne") == (-37.8136, 144.9631)
+
+
+def test_gazetteer_leaves_street_addresses_to_network():
+    g = get_gazetteer()
+    assert g.lookup("1 Test St, Melbourne") is None
+    assert g.lookup("Sturt Street, Ballarat") is None
+    assert g.lookup("Unit 3, 12 Smith St, Fitzroy VIC") is None
+    assert g.lookup("Level 2, State Library Victoria, 328 Swanston St, Melbourne VIC 3000") is None
+    assert g.lookup("Atlantis") is None
+
+
+def test_gazetteer_mode_never_calls_network(monkeypatch):
+    class NoNetwork:
+        def __init__(self, user_agent: str):
+            raise AssertionError("network geocoder used")
+
+    monkeypatch.setattr(settings, "geocoding_enabled", True)
+    monkeypatch.setattr(settings, "geocoder", "gazetteer")
+    monkeypatch.setattr(geo_module, "Nominatim", NoNetwork)
+    geocode_address_cached.cache_clear()
+    assert geocode_address_cached("Bendigo, VIC") == (-36.757, 144.2794)
+    assert geocode_address_cached("12 View St, Bendigo") is None
@@ -0,0 +1,91 @@
+import uuid
+from datetime import datetime, timedelta
+from core import geo as geo_module
+from core.db import SessionLocal
+from core.geo import geocode_address_cached, geocode_pending
+from core.settings import settings
+from db.models import GeocodeCache, Program
+
+
+class CountingNom:
+    calls = 0
+    result = (-38.1499, 144.3617)
+
+    def __init__(self, user_agent: str):
+        pass
+
+    def geocode(self, addr: str, timeout: int = 10):
+        CountingNom.calls += 1
+        if CountingNom.result is None:
+            return None
+        lat, lon = CountingNom.result
+
+        class Loc:
+            latitude = lat
+            longitude = lon
+
+        return Loc()
+
+
+def _setup(monkeypatch, result):
+    monkeypatch.setattr(settings, "geocoding_enabled", True)
+    monkeypatch.setattr(geo_module, "Nominatim", CountingNom)
+    monkeypatch.setattr(geo_module, "_geocode_remote", geo_module._geocode_remote.__wrapped__.__wrapped__)
+    CountingNom.calls = 0
+    CountingNom.result = result
+    geocode_address_cached.cache_clear()
+
+
+def test_shared_cache_survives_process_cache_clear(monkeypatch):
+    _setup(monkeypatch, (-38.1499, 144.3617))
+    addr = f"{uuid.uuid4().hex[:6]} Moorabool St, Geelong"
+    assert geocode_address_cached(addr) == (-38.1499, 144.3617)
+    geocode_address_cached.cache_clear()  # simulate a worker restart
+    assert geocode_address_cached(addr.upper()) == (-38.1499, 144.3617)
+    assert CountingNom.calls == 1
+
+
+def test_negative_results_expire(monkeypatch):
+    _setup(monkeypatch, None)
+    addr = f"{uuid.uuid4().hex[:6]} Nowhere Rd"
+    assert geocode_address_cached(addr) is None
+    geocode_address_cached.cache_clear()
+    assert geocode_address_cached(addr) is None
+    assert CountingNom.calls == 1
+    with SessionLocal() as db:
+        row = db.get(GeocodeCache, geo_module.normalize_address(addr))
+        assert row is not None and not row.found
+        row.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+    geocode_address_cached.cache_clear()
+    geocode_address_cached(addr)
+    assert CountingNom.calls == 2
+
+
+def test_geocode_pending_fills_coordinates(monkeypatch):
+    _setup(monkeypatch, (-37.5622, 143.8503))
+    with SessionLocal() as db:
+        p = Program(title="Queue test", source="test", source_url="http://x", address=f"{uuid.uuid4().hex[:6]} Sturt St", city="Ballarat", dedupe_hash=uuid.uuid4().hex)
+        db.add(p)
+        db.commit()
+        assert geocode_pending(db) >= 1
+        db.refresh(p)
+        assert (p.lat, p.lon) == (-37.5622, 143.8503)
+
+
+def test_network_error_is_retried_without_cache_clear(monkeypatch):
+    _setup(monkeypatch, (-37.8136, 144.9631))
+    addr = f"{uuid.uuid4().hex[:6]} Swanston St, Melbourne"
+    real_geocode = CountingNom.geocode
+
+    def flaky(self, a, timeout=10):
+        if CountingNom.calls == 0:
+            CountingNom.calls += 1
+            raise TimeoutError("nominatim down")
+        return real_geocode(self, a, timeout)
+
+    monkeypatch.setattr(CountingNom, "geocode", flaky)
+    assert geocode_address_cached(addr) is None
+    assert geocode_address_cached(addr) == (-37.8136, 144.9631)
+    assert geocode_address_cached(addr) == (-37.8136, 144.9631)
+    assert CountingNom.calls == 2
@@ -0,0 +1,82 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import sqlite3
+import threading
+
+from adapters.base import SourceAdapter
+from core import metrics
+from core.settings import settings
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    hits: dict[str, int] = {}
+    fail_first: set[str] = set()
+
+    def do_GET(self):
+        n = CountingHandler.hits[self.path] = CountingHandler.hits.get(self.path, 0) + 1
+        if self.path in self.fail_first and n == 1:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = f"{self.path} #{n}".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpAdapter(SourceAdapter):
+    def __init__(self, name):
+        self.name = name
+
+
+def _server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    CountingHandler.hits = {}
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_per_adapter_cache_counts_hits_and_retries(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "http_cache_backend", "sqlite")
+    monkeypatch.setattr(settings, "http_cache_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "http_backoff_s", 0.01)
+    server, base = _server()
+    CountingHandler.fail_first = {"/flaky"}
+    a, b = HttpAdapter("source_a"), HttpAdapter("source_b")
+    stats = metrics.RunStats()
+    try:
+        with metrics.collecting(stats):
+            assert a.http_get(f"{base}/x").text == "/x #1"
+            assert a.http_get(f"{base}/x").text == "/x #1"
+            # Separate sources keep separate caches
+            assert b.http_get(f"{base}/x").text == "/x #2"
+            # 503 is retried transparently
+            assert a.http_get(f"{base}/flaky").text == "/flaky #2"
+    finally:
+        a.close()
+        b.close()
+        server.shutdown()
+    assert (stats.cache_hits, stats.cache_misses) == (1, 3)
+    assert stats.to_dict()["cache_hits"] == 1
+    mode = sqlite3.connect(tmp_path / "source_a.sqlite").execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_cache_off_uses_plain_session(monkeypatch):
+    monkeypatch.setattr(settings, "http_cache_backend", "off")
+    server, base = _server()
+    adapter = HttpAdapter("source_off")
+    stats = metrics.RunStats()
+    try:
+        with metrics.collecting(stats):
+            adapter.http_get(f"{base}/y")
+            assert adapter.http_get(f"{base}/y").text == "/y #2"
+    finally:
+        adapter.close()
+        server.shutdown()
+    assert stats.cache_hits == stats.cache_misses == 0
@@ -0,0 +1,78 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import json
+import threading
+import uuid
+
+from adapters.eventbrite import EventbriteAdapter
+from core.db import SessionLocal
+from core.etl import run_adapter
+from core.settings import settings
+
+TOPICS = ["Puppet theatre matinee", "Junior robotics league", "Watercolour painting studio", "Bush kinder nature walk"]
+
+
+class EventsHandler(BaseHTTPRequestHandler):
+    events: list[dict] = []
+    queries: list[dict] = []
+
+    def do_GET(self):
+        qs = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        EventsHandler.queries.append(qs)
+        since = qs.get("date_modified.range_start")
+        matching = [e for e in self.events if since is None or e["changed"] >= since]
+        offset = int(qs.get("continuation", 0))
+        page = matching[offset:offset + 2]
+        more = offset + 2 < len(matching)
+        body = {"events": page, "pagination": {"has_more_items": more, "continuation": str(offset + 2) if more else None}}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def _event(i: int, tag: str) -> dict:
+    return {
+        "name": {"text": f"{TOPICS[i]} {tag}"},
+        "description": {"text": ""},
+        "url": f"http://events.test/{tag}/{i}",
+        "start": {"utc": f"2030-01-0{i + 1}T10:00:00Z"},
+        "changed": f"2030-01-01T0{i}:00:00Z",
+    }
+
+
+def test_incremental_sync_pages_only_changes_and_full_resync(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EventsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    tag = uuid.uuid4().hex[:8]
+    EventsHandler.events = [_event(i, tag) for i in range(3)]
+    EventsHandler.queries = []
+    adapter = EventbriteAdapter()
+    adapter.name = f"eventbrite_{tag}"
+    adapter.base_url = f"http://127.0.0.1:{server.server_port}/v3"
+    monkeypatch.setattr(adapter, "discover", lambda: ["events/search?q=kids"])
+    monkeypatch.setattr(settings, "incremental_sync", True)
+    monkeypatch.setattr(settings, "http_cache_backend", "off")
+    try:
+        with SessionLocal() as db:
+            first = run_adapter(db, adapter)
+            assert first.inserted == 3
+            assert len(EventsHandler.queries) == 2 and "date_modified.range_start" not in EventsHandler.queries[0]
+
+            EventsHandler.events.append(_event(3, tag))
+            EventsHandler.queries = []
+            second = run_adapter(db, adapter)
+            assert EventsHandler.queries[0]["date_modified.range_start"] == "2030-01-01T02:00:00Z"
+            assert (second.inserted, second.unchanged) == (1, 1)
+
+            EventsHandler.queries = []
+            full = run_adapter(db, adapter, full_resync=True)
+            assert all("date_modified.range_start" not in q for q in EventsHandler.queries)
+            assert (full.inserted, full.unchanged) == (0, 4)
+    finally:
+        server.shutdown()
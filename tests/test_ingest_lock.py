@@ -0,0 +1,114 @@
+import threading
+import time
+import uuid
+
+from adapters.base import SourceAdapter, ProgramRecord
+from core import locks
+from core.db import SessionLocal
+from core.etl import run_adapter
+from core.locks import LocalLockBackend, SingleFlight
+from core.settings import settings
+from db.models import Run
+
+
+class SlowAdapter(SourceAdapter):
+    def __init__(self):
+        self.name = f"lock_{uuid.uuid4().hex[:8]}"
+        self.started = threading.Event()
+        self.proceed = threading.Event()
+        self.fetches = 0
+
+    def discover(self):
+        return ["only"]
+
+    def fetch_raw(self, identifier):
+        self.fetches += 1
+        self.started.set()
+        self.proceed.wait(10)
+        return {"name": self.name}
+
+    def parse(self, raw):
+        yield ProgramRecord(title=f"Chess club {raw['name']}", source=raw["name"], source_url="http://x")
+
+
+class SharedLocalBackend(LocalLockBackend):
+    shared = True
+
+
+def test_overlapping_ingest_attaches_to_running_run(monkeypatch):
+    monkeypatch.setattr(settings, "geocoding_enabled", False)
+    backend = SharedLocalBackend()
+    monkeypatch.setattr(locks, "get_backend", lambda: backend)
+    adapter = SlowAdapter()
+    first: dict = {}
+
+    def worker():
+        with SessionLocal() as db:
+            first["id"] = run_adapter(db, adapter).id
+
+    t = threading.Thread(target=worker)
+    t.start()
+    assert adapter.started.wait(10)
+    with SessionLocal() as db:
+        second = run_adapter(db, adapter)
+        assert second.status == "running"
+        second_id = second.id
+    adapter.proceed.set()
+    t.join(10)
+    assert second_id == first["id"]
+    assert adapter.fetches == 1
+    # Released on completion: the next ingest runs normally
+    with SessionLocal() as db:
+        assert run_adapter(db, adapter).id != first["id"]
+
+
+def test_expired_lock_marks_orphaned_run_failed(monkeypatch):
+    monkeypatch.setattr(settings, "geocoding_enabled", False)
+    backend = SharedLocalBackend()
+    monkeypatch.setattr(locks, "get_backend", lambda: backend)
+    adapter = SlowAdapter()
+    adapter.proceed.set()
+    with SessionLocal() as db:
+        dead = Run(source=adapter.name, status="running", inserted=0, updated=0, unchanged=0, skipped_unchanged=0, errors=0, error_samples=[])
+        db.add(dead)
+        db.commit()
+        dead_id = dead.id
+    # A worker took the lock and died without releasing it
+    assert SingleFlight(adapter.name, ttl_s=0.05).acquire()
+    time.sleep(0.1)
+    with SessionLocal() as db:
+        run = run_adapter(db, adapter)
+        assert run.status == "finished" and run.id != dead_id
+        orphan = db.get(Run, dead_id)
+        assert orphan.status == "failed"
+        assert "lock expired" in orphan.error_samples[-1]
+
+
+def test_local_fallback_is_retried_once_redis_comes_back(monkeypatch):
+    import redis
+
+    class FlakyRedis:
+        up = False
+
+        def ping(self):
+            if not FlakyRedis.up:
+                raise ConnectionError("redis not started yet")
+            return True
+
+        def register_script(self, script):
+            return lambda *a, **kw: None
+
+    monkeypatch.setattr(redis.Redis, "from_url", classmethod(lambda cls, *a, **kw: FlakyRedis()))
+    monkeypatch.setattr(locks, "_redis_backend", None)
+    monkeypatch.setattr(locks, "_retry_redis_at", 0.0)
+    monkeypatch.setattr(settings, "ingest_lock_redis_retry_s", 0.05)
+
+    first = locks.get_backend()
+    assert not first.shared
+    FlakyRedis.up = True
+    # Still inside the back-off: the same in-process backend keeps its locks
+    assert locks.get_backend() is first
+    time.sleep(0.06)
+    backend = locks.get_backend()
+    assert isinstance(backend, locks.RedisLockBackend) and backend.shared
+    assert locks.get_backend() is backend
@@ -0,0 +1,40 @@
+import re
+
+from core.nlp import KeywordMatcher, rule_based_tags, rule_based_tags_batch
+
+ENTRIES = [
+    ("a", "book", 1, False),
+    ("a", "bookclub", 2, False),
+    ("b", "club", 3, False),
+    ("b", "free", 1, True),
+]
+
+
+def _naive_scan(text):
+    return {kw for _, kw, _, whole in ENTRIES if (re.search(rf"\b{kw}\b", text) if whole else kw in text)}
+
+
+def test_both_scan_paths_agree_with_naive_scan_on_overlaps():
+    texts = ["storybookclub night", "a free-for-all", "freedom club", "bookbook", "carefree, free", ""]
+    direct, compiled = KeywordMatcher(ENTRIES), KeywordMatcher(ENTRIES, direct_max=0)
+    assert direct.direct and not compiled.direct
+    for matcher in (direct, compiled):
+        for t in texts:
+            assert matcher.scan(t) == _naive_scan(t)
+        assert matcher.scan(texts[0]) == {"book", "bookclub", "club"}
+        assert matcher.scores(matcher.scan(texts[0])) == {"a": 3, "b": 3}
+        assert matcher.scan("freedom club") == {"club"}
+
+
+def test_batch_matches_single_calls():
+    items = [
+        ("Toddler storytime", "Free rhymes and books for little kids"),
+        ("Coding club", "Online over Zoom"),
+        ("Chess", "Carefree fun"),
+    ]
+    batch = rule_based_tags_batch(items)
+    assert batch == [rule_based_tags(t, d) for t, d in items]
+    assert batch[0].category == "Language & Literature" and batch[0].free_flag
+    assert batch[0].reasons == ["keyword:storytime", "keyword:book", "keyword:free"]
+    assert batch[1].online_flag and batch[1].category is None
+    assert batch[2].free_flag is None
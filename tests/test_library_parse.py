@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from adapters.library_vic import VicLibraryAdapter
+from core.settings import settings
+
+FIXTURE = Path(__file__).parent / "fixtures" / "library_listing.html"
+
+
+def _parse(mode):
+    old = settings.library_html_parser
+    settings.library_html_parser = mode
+    try:
+        raw = {"url": "https://www.slv.vic.gov.au/whats-on", "html": FIXTURE.read_text()}
+        return list(VicLibraryAdapter().parse(raw))
+    finally:
+        settings.library_html_parser = old
+
+
+def test_fast_parser_matches_full_parser():
+    full, fast = _parse("full"), _parse("fast")
+    assert len(full) == 7
+    assert fast == full
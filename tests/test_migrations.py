@@ -0,0 +1,46 @@
+import uuid
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+
+from core.settings import settings
+
+
+def _alembic(monkeypatch, url: str) -> Config:
+    monkeypatch.setattr(settings, "db_url", url)
+    cfg = Config()
+    cfg.set_main_option("script_location", "db/migrations")
+    return cfg
+
+
+def test_unique_dedupe_hash_merges_existing_duplicates(monkeypatch, tmp_path):
+    url = f"sqlite:///{tmp_path / 'mig.db'}"
+    cfg = _alembic(monkeypatch, url)
+    command.upgrade(cfg, "0001_initial")
+
+    engine = sa.create_engine(url)
+    t0 = datetime(2025, 1, 1)
+    ids = [uuid.uuid4().hex for _ in range(4)]
+    rows = [(ids[0], "dup", t0 + timedelta(days=1)), (ids[1], "dup", t0), (ids[2], "dup", t0 + timedelta(days=2)), (ids[3], "solo", t0)]
+    with engine.begin() as conn:
+        for pid, h, created in rows:
+            conn.execute(
+                sa.text(
+                    "INSERT INTO programs (id, title, source, source_url, first_seen_at, last_seen_at, dedupe_hash, created_at, updated_at) "
+                    "VALUES (:id, 't', 'test', 'http://x', :c, :c, :h, :c, :c)"
+                ),
+                {"id": pid, "h": h, "c": created},
+            )
+            conn.execute(sa.text("INSERT INTO snapshots (program_id, created_at) VALUES (:id, :c)"), {"id": pid, "c": created})
+
+    command.upgrade(cfg, "0002_unique_dedupe_hash")
+
+    with engine.connect() as conn:
+        left = dict(conn.execute(sa.text("SELECT id, dedupe_hash FROM programs")).all())
+        assert left == {ids[1]: "dup", ids[3]: "solo"}
+        snap_owners = sorted(conn.execute(sa.text("SELECT program_id FROM snapshots")).scalars())
+        assert snap_owners == sorted([ids[1]] * 3 + [ids[3]])
+        assert any(ix["unique"] for ix in sa.inspect(conn).get_indexes("programs") if ix["name"] == "ix_programs_dedupe_hash")
+    engine.dispose()
@@ -0,0 +1,128 @@
+import threading
+import time
+from conftest import TopicAdapter
+from core import etl
+from core.db import SessionLocal
+from core.settings import settings
+from adapters.base import ProgramRecord
+from db.models import Program
+
+
+class FakeAdapter(TopicAdapter):
+    def __init__(self, name: str, n: int = 2):
+        super().__init__(name, n)
+
+
+def test_parallel_ingest_returns_runs_in_adapter_order(monkeypatch):
+    adapters = [FakeAdapter("fake_a"), FakeAdapter("fake_b"), FakeAdapter("fake_c")]
+    monkeypatch.setattr(etl, "ADAPTERS", adapters)
+    monkeypatch.setattr(settings, "ingest_concurrency", 2)
+    with SessionLocal() as db:
+        runs = etl.ingest_all_sources(db, parallel=True)
+        assert [r.source for r in runs] == ["fake_a", "fake_b", "fake_c"]
+        assert all(r.status == "finished" for r in runs)
+        assert all(r.inserted + r.updated == 2 for r in runs)
+
+
+def test_run_adapter_timeout_stops_between_identifiers():
+    with SessionLocal() as db:
+        run = etl.run_adapter(db, FakeAdapter("fake_slow", n=3), timeout=1e-9)
+        assert run.status == "timeout"
+        assert run.inserted + run.updated == 0
+
+
+class ManyEventsAdapter(FakeAdapter):
+    def __init__(self, n_events: int):
+        super().__init__("fake_many", n=1)
+        self.n_events = n_events
+
+    def parse(self, raw):
+        for i in range(self.n_events):
+            yield ProgramRecord(
+                title=f"Event {i} {self.tag}",
+                source=self.name,
+                source_url=f"http://example.org/{self.tag}/{i}",
+                city=f"Town{i}",
+                description_text=f"{i} {self.tag} " + " ".join(f"w{i}x{k}" for k in range(5)),
+            )
+
+
+def test_chunked_parse_commits_once_per_identifier(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_chunk_size", 4)
+    adapter = ManyEventsAdapter(10)
+    commits = []
+    with SessionLocal() as db:
+        orig_commit = db.commit
+
+        def counting_commit():
+            commits.append(1)
+            orig_commit()
+
+        monkeypatch.setattr(db, "commit", counting_commit)
+        run = etl.run_adapter(db, adapter)
+        assert run.status == "finished"
+        assert run.inserted == 10
+        # Chunks are only flushed: the run row, the source, the one identifier, the final run commit
+        assert len(commits) == 4
+
+
+class BreaksMidPayloadAdapter(ManyEventsAdapter):
+    def __init__(self, n_events: int, fail_at: int | None):
+        super().__init__(n_events)
+        self.fail_at = fail_at
+
+    def parse(self, raw):
+        for i, rec in enumerate(super().parse(raw)):
+            if i == self.fail_at:
+                raise ValueError("bad event")
+            yield rec
+
+
+def test_chunk_failure_leaves_no_partial_identifier(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_chunk_size", 4)
+    adapter = BreaksMidPayloadAdapter(10, fail_at=9)
+    with SessionLocal() as db:
+        run = etl.run_adapter(db, adapter)
+        assert (run.errors, run.inserted) == (1, 0)
+        assert db.query(Program).filter(Program.source_url.like(f"%/{adapter.tag}/%")).count() == 0
+        adapter.fail_at = None
+        retry = etl.run_adapter(db, adapter)
+        assert (retry.errors, retry.inserted, retry.skipped_unchanged) == (0, 10, 0)
+
+
+class HangingAdapter(FakeAdapter):
+    def __init__(self):
+        super().__init__("fake_hang", n=3)
+        self.release = threading.Event()
+
+    def fetch_raw(self, identifier):
+        if identifier == "page-1":
+            self.release.wait(10)
+        return super().fetch_raw(identifier)
+
+
+def test_timeout_bounds_a_hung_fetch():
+    adapter = HangingAdapter()
+    try:
+        t0 = time.monotonic()
+        with SessionLocal() as db:
+            run = etl.run_adapter(db, adapter, timeout=0.5)
+        assert time.monotonic() - t0 < 3
+        assert run.status == "timeout" and run.inserted == 1
+    finally:
+        adapter.release.set()
+
+
+class CrashingAdapter(FakeAdapter):
+    def close(self):
+        raise RuntimeError("browser refused to close")
+
+
+def test_crashed_worker_is_reported_as_failed_run(monkeypatch):
+    adapters = [FakeAdapter("fake_ok"), CrashingAdapter("fake_crash")]
+    monkeypatch.setattr(etl, "ADAPTERS", adapters)
+    for parallel in (True, False):
+        with SessionLocal() as db:
+            runs = etl.ingest_all_sources(db, parallel=parallel)
+            assert [(r.source, r.status) for r in runs] == [("fake_ok", "finished"), ("fake_crash", "failed")]
+            assert "browser refused to close" in runs[1].error_samples[0]
@@ -0,0 +1,67 @@
+import os
+import pickle
+import threading
+
+from adapters.base import ProgramRecord
+from adapters.library_vic import VicLibraryAdapter
+from conftest import TopicAdapter
+from core import parse_pool
+from core.db import SessionLocal
+from core.etl import run_adapter
+from core.settings import settings
+from db.models import Program
+
+
+class PidAdapter(TopicAdapter):
+    """Records which process parsed each payload in the program title."""
+
+    prefix = "pool"
+
+    def parse(self, raw):
+        yield ProgramRecord(title=f"{self.title(self.topic(raw))} pid {os.getpid()}", source=self.name, source_url=f"http://x/{raw['ident']}")
+
+
+class LockedAdapter(PidAdapter):
+    def __init__(self):
+        super().__init__()
+        self.mu = threading.Lock()
+
+
+def _titles(name):
+    with SessionLocal() as db:
+        return [p.title for p in db.query(Program).filter(Program.source == name)]
+
+
+def test_parse_runs_in_worker_processes(monkeypatch):
+    monkeypatch.setattr(settings, "parse_workers", 2)
+    monkeypatch.setattr(settings, "geocoding_enabled", False)
+    adapter = PidAdapter()
+    try:
+        with SessionLocal() as db:
+            run = run_adapter(db, adapter)
+    finally:
+        parse_pool.shutdown()
+    assert run.status == "finished" and run.inserted == 6
+    titles = _titles(adapter.name)
+    assert len(titles) == 6 and not any(t.endswith(f"pid {os.getpid()}") for t in titles)
+    assert run.stats["stages"]["parse"]["calls"] == 6
+
+
+def test_unpicklable_adapter_parses_inline(monkeypatch):
+    monkeypatch.setattr(settings, "parse_workers", 2)
+    monkeypatch.setattr(settings, "geocoding_enabled", False)
+    adapter = LockedAdapter()
+    assert parse_pool.pipeline_for(adapter) is None
+    with SessionLocal() as db:
+        run = run_adapter(db, adapter)
+    assert run.inserted == 6
+    assert all(t.endswith(f"pid {os.getpid()}") for t in _titles(adapter.name))
+
+
+def test_runtime_resources_are_dropped_when_pickled():
+    adapter = VicLibraryAdapter()
+    adapter._http = object()
+    adapter._browser_pool = threading.Lock()
+    clone = pickle.loads(pickle.dumps(adapter))
+    assert clone._http is None and clone._browser_pool is None
+    assert adapter._browser_pool is not None
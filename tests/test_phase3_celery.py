@@ -10,3 +10,47 @@ def test_celery_beat_schedule_exists():
     entry = sched["nightly-ingest"]
     assert entry.get("task") == "core.etl.run_ingest_task"
     assert isinstance(entry.get("schedule"), crontab)
+
+
+def test_fanout_tasks_registered_and_routed():
+    from core.etl import ADAPTERS, ingest_queue
+
+    for name in ("ingest_source_task", "ingest_identifier_task", "finalize_run_task"):
+        assert f"core.etl.{name}" in celery_app.tasks
+    queues = {a.name: ingest_queue(a) for a in ADAPTERS}
+    assert queues == {"eventbrite": "ingest_api", "meetup": "ingest_api", "vic_library": "ingest_html"}
+
+
+def test_identifier_tasks_and_finalizer_fill_run(monkeypatch):
+    import uuid
+    from core import etl
+    from core.db import SessionLocal
+    from db.models import Run
+    from adapters.base import SourceAdapter, ProgramRecord
+
+    tag = uuid.uuid4().hex[:8]
+
+    class Fake(SourceAdapter):
+        name = "fake_fanout"
+
+        def discover(self):
+            return ["ok", "bad"]
+
+        def fetch_raw(self, ident):
+            if ident == "bad":
+                raise RuntimeError("source down")
+            return f"{ident}:{tag}"
+
+        def parse(self, raw):
+            yield ProgramRecord(title=f"Fanout {tag}", source=self.name, source_url="http://x")
+
+    adapter = Fake()
+    monkeypatch.setattr(etl, "ADAPTERS", [adapter])
+    run_id = etl.start_run(adapter)
+    results = [etl.ingest_identifier_task(run_id, "fake_fanout", i) for i in adapter.discover()]
+    etl.finalize_run_task(results, run_id)
+    with SessionLocal() as db:
+        run = db.get(Run, run_id)
+        assert run.status == "finished"
+        assert (run.inserted, run.errors) == (1, 1)
+        assert run.error_samples == ["source down"]
@@ -13,3 +13,12 @@ def test_near_duplicate_indices_simple():
     # The robotics item should remain
     assert 2 not in sup
 
+
+
+def test_sparse_mode_matches_dense():
+    from benchmarks.bench_neardup import make_texts
+
+    texts = make_texts(300)
+    dense = near_duplicate_indices(texts, threshold=0.85, method="dense")
+    sparse = near_duplicate_indices(texts, threshold=0.85, method="sparse")
+    assert dense and sparse == dense
@@ -4,6 +4,9 @@ import types
 
 
 class DummyResp:
+    status_code = 200
+    headers: dict = {}
+
     def __init__(self, text: str):
         self.text = text
 
@@ -16,15 +19,13 @@ def test_adapter_falls_back_without_playwright(monkeypatch):
     settings.enable_playwright = True
     adapter = VicLibraryAdapter()
 
-    # Monkeypatch requests.get to return predictable HTML for both robots and page
-    import adapters.library_vic as mod
-
+    # Stub the adapter's HTTP session to return predictable HTML for both robots and page
     def fake_get(url, headers=None, timeout=10):
         if url.endswith("robots.txt"):
             return DummyResp("User-agent: *\nAllow: /\n")
         return DummyResp("<html><body><article><a href='x'>X</a><div class='summary'>Hi</div></article></body></html>")
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(adapter, "_http", types.SimpleNamespace(get=fake_get, close=lambda: None))
 
     # Monkeypatch _fetch_with_playwright to raise ImportError to simulate missing dep
     def boom(url: str):
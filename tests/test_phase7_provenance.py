@@ -22,7 +22,7 @@ def test_snapshots_and_diff_endpoint():
         )
         action1, p = upsert_program(db, rec1)
         db.commit()
-        assert action1 in ("inserted", "updated")
+        assert action1 in ("inserted", "updated", "unchanged")
         # Update with changed description/snapshot to trigger a new snapshot
         rec2 = ProgramRecord(
             title="Lib Storytime",
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from conftest import TopicAdapter
+from core.db import SessionLocal
+from core.etl import ingest_identifier, run_adapter, start_run
+from core.settings import settings
+from db.models import Run
+
+class WorkerDied(BaseException):
+    """Stands in for SIGKILL: nothing in run_adapter gets to clean up."""
+
+
+class FlakyAdapter(TopicAdapter):
+    prefix = "resume"
+
+    def __init__(self):
+        super().__init__()
+        self.die_at: str | None = None
+        self.fetched: list[str] = []
+
+    def fetch_raw(self, identifier):
+        if identifier == self.die_at:
+            raise WorkerDied()
+        self.fetched.append(identifier)
+        return super().fetch_raw(identifier)
+
+
+def test_interrupted_run_is_failed_then_resumed_from_checkpoint(monkeypatch):
+    monkeypatch.setattr(settings, "geocoding_enabled", False)
+    adapter = FlakyAdapter()
+    adapter.die_at = "page-3"
+    with SessionLocal() as db, pytest.raises(WorkerDied):
+        run_adapter(db, adapter)
+    with SessionLocal() as db:
+        dead = db.query(Run).filter(Run.source == adapter.name).one()
+        assert dead.status == "running" and dead.checkpoint["done"] == ["page-0", "page-1", "page-2"]
+        dead_id = dead.id
+
+    monkeypatch.setattr(settings, "run_stale_after_s", 0.01)
+    time.sleep(0.05)
+    adapter.die_at, adapter.fetched = None, []
+    with SessionLocal() as db:
+        run = run_adapter(db, adapter, resume=True)
+        assert run.id == dead_id and run.status == "finished"
+        assert adapter.fetched == ["page-3", "page-4", "page-5"]
+        assert run.inserted == 6 and len(run.checkpoint["done"]) == 6 and run.checkpoint["resumed"] == 1
+        assert any("no heartbeat" in s for s in run.error_samples)
+        # A finished run is not resumed again
+        assert run_adapter(db, adapter, resume=True).id != dead_id
+
+
+def test_fanout_identifier_checkpoints_its_run(monkeypatch):
+    monkeypatch.setattr(settings, "geocoding_enabled", False)
+    adapter = FlakyAdapter()
+    run_id = start_run(adapter)
+    for ident in ("page-0", "page-1"):
+        assert ingest_identifier(adapter, ident, run_id=run_id)["errors"] == 0
+    with SessionLocal() as db:
+        assert db.get(Run, run_id).checkpoint["done"] == ["page-0", "page-1"]
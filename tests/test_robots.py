@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+import time
+
+import pytest
+
+from adapters.base import SourceAdapter
+from adapters.robots import HostPacer, fetch_robots
+from core.db import SessionLocal
+from core.settings import settings
+from core.sources import load_robots
+
+
+def _get(text):
+    return lambda url, timeout=10: SimpleNamespace(text=text)
+
+
+def test_fetch_robots_parses_delay_and_disallow():
+    p = fetch_robots("https://example.org", _get("User-agent: *\nCrawl-delay: 2\n"))
+    assert p.ok and p.crawl_delay_ms == 2000
+    p = fetch_robots("https://example.org", _get("User-agent: *\nDisallow: /\n"))
+    assert not p.ok
+
+
+def test_pacer_spaces_requests_per_host():
+    pacer = HostPacer()
+    assert pacer.wait("https://a.example/x", 50) == 0
+    t0 = time.monotonic()
+    pacer.wait("https://a.example/y", 50)
+    assert time.monotonic() - t0 >= 0.04
+    assert pacer.wait("https://b.example/x", 50) == 0
+
+
+class RobotsAdapter(SourceAdapter):
+    name = "robots_test_source"
+    base_url = "https://robots.example"
+    respects_robots = True
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_robots(self):
+        self.calls += 1
+        return fetch_robots(self.base_url, _get("User-agent: *\nCrawl-delay: 1\n"))
+
+
+def test_robots_state_cached_on_source():
+    first, second = RobotsAdapter(), RobotsAdapter()
+    with SessionLocal() as db:
+        from db.models import Source
+
+        db.query(Source).filter(Source.name == RobotsAdapter.name).delete()
+        load_robots(db, first)
+        db.commit()
+        load_robots(db, second)
+    assert first.calls == 1 and second.calls == 0
+    assert second.robots.crawl_delay_ms == 1000
+
+
+def _status(code, text="<html>Not Found</html>"):
+    return lambda url, timeout=10: SimpleNamespace(status_code=code, text=text)
+
+
+def _down(url, timeout=10):
+    raise ConnectionError("no route to host")
+
+
+def test_robots_status_codes_follow_rfc9309():
+    missing = fetch_robots("https://example.org", _status(404))
+    assert missing.ok and missing.rules is None and missing.can_fetch("https://example.org/any/path")
+    for get in (_status(503), _status(429), _down):
+        p = fetch_robots("https://example.org", get)
+        assert p.unreachable and not p.can_fetch("https://example.org/events")
+        assert p.can_fetch("https://example.org/robots.txt")
+
+
+class PathRulesAdapter(SourceAdapter):
+    name = "robots_path_rules"
+    base_url = "https://paths.example"
+    respects_robots = True
+
+    def __init__(self, get):
+        self.get = get
+        self.requested = []
+        self._http = SimpleNamespace(get=lambda url, **kw: self.requested.append(url) or SimpleNamespace(status_code=200, headers={}))
+
+    def fetch_robots(self):
+        return fetch_robots(self.base_url, self.get)
+
+
+def test_http_get_checks_each_url_against_the_rules():
+    adapter = PathRulesAdapter(_get("User-agent: *\nDisallow: /private\n"))
+    adapter.robots = adapter.fetch_robots()
+    assert adapter.robots.ok
+    adapter.http_get("https://paths.example/events")
+    with pytest.raises(PermissionError):
+        adapter.http_get("https://paths.example/private/list")
+    assert adapter.requested == ["https://paths.example/events"]
+
+
+def test_unreachable_robots_keeps_last_served_rules(monkeypatch):
+    monkeypatch.setattr(settings, "robots_ttl_s", 0)
+    with SessionLocal() as db:
+        from db.models import Source
+
+        db.query(Source).filter(Source.name == PathRulesAdapter.name).delete()
+        load_robots(db, PathRulesAdapter(_get("User-agent: *\nDisallow: /private\n")))
+        db.commit()
+        adapter = PathRulesAdapter(_status(503))
+        policy = load_robots(db, adapter)
+        db.rollback()
+    assert policy.can_fetch("https://paths.example/events") and not policy.can_fetch("https://paths.example/private/x")
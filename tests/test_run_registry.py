@@ -0,0 +1,58 @@
+from adapters.base import ProgramRecord
+from conftest import TOPICS, TopicAdapter
+from core.db import SessionLocal
+from core.dedupe import RunRegistry
+from core.etl import run_adapter
+from core.settings import settings
+from db.models import Program
+
+class OverlappingSearchAdapter(TopicAdapter):
+    """Two searches returning mostly the same events, like Eventbrite's q=reading / q=children."""
+
+    prefix = "overlap"
+
+    def discover(self):
+        return ["q=reading", "q=children"]
+
+    def fetch_raw(self, identifier):
+        return {"q": identifier}
+
+    def parse(self, raw):
+        for i, topic in enumerate(TOPICS[:4]):
+            desc = f"{topic} for kids hosted by {self.name}"
+            tags = []
+            if raw["q"] == "q=children" and i == 3:
+                desc += " (now with a picnic)"
+            if raw["q"] == "q=children" and i == 2:
+                # Same text, new tag: still a change to write
+                tags = ["outdoor"]
+            yield ProgramRecord(title=self.title(topic), source=self.name, source_url=f"http://x/{i}", description_text=desc, dedupe_key_date="2030-01-01", tags=tags)
+
+
+def test_repeats_across_identifiers_skip_the_db(monkeypatch):
+    monkeypatch.setattr(settings, "geocoding_enabled", False)
+    adapter = OverlappingSearchAdapter()
+    with SessionLocal() as db:
+        run = run_adapter(db, adapter)
+        assert run.inserted == 4
+        # Two exact repeats never reached the DB; the two changed ones were updated
+        assert run.dedupe_lookups_saved == 2 and run.updated == 2 and run.unchanged == 0
+        assert db.query(Program).filter(Program.source == adapter.name).count() == 4
+        changed = db.query(Program).filter(Program.title == adapter.title(TOPICS[3])).one()
+        assert changed.description_text.endswith("picnic)")
+        retagged = db.query(Program).filter(Program.title == adapter.title(TOPICS[2])).one()
+        assert retagged.tags == ["outdoor"]
+
+
+def test_registry_ignores_rolled_back_writes():
+    seen = RunRegistry()
+    seen.add("h1", "t1", "f1")
+    assert not seen.seen("h1", "t1", "f1")
+    seen.rollback()
+    seen.commit()
+    assert not seen.seen("h1", "t1", "f1")
+    seen.add("h1", "t1", "f1")
+    seen.commit()
+    assert seen.seen("h1", "other", "f1") and seen.seen("h2", "t1", "f1")
+    # Same hash or same text, but changed content: not a repeat
+    assert not seen.seen("h1", "other", "f2") and not seen.seen("h2", "t1", "f2")
@@ -0,0 +1,58 @@
+import pytest
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from conftest import TopicAdapter
+from core import metrics
+from core.db import SessionLocal
+from core.etl import run_adapter
+from core.settings import settings
+
+client = TestClient(app)
+
+
+class StatsAdapter(TopicAdapter):
+    prefix = "stats"
+
+    def __init__(self):
+        super().__init__(n=2)
+
+
+def test_run_records_stage_stats_and_is_listed(monkeypatch):
+    monkeypatch.setattr(settings, "geocoding_enabled", False)
+    adapter = StatsAdapter()
+    with SessionLocal() as db:
+        run = run_adapter(db, adapter)
+        rid = run.id
+    stats = run.stats
+    for name in ("fetch", "parse", "neardup_batch", "neardup_db", "upsert", "commit"):
+        assert stats["stages"][name]["calls"] >= 2, name
+    assert stats["bytes_fetched"] > 0 and stats["db_statements"] > 0 and stats["peak_rss_kb"] > 0
+
+    body = client.get("/runs", params={"source": adapter.name}).json()
+    assert body["total"] == 1 and body["items"][0]["id"] == rid
+    assert client.get(f"/runs/{rid}").json()["stats"]["stages"]["upsert"]["calls"] == 2
+
+
+def test_stage_is_noop_outside_a_run():
+    with metrics.stage("fetch"):
+        metrics.add_bytes(10)
+    assert metrics.current() is None
+
+
+@pytest.mark.skipif(metrics.current_rss_kb() is None, reason="needs /proc or psutil")
+def test_peak_rss_is_per_run_not_process_lifetime():
+    import resource
+
+    earlier_run = bytearray(b"\x01") * (200 * 1024 * 1024)
+    del earlier_run
+    process_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    stats = metrics.RunStats()
+    with metrics.collecting(stats):
+        during = bytearray(b"\x01") * (50 * 1024 * 1024)
+        snap = stats.snapshot()
+        del during
+    assert snap["rss_growth_kb"] >= 40 * 1024
+    assert snap["peak_rss_kb"] < process_peak - 100 * 1024